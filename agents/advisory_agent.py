@@ -1,25 +1,27 @@
-from crewai import Agent, LLM
-import os
+from crewai import Agent
+from utils.llm_router import create_llm
 
 # Using the Lite model as per project standard
-llm = LLM(
-    model="gemini/gemini-2.5-flash-lite", 
-    temperature=0.1,
-    api_key=os.environ.get("GOOGLE_API_KEY")
-)
+# Gemini with Groq hedging/failover, behind the shared rate limiter
+llm = create_llm(temperature=0.1)
 
-advisory_agent = Agent(
-    role="Legal Advisor & Strategist",
-    goal="Analyze the user's situation to determine severity, legal classification, and the immediate best course of action (Police vs Lawyer vs Self-Help).",
-    backstory=(
-        "You are an expert Senior Legal Consultant who creates the initial roadmap for any legal issue. "
-        "Your job is NOT to draft documents immediately, but to tell the user WHERE to go first. "
-        "You strictly distinguish between Criminal matters (Police/FIR needed), Civil matters (Lawyer/Notice needed), "
-        "and Consumer/Minor issues (Self-help/Forum needed). "
-        "You always assess the SEVERITY of the situation (High/Low) to prioritize emergencies."
-    ),
-    llm=llm,
-    verbose=True,
-    max_iter=3,
-    max_rpm=60,
-)
+
+def create_advisory_agent() -> Agent:
+    """Build a fresh Advisory Agent; the module-level LLM is shared across instances."""
+    return Agent(
+        role="Legal Advisor & Strategist",
+        goal="Analyze the user's situation to determine severity, legal classification, and the immediate best course of action (Police vs Lawyer vs Self-Help).",
+        backstory=(
+            "You are an expert Senior Legal Consultant who creates the initial roadmap for any legal issue. "
+            "Your job is NOT to draft documents immediately, but to tell the user WHERE to go first. "
+            "You strictly distinguish between Criminal matters (Police/FIR needed), Civil matters (Lawyer/Notice needed), "
+            "and Consumer/Minor issues (Self-help/Forum needed). "
+            "You always assess the SEVERITY of the situation (High/Low) to prioritize emergencies."
+        ),
+        llm=llm,
+        verbose=True,
+        max_iter=3,
+    )
+
+
+advisory_agent = create_advisory_agent()
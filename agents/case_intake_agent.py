@@ -1,33 +1,34 @@
 # case_intake_agent.py
 
-from crewai import Agent, LLM
-import os
+from crewai import Agent
+from utils.llm_router import create_llm
 
 # agent specific LLM - can also be configured din .env file
-llm = LLM(
-    model="gemini/gemini-2.5-flash-lite",
-    temperature=0,
-    api_key=os.environ.get("GOOGLE_API_KEY")
-)
+# Gemini with Groq hedging/failover, behind the shared rate limiter
+llm = create_llm(temperature=0)
 
-case_intake_agent = Agent(
-    role="Case Intake Agent",
-    goal=(
-        "Understand the user's legal issue and classify it into a"
-        " structured format for further legal processing in the user's preferred language."
-    ),
-    backstory=(
-        "You're a highly skilled legal intake assistant trained to analyze"
-        " legal concerns in both English and Hindi. "
-        "You identify the type of legal issue, categorize it under a domain of law,"
-        " and extract relevant context "
-        "to pass along to legal researchers, drafters, or compliance teams. "
-        "You're fluent in both English and Hindi and can respond in either language based on user preference."
-    ),
-    llm=llm,
-    tools=[],
-    verbose=True,
-    max_iter=5,
-    max_rpm=60,
-)
 
+def create_case_intake_agent() -> Agent:
+    """Build a fresh Case Intake Agent; the module-level LLM is shared across instances."""
+    return Agent(
+        role="Case Intake Agent",
+        goal=(
+            "Understand the user's legal issue and classify it into a"
+            " structured format for further legal processing in the user's preferred language."
+        ),
+        backstory=(
+            "You're a highly skilled legal intake assistant trained to analyze"
+            " legal concerns in both English and Hindi. "
+            "You identify the type of legal issue, categorize it under a domain of law,"
+            " and extract relevant context "
+            "to pass along to legal researchers, drafters, or compliance teams. "
+            "You're fluent in both English and Hindi and can respond in either language based on user preference."
+        ),
+        llm=llm,
+        tools=[],
+        verbose=True,
+        max_iter=5,
+    )
+
+
+case_intake_agent = create_case_intake_agent()
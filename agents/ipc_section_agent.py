@@ -1,27 +1,29 @@
 # ipc_section_agent.py
 
-from crewai import Agent, LLM
-import os
+from crewai import Agent
+from utils.llm_router import create_llm
 from tools.multilingual_ipc_search_tool import search_multilingual_ipc
 
-llm = LLM(
-    model="gemini/gemini-2.5-flash-lite", 
-    temperature=0.3,
-    api_key=os.environ.get("GOOGLE_API_KEY")
-)
+# Gemini with Groq hedging/failover, behind the shared rate limiter
+llm = create_llm(temperature=0.3)
 
-ipc_section_agent = Agent(
-    role="IPC Section Agent",
-    goal="Identify the most relevant Indian Penal Code (IPC) sections based on the legal issue provided, supporting both English and Hindi queries.",
-    backstory=(
-        "You're a seasoned legal researcher with deep knowledge of Indian penal laws in both English and Hindi. "
-        "You specialize in mapping legal issues to applicable IPC sections with precision and clarity. "
-        "You can work with queries in any language and provide responses in the user's preferred language. "
-        "Your insight helps lawyers and assistants quickly understand the statutory basis of a case."
-    ),
-    tools=[search_multilingual_ipc],
-    llm=llm,
-    verbose=True,
-    max_iter=5,
-    max_rpm=60,
-)
+
+def create_ipc_section_agent() -> Agent:
+    """Build a fresh IPC Section Agent; the module-level LLM and tool are shared across instances."""
+    return Agent(
+        role="IPC Section Agent",
+        goal="Identify the most relevant Indian Penal Code (IPC) sections based on the legal issue provided, supporting both English and Hindi queries.",
+        backstory=(
+            "You're a seasoned legal researcher with deep knowledge of Indian penal laws in both English and Hindi. "
+            "You specialize in mapping legal issues to applicable IPC sections with precision and clarity. "
+            "You can work with queries in any language and provide responses in the user's preferred language. "
+            "Your insight helps lawyers and assistants quickly understand the statutory basis of a case."
+        ),
+        tools=[search_multilingual_ipc],
+        llm=llm,
+        verbose=True,
+        max_iter=5,
+    )
+
+
+ipc_section_agent = create_ipc_section_agent()
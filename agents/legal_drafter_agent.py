@@ -1,26 +1,34 @@
 # legal_drafter_agent.py
 
-from crewai import Agent, LLM
-import os
+from crewai import Agent
+from utils.llm_router import create_llm
 
-llm = LLM(
-    model="gemini/gemini-2.5-flash-lite", 
-    temperature=0.2,
-    api_key=os.environ.get("GOOGLE_API_KEY")
-)
+# Gemini with Groq hedging/failover, behind the shared rate limiter
+llm = create_llm(temperature=0.2)
+# Used only by /draft/stream: streaming calls are never hedged (see RoutedLLM), so the
+# regular drafting path keeps the hedged client above
+streaming_llm = create_llm(temperature=0.2, stream=True)
 
-legal_drafter_agent = Agent(
-    role="Legal Document Drafting Agent",
-    goal="Draft legally sound documents based on the user's case summary, applicable IPC sections, and relevant precedents in the user's preferred language.",
-    backstory=(
-        "You are a seasoned legal document expert trained in Indian law with fluency in both English and Hindi. "
-        "You specialize in drafting formal legal documents such as FIRs, legal notices, and complaints, tailored to specific case scenarios. "
-        "Your drafts are precise, compliant with Indian legal standards, and written in plain yet formal legal language. "
-        "You can draft documents in English or Hindi based on the user's preference."
-    ),
-    tools=[],  # No tools needed; all inputs are from upstream agents
-    llm=llm,
-    verbose=True,
-    max_iter=5,
-    max_rpm=60,
-)
+
+def create_legal_drafter_agent(stream: bool = False) -> Agent:
+    """
+    Build a fresh Legal Drafter Agent; the module-level LLMs are shared across instances.
+    `stream=True` uses the streaming client so /draft/stream can forward tokens.
+    """
+    return Agent(
+        role="Legal Document Drafting Agent",
+        goal="Draft legally sound documents based on the user's case summary, applicable IPC sections, and relevant precedents in the user's preferred language.",
+        backstory=(
+            "You are a seasoned legal document expert trained in Indian law with fluency in both English and Hindi. "
+            "You specialize in drafting formal legal documents such as FIRs, legal notices, and complaints, tailored to specific case scenarios. "
+            "Your drafts are precise, compliant with Indian legal standards, and written in plain yet formal legal language. "
+            "You can draft documents in English or Hindi based on the user's preference."
+        ),
+        tools=[],  # No tools needed; all inputs are from upstream agents
+        llm=streaming_llm if stream else llm,
+        verbose=True,
+        max_iter=5,
+    )
+
+
+legal_drafter_agent = create_legal_drafter_agent()
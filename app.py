@@ -40,27 +40,45 @@ import os
 
 audio_bytes = audio_recorder( text="", recording_color="#e8b62c", neutral_color="#6aa36f", icon_name="microphone", icon_size="2x")
 
+@st.cache_resource
+def get_transcription_cache():
+    from utils.transcription_cache import TranscriptionCache
+    return TranscriptionCache.from_env()
+
+
 if audio_bytes:
-    # Check if this precise audio buffer has been processed to avoid re-transcribing same bytes on casual reruns
-    # A simple hash or length check could be used, but for now we rely on the component behavior.
-    
-    st.info("🎧 Transcribing audio...")
-    try:
-        # Configure GenAI with the API Key
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        model = genai.GenerativeModel("gemini-2.5-flash-lite")
-        
-        # Generate content from audio bytes
-        response = model.generate_content([
-            "Transcribe the following legal issue description exactly into English or Hindi as spoken.",
-            {"mime_type": "audio/mp3", "data": audio_bytes}
-        ])
-        
-        # Update session state with transcribed text
-        st.session_state['input_text'] = response.text
-        st.success("✅ Transcription Complete!")
-    except Exception as e:
-        st.error(f"❌ Transcription failed: {e}")
+    # Content-addressed cache: the same recording is never re-transcribed on reruns
+    import hashlib
+    transcription_cache = get_transcription_cache()
+    cache_key = transcription_cache.make_key(
+        hashlib.sha256(audio_bytes).hexdigest(),
+        model="gemini-2.5-flash-lite",
+        compute_type="api",
+        language="auto"
+    )
+    cached = transcription_cache.get(cache_key)
+
+    if cached is not None:
+        st.session_state['input_text'] = cached["text"]
+    else:
+        st.info("🎧 Transcribing audio...")
+        try:
+            # Configure GenAI with the API Key
+            genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+            model = genai.GenerativeModel("gemini-2.5-flash-lite")
+            
+            # Generate content from audio bytes
+            response = model.generate_content([
+                "Transcribe the following legal issue description exactly into English or Hindi as spoken.",
+                {"mime_type": "audio/mp3", "data": audio_bytes}
+            ])
+            
+            # Update session state with transcribed text
+            st.session_state['input_text'] = response.text
+            transcription_cache.put(cache_key, {"text": response.text})
+            st.success("✅ Transcription Complete!")
+        except Exception as e:
+            st.error(f"❌ Transcription failed: {e}")
 
 submitted = False
 with st.form("legal_form"):
@@ -91,12 +109,12 @@ if submitted_analyze:
         st.warning("Please enter a legal issue to analyze.")
     else:
         with st.spinner("🛡️ Analyzing your case strategy..."):
-            from crew import advisory_crew
-            from utils.retry_handler import execute_crew_with_retry
+            from crew import ADVISORY_PHASE_CREWS
+            from utils.crew_runner import kickoff_parallel
             
             try:
-                # Stage 1: Advisory
-                advisory_result = execute_crew_with_retry(advisory_crew, inputs={
+                # Stage 1: Advisory (intake and advisory crews run in parallel)
+                advisory_result = kickoff_parallel(ADVISORY_PHASE_CREWS, inputs={
                     "user_input": user_input,
                     "language_preference": language_pref
                 })
@@ -118,13 +136,12 @@ if st.session_state.get('stage') == "advisory_done":
     result = st.session_state['advisory_result']
     
     # Display Advisory Output
-    import json
     try:
         # Task 1 output is the Advisory JSON
         if hasattr(result, 'tasks_output') and len(result.tasks_output) > 1:
-            advisory_output_raw = result.tasks_output[1].raw
-            clean_json = advisory_output_raw.replace("```json", "").replace("```", "").strip()
-            advisory_data = json.loads(clean_json)
+            from utils.structured_output import Advisory, parse_structured
+            advisory = parse_structured(result.tasks_output[1].raw, Advisory)
+            advisory_data = advisory.model_dump()
             
             st.markdown("---")
             st.subheader("🛡️ Strategic Legal Advice")
@@ -146,7 +163,7 @@ if st.session_state.get('stage') == "advisory_done":
             st.markdown("---")
             
             # Store structured data for Stage 2
-            st.session_state['advisory_json'] = advisory_output_raw
+            st.session_state['advisory_json'] = advisory.model_dump_json()
             st.session_state['case_summary'] = result.tasks_output[0].raw # Intake summary
             
     except Exception as e:
@@ -156,12 +173,12 @@ if st.session_state.get('stage') == "advisory_done":
     st.info("💡 Would you like to generate the formal legal document recommended above?")
     if st.button("📄 Generate Legal Document"):
         with st.spinner("📝 Drafting document (Researching IPC & Precedents)..."):
-            from crew import drafting_crew
-            from utils.retry_handler import execute_crew_with_retry
+            from crew import build_drafting_crew
+            from utils.retry_handler import execute_crew
             
             try:
                 # Stage 2: Drafting
-                draft_result = execute_crew_with_retry(drafting_crew, inputs={
+                draft_result = execute_crew(build_drafting_crew(), inputs={
                     "case_summary": st.session_state['case_summary'],
                     "advisory_analysis": st.session_state['advisory_json'],
                     "language_preference": st.session_state['language_pref']
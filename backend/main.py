@@ -1,28 +1,150 @@
 import sys
 import os
-import shutil
-from fastapi import FastAPI, UploadFile, File, HTTPException, WebSocket, WebSocketDisconnect
+import json
+import asyncio
+import functools
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from faster_whisper import WhisperModel
+from faster_whisper import decode_audio
 import uuid
+from types import SimpleNamespace
 
 # Ensure we can import from parent directory
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils import transcription
+from utils.advisory_classifier import AdvisoryFastPath
+from utils.analysis_cache import SemanticAnalysisCache
+from utils.batch_scheduler import MicroBatchScheduler
+from utils.crew_metrics import register_event_handlers, register_llm
+from utils.crew_runner import CrewRunner, CrewTimeoutError
+from utils.draft_streaming import TokenSink, kickoff_streaming
+from utils.job_store import Job, JobStore, format_sse, sse_events
+from utils.long_audio import LONG_AUDIO_MIN_SECONDS, transcribe_long
+from utils.metrics import REGISTRY as metrics_registry
+from utils.rate_limiter import CircuitOpenError, RateLimitTimeout
+from utils.readiness import ComponentLoader
+from utils.speculative_drafts import SpeculativeDrafts
+from utils.audio_upload import MissingAudioError, UploadTooLargeError, read_audio_upload
+from utils.streaming_transcriber import StreamingTranscriber
+from utils.structured_output import Advisory, OutputValidationError, parse_structured
+from utils.transcription import LANGUAGE_SETTINGS, SAMPLE_RATE, transcription_mode
+from utils.transcription_cache import TranscriptionCache
+from utils.transcription_pool import QueueFullError, TranscriptionPool
+
 # Load environment
 load_dotenv()
 
 # Initialize FastAPI
 app = FastAPI()
 
-# Initialize Whisper Model (Global)
-# usage="int8" is faster and uses less memory, "cpu" or "cuda" depending on hardware
-print("Loading Whisper Model...")
-whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
-print("Whisper Model Loaded!")
+# Whisper runs in a pool of workers, each with its own WhisperModel, so transcription
+# never blocks the event loop. Sized via WHISPER_WORKERS / WHISPER_WORKER_MODE /
+# WHISPER_QUEUE_SIZE; compute_type="int8" is faster and uses less memory on CPU.
+transcription_pool = TranscriptionPool.from_env()
+
+# Repeated recordings (re-submits after a failed analysis) skip Whisper entirely
+transcription_cache = TranscriptionCache.from_env()
+
+# Optional micro-batching of short clips (TRANSCRIBE_BATCH_WINDOW_MS > 0 enables it)
+BATCH_MAX_CLIP_SECONDS = 30
+batch_scheduler = MicroBatchScheduler.from_env(transcription_pool.run, transcription.transcribe_batch)
+
+# Batched clips decode differently (one segment per clip), so the path is part of the cache key
+TRANSCRIPTION_MODE = transcription_mode(
+    BATCH_MAX_CLIP_SECONDS if batch_scheduler is not None else None, LONG_AUDIO_MIN_SECONDS
+)
+
+# Crew kickoffs (and their rate-limit waits) run on a dedicated, capped thread pool
+# so a rate-limited request never blocks other clients.
+crew_runner = CrewRunner.from_env()
+
+# Background analysis/drafting jobs; results outlive client connections until JOB_TTL_SECONDS
+job_store = JobStore.from_env()
+
+# /analyze results for the same (or a near-identical) situation and language are reused
+def _embed_query(text: str):
+    from tools.multilingual_ipc_search_tool import get_embeddings
+    return get_embeddings().embed_query(text)
+
+
+analysis_cache = SemanticAnalysisCache.from_env(_embed_query)
+
+# Optional local classifier for severity / legal_type / recommended_action
+# (ADVISORY_CLASSIFIER_PATH); low-confidence inputs still go to the advisory agent
+advisory_fast_path = AdvisoryFastPath.from_env()
+
+# Opt-in (SPECULATIVE_DRAFTING=1): drafting starts as soon as an analysis is returned
+speculative_drafts = SpeculativeDrafts.from_env()
+
+# Heavy components load concurrently in the background so the port binds right away;
+# /ready reports when this worker is warm.
+components = ComponentLoader()
+
+
+def _load_embeddings():
+    from tools.multilingual_ipc_search_tool import get_embeddings
+    get_embeddings()
+
+
+def _load_local_ipc_index():
+    if os.getenv("IPC_VECTOR_BACKEND", "pinecone").strip().lower() == "local":
+        from tools.local_ipc_index import get_local_index
+        get_local_index()
+
+
+def _load_lexical_ipc_indexes():
+    # BM25 and section-number indexes for IPC search, built from the same JSON corpora as the vector stores
+    from tools.lexical_ipc_index import get_multilingual_lexical_index
+    get_multilingual_lexical_index()
+
+
+def _load_crews():
+    import crew  # noqa: F401  (builds agents, tasks and crews)
+    from agents import advisory_agent, case_intake_agent, ipc_section_agent, lawyer_notifier_agent, legal_drafter_agent
+
+    # Task/tool/LLM timings and per-agent token usage for /metrics
+    register_event_handlers()
+    register_llm(case_intake_agent.case_intake_agent.role, case_intake_agent.llm)
+    register_llm(advisory_agent.advisory_agent.role, advisory_agent.llm)
+    register_llm(ipc_section_agent.ipc_section_agent.role, ipc_section_agent.llm)
+    register_llm(lawyer_notifier_agent.lawyer_notifier_agent.role, lawyer_notifier_agent.llm)
+    register_llm(legal_drafter_agent.legal_drafter_agent.role, legal_drafter_agent.llm)
+    register_llm(f"{legal_drafter_agent.legal_drafter_agent.role} (streaming)", legal_drafter_agent.streaming_llm)
+
+
+components.register("whisper", transcription_pool.warm_up)
+components.register("embeddings", _load_embeddings)
+components.register("crews", _load_crews)
+components.register("local_ipc_index", _load_local_ipc_index, required=False)
+components.register("lexical_ipc_index", _load_lexical_ipc_indexes, required=False)
+components.register("advisory_classifier", advisory_fast_path.load, required=False)
+
+
+@app.on_event("startup")
+def start_background_loading():
+    components.start()
+
+
+@app.on_event("shutdown")
+def stop_workers():
+    transcription_pool.shutdown()
+    crew_runner.shutdown()
+
+
+def require_ready(name: str):
+    """Reject requests that need a component which is still loading."""
+    if not components.is_ready(name):
+        raise HTTPException(
+            status_code=503,
+            detail=f"'{name}' is still loading, please retry shortly.",
+            headers={"Retry-After": "5"}
+        )
 
 # CORS Setup
 origins = [
@@ -57,84 +179,322 @@ def read_root():
     return {"status": "NyayaGPT Backend Running"}
 
 
+@app.get("/ready")
+def readiness():
+    """Per-component load status and timings; 200 only once every required component is ready."""
+    body = {"ready": components.all_ready(), "components": components.status()}
+    return JSONResponse(content=body, status_code=200 if body["ready"] else 503)
+
+
+
+@app.get("/metrics")
+def metrics():
+    """Crew, task, tool and LLM latency histograms and token counters in Prometheus text format."""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/llm/stats")
+def llm_stats():
+    """Per-provider LLM latency percentiles and error counts (drive the hedging deadline)."""
+    from utils.llm_router import provider_stats
+    return provider_stats()
+
 
 @app.post("/transcribe")
-async def transcribe_audio(file: UploadFile = File(...)):
+async def transcribe_audio(request: Request):
+    """
+    Transcribe an uploaded recording (multipart field `file`, or a raw audio body).
+
+    The upload is streamed from the request body into memory and decoded straight
+    to float32 PCM; nothing touches the filesystem.
+    """
+    require_ready("whisper")
     try:
-        # Save temp file
-        temp_filename = f"temp_{file.filename}"
-        with open(temp_filename, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        print(f"DEBUG: Transcribing {temp_filename}...")
-        
-        # Transcribe with auto-detection first
-        segments, info = whisper_model.transcribe(
-            temp_filename, 
-            beam_size=5, 
-            vad_filter=True,
-            initial_prompt="नमस्ते, this is a legal discussion in Hindi and English."
+        upload = await read_audio_upload(request)
+        cache_key = TranscriptionCache.make_key(
+            upload.sha256.hexdigest(),
+            model=transcription_pool.model_size,
+            compute_type=transcription_pool.compute_type,
+            language=f"{LANGUAGE_SETTINGS}|{TRANSCRIPTION_MODE}"
         )
+        cached = transcription_cache.get(cache_key)
+        if cached is not None:
+            upload.close()
+            print("DEBUG: Transcription cache hit")
+            return {"text": cached["text"], "segments": cached.get("segments", [])}
 
-        detected_lang = info.language
-        print(f"DEBUG: Detected language: {detected_lang} with probability {info.language_probability}")
-
-        # Fallback: If it thinks it's Urdu (ur) or Arabic (ar), force Hindi (hi)
-        # This handles the "Right Language, Wrong Script" issue common in Hinglish.
-        if detected_lang not in ['en', 'hi']:
-            print(f"DEBUG: Detected {detected_lang}, forcing 'hi' (Hindi)...")
-            segments, info = whisper_model.transcribe(
-                temp_filename, 
-                beam_size=5, 
-                vad_filter=True,
-                language="hi",
-                initial_prompt="नमस्ते, write this in Devanagari script."
-            )
+        try:
+            audio = await run_in_threadpool(decode_audio, upload, sampling_rate=SAMPLE_RATE)
+        finally:
+            # Release the encoded bytes as soon as we have PCM
+            upload.close()
 
-        transcribed_text = ""
-        for segment in segments:
-            transcribed_text += segment.text + " "
-            
-        print(f"DEBUG: Transcription result: {transcribed_text}")
-        
-        # Cleanup
-        os.remove(temp_filename)
-        
-        return {"text": transcribed_text.strip()}
-    
+        if batch_scheduler is not None and len(audio) <= BATCH_MAX_CLIP_SECONDS * SAMPLE_RATE:
+            # Short clips arriving together are decoded as one batch
+            result = await batch_scheduler.submit(audio)
+        elif len(audio) >= LONG_AUDIO_MIN_SECONDS * SAMPLE_RATE:
+            # Long recordings are split at silences and decoded in parallel
+            result = await transcribe_long(transcription_pool, audio)
+        else:
+            # Language detection only looks at the first few seconds,
+            # then exactly one full pass runs in the resolved language.
+            result = await transcription_pool.run(transcription.transcribe, audio)
+        transcription.record_language_decision(result["language"], result["forced_hindi"])
+        transcription_cache.put(cache_key, result)
+
+        print(f"DEBUG: Transcription result: {result['text']}")
+
+        return {"text": result["text"], "segments": result["segments"]}
+
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except MissingAudioError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Transcription Error: {e}")
-        # Clean up if failed
-        if 'temp_filename' in locals() and os.path.exists(temp_filename):
-            os.remove(temp_filename)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/analyze")
-async def analyze_case(request: AnalyzeRequest):
+@app.get("/transcribe/stats")
+def transcription_stats():
+    """Counters for the transcription language paths (e.g. how often Hindi is forced)."""
+    return {
+        **transcription.get_transcription_stats(),
+        "pool": transcription_pool.stats(),
+        "cache": transcription_cache.stats(),
+        "batching": batch_scheduler.stats() if batch_scheduler is not None else None,
+    }
+
+
+@app.websocket("/ws/transcribe")
+async def transcribe_stream(websocket: WebSocket):
+    """
+    Streaming transcription while the user is still speaking.
+
+    Client sends binary frames of 16 kHz mono 16-bit PCM and a final text frame
+    "stop" (or {"event": "stop"}). Server pushes {"type": "partial"|"final"|"done", ...},
+    or {"type": "busy", "retry_after": n} when the worker pool is saturated; the audio
+    stays buffered and is decoded on the next step (or resend "stop").
+    """
+    await websocket.accept()
+    if not components.is_ready("whisper"):
+        await websocket.send_json({"type": "busy", "retry_after": 5})
+        await websocket.close(code=1013)
+        return
+    session = StreamingTranscriber(transcription_pool.run)
+
     try:
-        from crew import advisory_crew
-        from utils.retry_handler import execute_crew_with_retry
-        
-        # Run Advisory Crew
-        result = execute_crew_with_retry(advisory_crew, inputs={
-            "user_input": request.user_input,
-            "language_preference": request.language_preference
-        })
-        
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes"):
+                try:
+                    events = await session.feed(message["bytes"])
+                except QueueFullError as e:
+                    events = [{"type": "busy", "retry_after": e.retry_after}]
+                for event in events:
+                    await websocket.send_json(event)
+
+            elif message.get("text") and _is_stop_message(message["text"]):
+                try:
+                    events = await session.finish()
+                except QueueFullError as e:
+                    await websocket.send_json({"type": "busy", "retry_after": e.retry_after})
+                    continue
+                for event in events:
+                    await websocket.send_json(event)
+                print(f"DEBUG: Streaming transcription result: {session.text}")
+                await websocket.close()
+                break
+
+    except WebSocketDisconnect:
+        print("DEBUG: Streaming transcription client disconnected")
+    except Exception as e:
+        print(f"Streaming Transcription Error: {e}")
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1011)
+
+
+def _is_stop_message(text: str) -> bool:
+    text = text.strip()
+    if text.lower() == "stop":
+        return True
+    try:
+        return json.loads(text).get("event") == "stop"
+    except (ValueError, AttributeError):
+        return False
+
+
+def _report_task(task_callback, agent: str, raw: str):
+    """Hand a result that did not come from a crew task to `task_callback` as if it had."""
+    if task_callback is not None:
+        task_callback(SimpleNamespace(agent=agent, raw=raw))
+
+
+async def run_analysis(request: AnalyzeRequest, task_callback=None) -> dict:
+    from crew import ADVISORY_PHASE_CREWS, build_case_intake_crew
+
+    # Until the embedding model is warm only exact repeats are served from the cache
+    cached, embedding, exact = await run_in_threadpool(
+        analysis_cache.lookup,
+        request.user_input,
+        request.language_preference,
+        semantic=components.is_ready("embeddings")
+    )
+    if cached is not None and exact:
+        print("DEBUG: Analysis cache hit")
+        _report_task(task_callback, "Case Intake Agent", cached["case_summary"])
+        _report_task(task_callback, "Legal Advisor & Strategist", cached["advisory_json"])
+        speculate_draft(request, cached)
+        return cached
+
+    # A similar earlier request's advisory is reused, but its case summary holds that
+    # user's names and facts, so intake always runs on this request's own text
+    reused_advisory = cached["advisory_json"] if cached is not None else None
+
+    # A confident local classification replaces the advisory LLM call; only intake runs
+    advisory = None
+    if reused_advisory is None and components.is_ready("embeddings") \
+            and advisory_fast_path.accepts(request.language_preference):
+        query_embedding = embedding if embedding is not None else await run_in_threadpool(_embed_query, request.user_input)
+        advisory = advisory_fast_path.classify(query_embedding, request.language_preference)
+
+    inputs = {
+        "user_input": request.user_input,
+        "language_preference": request.language_preference
+    }
+    if reused_advisory is not None:
+        print("DEBUG: Analysis cache hit on a similar input; running intake only")
+        result = await crew_runner.kickoff(build_case_intake_crew, inputs=inputs, task_callback=task_callback)
+        intake_output = result.tasks_output[0].raw
+        clean_json = reused_advisory
+        _report_task(task_callback, "Legal Advisor & Strategist", clean_json)
+    elif advisory is not None:
+        print("DEBUG: Advisory fast path")
+        result = await crew_runner.kickoff(build_case_intake_crew, inputs=inputs, task_callback=task_callback)
+        intake_output = result.tasks_output[0].raw
+        clean_json = json.dumps(advisory, ensure_ascii=False)
+        _report_task(task_callback, "Legal Advisor & Strategist", clean_json)
+    else:
+        # Intake and advisory are independent, so both LLM calls run in parallel
+        result = await crew_runner.kickoff_parallel(ADVISORY_PHASE_CREWS, inputs=inputs, task_callback=task_callback)
+
         # Extract Output
         # Task 0: Intake, Task 1: Advisory
         task_output = result.tasks_output[1].raw
         intake_output = result.tasks_output[0].raw
+
+        # The task guardrail already normalized (or repaired) the JSON; this only
+        # re-extracts it from any surrounding text
+        try:
+            clean_json = parse_structured(task_output, Advisory).model_dump_json()
+        except OutputValidationError as e:
+            print(f"Advisory output is not valid JSON: {e}")
+            clean_json = task_output.strip()
+
+    analysis = {
+        "advisory_json": clean_json,
+        "case_summary": intake_output
+    }
+    # Only well-formed advisories are worth handing to the next user
+    try:
+        parsed = json.loads(clean_json)
+        analysis_cache.put(request.user_input, request.language_preference, analysis, embedding)
+        if advisory is None and reused_advisory is None and isinstance(parsed, dict):
+            # LLM labels become training data for the local classifier
+            advisory_fast_path.record(request.user_input, parsed)
+    except ValueError:
+        pass
+    speculate_draft(request, analysis)
+    return analysis
+
+
+def _draft_key(request: DraftRequest) -> str:
+    return SpeculativeDrafts.make_key(request.case_summary, request.advisory_analysis, request.language_preference)
+
+
+def _llm_has_headroom() -> bool:
+    # A drafting run makes several LLM calls; speculate only if the shared bucket can spare them
+    from agents.legal_drafter_agent import llm as drafter_llm
+    from utils.rate_limiter import get_guard
+    return get_guard(drafter_llm.model).has_headroom(float(os.getenv("SPECULATIVE_DRAFT_MIN_LLM_REQUESTS", "3")))
+
+
+def speculate_draft(request: AnalyzeRequest, analysis: dict):
+    """
+    Start drafting for `analysis` in the background, leaving a crew slot free for real
+    traffic and only while the LLM rate limiter has headroom. The speculative crew has
+    no lawyer notifier: the email is only sent once the draft is actually requested.
+    """
+    if not speculative_drafts.enabled:
+        return
+    draft_request = DraftRequest(
+        case_summary=analysis["case_summary"],
+        advisory_analysis=analysis["advisory_json"],
+        language_preference=request.language_preference
+    )
+    if speculative_drafts.start(
+        _draft_key(draft_request),
+        lambda track: kickoff_drafting(draft_request, notify=False, on_submit=track),
+        # Checked last and in this order: the limiter may read its shared state file
+        has_capacity=lambda: crew_runner.has_capacity(reserve=1) and _llm_has_headroom()
+    ):
+        print("DEBUG: Speculative draft started")
+
+
+async def run_drafting(request: DraftRequest, task_callback=None) -> dict:
+    # A speculative run for the same inputs (finished or in flight) saves a cold start
+    speculative = await speculative_drafts.claim(_draft_key(request))
+    if speculative is not None:
+        print("DEBUG: Speculative draft claimed")
+        # Job clients get the same ipc_sections_found / draft_ready events a fresh run emits
+        if task_callback is not None:
+            for task_output in speculative["tasks_output"]:
+                task_callback(task_output)
+        # The notification the speculative crew skipped runs now that the draft was asked for
+        from crew import build_lawyer_notification_crew
+        await crew_runner.kickoff(build_lawyer_notification_crew, inputs={
+            "case_summary": request.case_summary,
+            "language_preference": request.language_preference,
+            "ipc_sections": speculative["ipc_sections"]
+        }, task_callback=task_callback)
+        return {"document": speculative["document"]}
+    result = await kickoff_drafting(request, task_callback=task_callback)
+    return {"document": result["document"]}
+
+
+async def kickoff_drafting(request: DraftRequest, task_callback=None, notify: bool = True, on_submit=None) -> dict:
+    from crew import build_drafting_crew
+
+    # Run a fresh Drafting Crew for this request
+    result = await crew_runner.kickoff(functools.partial(build_drafting_crew, notify=notify), inputs={
+        "case_summary": request.case_summary,
+        "advisory_analysis": request.advisory_analysis,
+        "language_preference": request.language_preference
+    }, task_callback=task_callback, on_submit=on_submit)
+
+    # Final result is the output of the whole crew (Drafter is last); the IPC task is first
+    return {
+        "document": str(result),
+        "ipc_sections": result.tasks_output[0].raw,
+        "tasks_output": list(result.tasks_output),
+    }
+
+
+@app.post("/analyze")
+async def analyze_case(request: AnalyzeRequest):
+    require_ready("crews")
+    try:
+        return await run_analysis(request)
         
-        # Basic JSON cleanup if needed (CrewAI sometimes wraps in markdown)
-        clean_json = task_output.replace("```json", "").replace("```", "").strip()
-        
-        return {
-            "advisory_json": clean_json,
-            "case_summary": intake_output
-        }
-        
+    except CrewTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except (CircuitOpenError, RateLimitTimeout) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after) + 1)})
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -142,28 +502,147 @@ async def analyze_case(request: AnalyzeRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/analyze/stats")
+def analysis_stats():
+    """Hit/miss counters of the /analyze semantic cache and the advisory fast path."""
+    return {"cache": analysis_cache.stats(), "classifier": advisory_fast_path.stats()}
+
+
+@app.get("/draft/stats")
+def drafting_stats():
+    """Counters of speculative drafting (started, claimed, evicted, ...)."""
+    return {"speculative": speculative_drafts.stats()}
+
+
 @app.post("/draft")
 async def draft_document(request: DraftRequest):
+    require_ready("crews")
     try:
-        from crew import drafting_crew
-        from utils.retry_handler import execute_crew_with_retry
-        
-        # Run Drafting Crew
-        result = execute_crew_with_retry(drafting_crew, inputs={
-            "case_summary": request.case_summary,
-            "advisory_analysis": request.advisory_analysis,
-            "language_preference": request.language_preference
-        })
-        
-        # Final result is the output of the whole crew (Drafter is last)
-        final_doc = str(result)
-        
-        return {"document": final_doc}
+        return await run_drafting(request)
         
+    except CrewTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except (CircuitOpenError, RateLimitTimeout) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after) + 1)})
     except Exception as e:
         print(f"Drafting Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@app.post("/draft/stream")
+async def draft_document_stream(request: DraftRequest):
+    """
+    Streaming variant of /draft over Server-Sent Events: `token` events carry the
+    drafter's final answer as it is generated, then a final `document` (or `error`)
+    event. A `reset` event means the drafter started over; discard the tokens so far.
+    """
+    require_ready("crews")
+    from crew import build_drafting_crew
+    from agents.legal_drafter_agent import streaming_llm as drafter_llm
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    # Every streaming drafter agent shares this module-level LLM, so it identifies the drafter's tokens
+    sink = TokenSink(drafter_llm, loop, queue)
+    inputs = {
+        "case_summary": request.case_summary,
+        "advisory_analysis": request.advisory_analysis,
+        "language_preference": request.language_preference
+    }
+
+    async def run():
+        try:
+            result = await crew_runner.call(
+                kickoff_streaming, functools.partial(build_drafting_crew, stream=True), inputs, sink
+            )
+            await queue.put(("document", {"document": str(result)}))
+        except Exception as e:
+            print(f"Drafting Error: {e}")
+            await queue.put(("error", {"detail": str(e)}))
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event, data = await queue.get()
+                yield format_sse(event, data)
+                if event in ("document", "error"):
+                    break
+        finally:
+            # Client went away: the crew run finishes in its pool thread regardless
+            if not task.done():
+                print("DEBUG: Draft stream client disconnected")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# --- Async Jobs ---
+
+# Progress event emitted when each agent's task completes
+TASK_EVENTS = {
+    "Case Intake Agent": "intake_done",
+    "Legal Advisor & Strategist": "advisory_done",
+    "IPC Section Agent": "ipc_sections_found",
+    "Lawyer Notifier Agent": "lawyer_email_drafted",
+    "Legal Document Drafting Agent": "draft_ready",
+}
+
+
+def job_progress(job: Job):
+    """Task callback that records each completed task as a job event."""
+    def on_task_done(task_output):
+        agent = str(getattr(task_output, "agent", "")).strip()
+        job.add_event(TASK_EVENTS.get(agent, "task_done"), {
+            "agent": agent,
+            "output": getattr(task_output, "raw", str(task_output)),
+        })
+    return on_task_done
+
+
+@app.post("/jobs/analyze", status_code=202)
+async def create_analysis_job(request: AnalyzeRequest):
+    require_ready("crews")
+    job = job_store.start("analyze", lambda job: run_analysis(request, task_callback=job_progress(job)))
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.post("/jobs/draft", status_code=202)
+async def create_drafting_job(request: DraftRequest):
+    require_ready("crews")
+    job = job_store.start("draft", lambda job: run_drafting(request, task_callback=job_progress(job)))
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/events")
+def stream_job_events(job_id: str, request: Request):
+    """SSE stream of job progress; honours Last-Event-ID so clients can reconnect."""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+
+    try:
+        last_event_id = int(request.headers.get("last-event-id", "-1"))
+    except ValueError:
+        last_event_id = -1
+
+    return StreamingResponse(
+        sse_events(job, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     # Run from parent directory context usually, but here we enable running directly
@@ -6,31 +6,119 @@ from dotenv import load_dotenv
 # Ensure env is loaded even when this module is imported directly
 load_dotenv()
 
-from agents.case_intake_agent import case_intake_agent
-from agents.advisory_agent import advisory_agent
-from agents.ipc_section_agent import ipc_section_agent
-from agents.legal_precedent_agent import legal_precedent_agent
-from agents.legal_drafter_agent import legal_drafter_agent
-from agents.lawyer_notifier_agent import lawyer_notifier_agent
-from tasks.case_intake_task import case_intake_task
-from tasks.advisory_task import advisory_task
-from tasks.ipc_section_task import ipc_section_task
-from tasks.legal_precedent_task import legal_precedent_task
-from tasks.legal_drafter_task import legal_drafter_task
-from tasks.lawyer_notifier_task import lawyer_notifier_task
+# Importing the agent modules creates the LLM clients and tools once per process;
+# every crew built below reuses them.
+from agents.case_intake_agent import create_case_intake_agent
+from agents.advisory_agent import create_advisory_agent
+from agents.ipc_section_agent import create_ipc_section_agent
+from agents.legal_drafter_agent import create_legal_drafter_agent
+from agents.lawyer_notifier_agent import create_lawyer_notifier_agent
+from tasks.case_intake_task import create_case_intake_task
+from tasks.advisory_task import create_advisory_task
+from tasks.ipc_section_task import create_ipc_section_task
+from tasks.legal_drafter_task import create_legal_drafter_task
+from tasks.lawyer_notifier_task import create_lawyer_notifier_task
 
 
 # --- 1. Advisory Phase Crew ---
-advisory_crew = Crew(
-    agents=[case_intake_agent, advisory_agent],
-    tasks=[case_intake_task, advisory_task],
-    verbose=True
-)
+# The advisory task reads only {user_input}, never the intake output, so servers run
+# the two tasks as separate one-task crews in parallel (see ADVISORY_PHASE_CREWS).
+def build_case_intake_crew(task_callback=None) -> Crew:
+    """Build a one-task crew that runs only the case intake task."""
+    case_intake_agent = create_case_intake_agent()
+    return Crew(
+        name="case_intake",
+        agents=[case_intake_agent],
+        tasks=[create_case_intake_task(case_intake_agent)],
+        task_callback=task_callback,
+        verbose=True
+    )
+
+
+def build_advisory_task_crew(task_callback=None) -> Crew:
+    """Build a one-task crew that runs only the advisory task."""
+    advisory_agent = create_advisory_agent()
+    return Crew(
+        name="advisory_task",
+        agents=[advisory_agent],
+        tasks=[create_advisory_task(advisory_agent)],
+        task_callback=task_callback,
+        verbose=True
+    )
+
+
+# Joined in this order, so tasks_output[0] is intake and tasks_output[1] is advisory
+ADVISORY_PHASE_CREWS = (build_case_intake_crew, build_advisory_task_crew)
+
+
+def build_advisory_crew(task_callback=None) -> Crew:
+    """
+    Build an isolated advisory crew for one request.
+
+    Agents and Tasks hold per-run state (interpolated inputs, outputs), so each run
+    gets its own graph; the LLM clients, tools and embedding model are shared.
+    """
+    case_intake_agent = create_case_intake_agent()
+    advisory_agent = create_advisory_agent()
+
+    return Crew(
+        name="advisory",
+        agents=[case_intake_agent, advisory_agent],
+        tasks=[create_case_intake_task(case_intake_agent), create_advisory_task(advisory_agent)],
+        task_callback=task_callback,
+        verbose=True
+    )
+
 
 # --- 2. Drafting Phase Crew ---
 # NOTE: Precedent Agent is temporarily disabled to save tokens/requests
-drafting_crew = Crew(
-    agents=[ipc_section_agent, legal_drafter_agent, lawyer_notifier_agent],
-    tasks=[ipc_section_task, lawyer_notifier_task, legal_drafter_task],
-    verbose=True
-)
\ No newline at end of file
+def build_drafting_crew(task_callback=None, stream: bool = False, notify: bool = True) -> Crew:
+    """
+    Build an isolated drafting crew for one request (see build_advisory_crew).
+    `stream=True` gives the drafter the streaming LLM client (/draft/stream only).
+    `notify=False` leaves out the lawyer notifier, whose tool sends real email, so the
+    crew has no side effects (speculative drafts; see build_lawyer_notification_crew).
+    Either way tasks_output[0] is the IPC section task and the last task is the draft.
+    """
+    ipc_section_agent = create_ipc_section_agent()
+    legal_drafter_agent = create_legal_drafter_agent(stream=stream)
+
+    ipc_section_task = create_ipc_section_task(ipc_section_agent)
+    legal_drafter_task = create_legal_drafter_task(legal_drafter_agent, context=[ipc_section_task])
+    agents = [ipc_section_agent, legal_drafter_agent]
+    tasks = [ipc_section_task, legal_drafter_task]
+
+    if notify:
+        lawyer_notifier_agent = create_lawyer_notifier_agent()
+        agents.append(lawyer_notifier_agent)
+        tasks.insert(1, create_lawyer_notifier_task(lawyer_notifier_agent, context=[ipc_section_task]))
+
+    return Crew(
+        name="drafting" if notify else "drafting_speculative",
+        agents=agents,
+        tasks=tasks,
+        task_callback=task_callback,
+        verbose=True
+    )
+
+
+def build_lawyer_notification_crew(task_callback=None) -> Crew:
+    """
+    Build a one-task crew that drafts (and sends) the lawyer email from the
+    `{case_summary}`, `{language_preference}` and `{ipc_sections}` inputs. Runs when a
+    speculative draft built with notify=False is actually requested.
+    """
+    lawyer_notifier_agent = create_lawyer_notifier_agent()
+    return Crew(
+        name="lawyer_notification",
+        agents=[lawyer_notifier_agent],
+        tasks=[create_lawyer_notifier_task(lawyer_notifier_agent, context=[])],
+        task_callback=task_callback,
+        verbose=True
+    )
+
+
+# Shared instances kept for scripts that run one crew at a time.
+# Servers should call the build_* factories per request instead.
+advisory_crew = build_advisory_crew()
+drafting_crew = build_drafting_crew()
@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 from typing import List, Dict
 
 from dotenv import load_dotenv
@@ -66,14 +67,10 @@ def prepare_documents(records: List[Dict]) -> List[Document]:
     return documents
 
 
-def build_multilingual_vectordb():
-    load_dotenv()
-
+def load_records() -> List[Dict]:
     # Comma-separated list of JSON files to ingest
     # Example: IPC_JSON_PATHS=ipc_english_pages.json,ipc_hindi.json,ilsum_hindi_compact.json
     json_paths_csv = os.getenv("IPC_JSON_PATHS", "ipc_english.json,ipc_hindi.json")
-    persist_dir_path = os.getenv("IPC_MULTI_PERSIST_DIR", "./CHROMA_DB_IPC_MULTI")
-    collection_name = os.getenv("IPC_MULTI_COLLECTION", "ipc_multilingual")
 
     paths = [p.strip() for p in json_paths_csv.split(",") if p.strip()]
     if not paths:
@@ -84,9 +81,29 @@ def build_multilingual_vectordb():
     for p in paths:
         recs = load_json(p)
         all_records.extend(recs)
+    return all_records
+
+
+def split_documents(documents: List[Document]) -> List[Document]:
+    # Split documents to respect Pinecone metadata limits and improve retrieval
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200
+    )
+    docs_split = text_splitter.split_documents(documents)
+    print(f"Split {len(documents)} original docs into {len(docs_split)} chunks.")
+    return docs_split
+
+
+def build_multilingual_vectordb():
+    load_dotenv()
+
+    persist_dir_path = os.getenv("IPC_MULTI_PERSIST_DIR", "./CHROMA_DB_IPC_MULTI")
+    collection_name = os.getenv("IPC_MULTI_COLLECTION", "ipc_multilingual")
 
     # Prepare docs
-    documents = prepare_documents(all_records)
+    documents = prepare_documents(load_records())
 
     # Build embeddings + vector store
     embeddings = HuggingFaceEmbeddings()
@@ -120,14 +137,7 @@ def build_multilingual_vectordb():
             raise
 
     
-    # Split documents to respect Pinecone metadata limits and improve retrieval
-    from langchain_text_splitters import RecursiveCharacterTextSplitter
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200
-    )
-    docs_split = text_splitter.split_documents(documents)
-    print(f"Split {len(documents)} original docs into {len(docs_split)} chunks.")
+    docs_split = split_documents(documents)
 
     from langchain_pinecone import PineconeVectorStore
 
@@ -143,7 +153,32 @@ def build_multilingual_vectordb():
     print(f"Indexed documents: {len(documents)}")
 
 
+def build_local_ipc_index():
+    """
+    Build the offline index used when IPC_VECTOR_BACKEND=local: the same chunks that go
+    to Pinecone, embedded with the same model and written to LOCAL_IPC_INDEX_DIR.
+    """
+    load_dotenv()
+    from tools.local_ipc_index import write_local_index
+    from tools.multilingual_ipc_search_tool import get_embeddings
+
+    index_dir = os.getenv("LOCAL_IPC_INDEX_DIR", "./IPC_LOCAL_INDEX")
+    dtype = os.getenv("LOCAL_IPC_INDEX_DTYPE", "float16")
+
+    docs_split = split_documents(prepare_documents(load_records()))
+    print(f"Embedding {len(docs_split)} chunks...")
+    vectors = get_embeddings().embed_documents([doc.page_content for doc in docs_split])
+    write_local_index(index_dir, vectors, docs_split, dtype=dtype)
+
+    print(f"Built local IPC index ({dtype}) at: {index_dir}")
+    print(f"Indexed chunks: {len(docs_split)}")
+
+
 if __name__ == "__main__":
-    build_multilingual_vectordb()
+    # python multilingual_vectordb_builder.py [--local]
+    if "--local" in sys.argv[1:]:
+        build_local_ipc_index()
+    else:
+        build_multilingual_vectordb()
 
 
@@ -34,10 +34,10 @@ def main():
     print("   (This may take a minute...)")
 
     try:
-        from utils.retry_handler import execute_crew_with_retry
+        from utils.retry_handler import execute_crew
         
-        # Wrapped call with retry logic
-        result = execute_crew_with_retry(legal_assistant_crew, inputs={
+        # LLM calls retry rate limits themselves (RateLimitedLLM)
+        result = execute_crew(legal_assistant_crew, inputs={
             "user_input": user_input,
             "language_preference": language_pref
         })
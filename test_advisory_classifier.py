@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pytest
+
+from utils.advisory_classifier import (
+    LABELS, STEP_GUIDANCE, AdvisoryClassifier, AdvisoryFastPath, load_examples, normalize_label,
+)
+
+THEFT = {"severity": "High", "legal_type": "Criminal", "recommended_action": "File FIR"}
+REFUND = {"severity": "Low", "legal_type": "Consumer", "recommended_action": "File Complaint near Authority"}
+RENT = {"severity": "Low", "legal_type": "Civil", "recommended_action": "Send Legal Notice"}
+
+
+def _examples(labels: dict, direction: int, count: int):
+    embeddings = np.zeros((count, 4), dtype=np.float32)
+    embeddings[:, direction] = 1
+    embeddings[:, 3] = np.linspace(0, 0.1, count)
+    return embeddings, [dict(labels, user_input=f"case {direction}.{i}") for i in range(count)]
+
+
+def _classifier(*groups) -> AdvisoryClassifier:
+    embeddings, examples = zip(*(_examples(*group) for group in groups))
+    return AdvisoryClassifier.train(np.concatenate(embeddings), [e for batch in examples for e in batch])
+
+
+def _fast_path(classifier, **kwargs) -> AdvisoryFastPath:
+    fast_path = AdvisoryFastPath(model_path=None, **kwargs)
+    fast_path.classifier = classifier
+    fast_path.usable_classes = classifier.usable_classes(fast_path.min_per_label)
+    return fast_path
+
+
+@pytest.mark.parametrize("field, value, expected", [
+    ("legal_type", "Consumer/Other", "Consumer"),
+    ("recommended_action", "file an FIR", "File FIR"),
+    ("recommended_action", "Send a Legal Notice.", "Send Legal Notice"),
+    ("severity", " HIGH ", "High"),
+    # Substrings of a label are not matches
+    ("legal_type", "Not criminal", None),
+    ("recommended_action", "Do not file FIR yet", None),
+    ("severity", None, None),
+])
+def test_normalize_label(field, value, expected):
+    assert normalize_label(field, value) == expected
+
+
+def test_every_canonical_label_normalizes_to_itself():
+    for field, labels in LABELS.items():
+        assert [normalize_label(field, label) for label in labels] == list(labels)
+
+
+def test_prediction_is_a_trained_label_combination():
+    classifier = _classifier((THEFT, 0, 5), (REFUND, 1, 5), (RENT, 2, 5))
+    labels, confidence, count = classifier.predict([0, 0.9, 0, 0])
+    assert (labels, count) == (REFUND, 5) and confidence > 0.99
+
+
+def test_fast_path_needs_two_well_covered_combinations():
+    one = _fast_path(_classifier((THEFT, 0, 8), (REFUND, 1, 2)), min_per_label=5)
+    assert not one.accepts("English") and one.classify([1, 0, 0, 0]) is None
+
+    two = _fast_path(_classifier((THEFT, 0, 5), (REFUND, 1, 5), (RENT, 2, 2)), min_per_label=5)
+    assert two.classify([1, 0, 0, 0]) == {**THEFT, "step_guidance": STEP_GUIDANCE["File FIR"]}
+    # A combination with too few examples goes to the LLM however confident the match
+    assert two.classify([0, 0, 1, 0]) is None
+    assert two.stats()["fast_path"] == 1 and two.stats()["fallback"] == 1
+
+
+def test_low_confidence_and_non_english_go_to_the_llm():
+    fast_path = _fast_path(_classifier((THEFT, 0, 5), (REFUND, 1, 5)), min_per_label=5)
+    assert fast_path.classify([1, 1, 0, 0]) is None
+    assert not fast_path.accepts("Hindi") and fast_path.classify([1, 0, 0, 0], "Hindi") is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "model.npz")
+    classifier = _classifier((THEFT, 0, 5), (REFUND, 1, 6))
+    classifier.save(path)
+    loaded = AdvisoryClassifier.load(path)
+    assert (loaded.classes, loaded.counts) == (classifier.classes, classifier.counts)
+    assert loaded.predict([0, 1, 0, 0])[0] == REFUND
+
+
+def test_per_field_model_is_not_loaded(tmp_path):
+    path = tmp_path / "model.npz"
+    with open(path, "wb") as f:
+        np.savez(f, temperature=np.array(0.05), severity__labels=np.array(["High", "Low"]))
+    fast_path = AdvisoryFastPath(model_path=str(path))
+    fast_path.load()
+    assert fast_path.classifier is None and not fast_path.accepts("English")
+
+
+def test_log_keeps_only_recognised_labels(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    fast_path = AdvisoryFastPath(model_path=None, log_path=path)
+    fast_path.record("my phone was stolen", {**THEFT, "legal_type": "criminal"})
+    fast_path.record("unclear", {**THEFT, "recommended_action": "Wait and see"})
+    records = load_examples(path)
+    assert [r["user_input"] for r in records] == ["my phone was stolen"]
+    assert records[0]["legal_type"] == "Criminal"
+    with open(path, encoding="utf-8") as f:
+        assert len([json.loads(line) for line in f]) == 1
@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+
+from utils.analysis_cache import SemanticAnalysisCache
+
+VECTORS = {
+    "my landlord kept my deposit": [1.0, 0.0, 0.0],
+    "the landlord is not returning my security deposit": [0.95, 0.05, 0.0],
+    "someone stole my phone": [0.0, 1.0, 0.0],
+}
+
+
+class _Embedder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return np.array(VECTORS[text], dtype=np.float32)
+
+
+def test_exact_repeat_is_served_without_embedding():
+    embed = _Embedder()
+    cache = SemanticAnalysisCache(embed, threshold=0.9)
+    cache.put("My landlord kept my deposit", "english", {"answer": 1})
+    value, embedding, exact = cache.lookup("  my LANDLORD kept my deposit ", "English")
+    assert value == {"answer": 1} and exact and embedding is None
+    assert embed.calls == 0
+
+
+def test_similar_input_is_a_semantic_hit():
+    cache = SemanticAnalysisCache(_Embedder(), threshold=0.9)
+    _, embedding, _ = cache.lookup("my landlord kept my deposit", "english")
+    cache.put("my landlord kept my deposit", "english", {"answer": 1}, embedding)
+
+    value, _, exact = cache.lookup("the landlord is not returning my security deposit", "english")
+    assert value == {"answer": 1} and not exact
+    assert cache.lookup("someone stole my phone", "english")[0] is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_language_preferences_do_not_share_entries():
+    cache = SemanticAnalysisCache(_Embedder(), threshold=0.9)
+    _, embedding, _ = cache.lookup("my landlord kept my deposit", "english")
+    cache.put("my landlord kept my deposit", "english", {"answer": 1}, embedding)
+    assert cache.lookup("my landlord kept my deposit", "hindi")[0] is None
+
+
+def test_exact_only_lookup_skips_embedding():
+    embed = _Embedder()
+    cache = SemanticAnalysisCache(embed)
+    assert cache.lookup("someone stole my phone", "english", semantic=False) == (None, None, False)
+    assert embed.calls == 0
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = SemanticAnalysisCache(_Embedder(), max_entries=2, ttl_s=60)
+    cache.put("a", "english", {"v": "a"})
+    cache.put("b", "english", {"v": "b"})
+    cache.lookup("a", "english", semantic=False)
+    cache.put("c", "english", {"v": "c"})
+    assert cache.lookup("b", "english", semantic=False)[0] is None
+    assert cache.lookup("a", "english", semantic=False)[0] == {"v": "a"}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.lookup("a", "english", semantic=False)[0] is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = SemanticAnalysisCache(_Embedder(), max_entries=0)
+    cache.put("a", "english", {"v": "a"})
+    assert cache.lookup("a", "english") == (None, None, False)
@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+
+import pytest
+
+try:
+    from utils.audio_upload import MissingAudioError, UploadTooLargeError, read_audio_upload
+except ImportError:  # python-multipart not installed
+    pytest.skip("python-multipart is required", allow_module_level=True)
+
+BOUNDARY = "testboundary"
+AUDIO = bytes(range(256)) * 40
+
+
+class _Request:
+    """Just enough of a Starlette request: headers and a chunked body stream."""
+
+    def __init__(self, body: bytes, content_type: str, chunk_size: int = 1000):
+        self.headers = {"content-type": content_type}
+        self._body = body
+        self._chunk_size = chunk_size
+
+    async def stream(self):
+        for start in range(0, len(self._body), self._chunk_size):
+            yield self._body[start: start + self._chunk_size]
+
+
+def _multipart(*parts: tuple[str, bytes]) -> bytes:
+    body = b""
+    for name, data in parts:
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{name}.webm"\r\n'
+            "Content-Type: audio/webm\r\n\r\n"
+        ).encode() + data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _read(request, **kwargs):
+    return asyncio.run(read_audio_upload(request, **kwargs))
+
+
+def test_multipart_collects_only_the_named_part():
+    body = _multipart(("note", b"not audio"), ("file", AUDIO), ("file", b"second file"))
+    upload = _read(_Request(body, f"multipart/form-data; boundary={BOUNDARY}", chunk_size=97))
+    assert upload.read() == AUDIO
+    assert upload.sha256.hexdigest() == hashlib.sha256(AUDIO).hexdigest()
+
+
+def test_raw_body_is_read_as_audio():
+    upload = _read(_Request(AUDIO, "audio/webm"))
+    assert upload.tell() == 0
+    assert upload.getvalue() == AUDIO
+
+
+def test_upload_over_the_limit_is_rejected():
+    with pytest.raises(UploadTooLargeError):
+        _read(_Request(AUDIO, "audio/webm"), max_bytes=len(AUDIO) - 1)
+    body = _multipart(("file", AUDIO))
+    with pytest.raises(UploadTooLargeError):
+        _read(_Request(body, f"multipart/form-data; boundary={BOUNDARY}"), max_bytes=len(AUDIO) - 1)
+
+
+def test_missing_part_boundary_or_body_is_rejected():
+    with pytest.raises(MissingAudioError):
+        _read(_Request(_multipart(("note", b"x")), f"multipart/form-data; boundary={BOUNDARY}"))
+    with pytest.raises(MissingAudioError):
+        _read(_Request(_multipart(("file", AUDIO)), "multipart/form-data"))
+    with pytest.raises(MissingAudioError):
+        _read(_Request(b"", "audio/webm"))
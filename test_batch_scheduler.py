@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from utils.batch_scheduler import MicroBatchScheduler
+
+
+class _Runner:
+    """Stands in for TranscriptionPool.run: records every batch it is handed."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, fn, items):
+        self.batches.append(list(items))
+        await asyncio.sleep(0)
+        return fn(None, items)
+
+
+def _double(_model, items):
+    return [item * 2 for item in items]
+
+
+def test_requests_within_the_window_share_one_batch():
+    async def scenario():
+        runner = _Runner()
+        scheduler = MicroBatchScheduler(runner, _double, window_ms=20, max_batch_size=8)
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(3)))
+        return runner, scheduler, results
+
+    runner, scheduler, results = asyncio.run(scenario())
+    assert results == [0, 2, 4]
+    assert runner.batches == [[0, 1, 2]]
+    assert scheduler.stats()["avg_batch_size"] == 3
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_window():
+    async def scenario():
+        runner = _Runner()
+        scheduler = MicroBatchScheduler(runner, _double, window_ms=10_000, max_batch_size=2)
+        results = await asyncio.wait_for(asyncio.gather(*(scheduler.submit(i) for i in range(4))), 1)
+        return runner, results
+
+    runner, results = asyncio.run(scenario())
+    assert results == [0, 2, 4, 6]
+    assert runner.batches == [[0, 1], [2, 3]]
+
+
+def test_batch_failure_reaches_every_caller():
+    def fail(_model, items):
+        raise RuntimeError("decoder crashed")
+
+    async def scenario():
+        scheduler = MicroBatchScheduler(_Runner(), fail, window_ms=5)
+        return await asyncio.gather(scheduler.submit(1), scheduler.submit(2), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_requests_are_dropped_before_decoding():
+    async def scenario():
+        runner = _Runner()
+        scheduler = MicroBatchScheduler(runner, _double, window_ms=20)
+        abandoned = asyncio.ensure_future(scheduler.submit(1))
+        kept = asyncio.ensure_future(scheduler.submit(2))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        return runner, await kept
+
+    runner, result = asyncio.run(scenario())
+    assert result == 4
+    assert runner.batches == [[2]]
+
+
+def test_from_env_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("TRANSCRIBE_BATCH_WINDOW_MS", raising=False)
+    assert MicroBatchScheduler.from_env(_Runner(), _double) is None
+    monkeypatch.setenv("TRANSCRIBE_BATCH_WINDOW_MS", "15")
+    scheduler = MicroBatchScheduler.from_env(_Runner(), _double)
+    assert scheduler.window_s == pytest.approx(0.015)
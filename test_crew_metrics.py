@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+events = pytest.importorskip("crewai.events")
+
+from utils.crew_metrics import LLM_SECONDS, register_event_handlers
+
+
+def _emit(source, event):
+    # Handlers run on the event bus's worker pool
+    future = events.crewai_event_bus.emit(source, event)
+    if future is not None:
+        future.result(timeout=5)
+
+
+def _count(model: str, status: str) -> int:
+    series = LLM_SECONDS._series.get(("unknown", model, status))
+    return sum(series[0]) if series else 0
+
+
+def test_overlapping_calls_on_one_client_are_timed_by_call_id():
+    register_event_handlers()
+    llm = object()  # one shared client serving two calls at once
+    _emit(llm, events.LLMCallStartedEvent(model="overlap", call_id="slow", messages=[]))
+    time.sleep(0.05)
+    _emit(llm, events.LLMCallStartedEvent(model="overlap", call_id="fast", messages=[]))
+    _emit(llm, events.LLMCallCompletedEvent(model="overlap", call_id="fast", messages=[], response="ok",
+                                            call_type="llm_call"))
+    _emit(llm, events.LLMCallFailedEvent(model="overlap", call_id="slow", error="timeout"))
+
+    assert (_count("overlap", "ok"), _count("overlap", "error")) == (1, 1)
+    ok_total = LLM_SECONDS._series[("unknown", "overlap", "ok")][1]
+    error_total = LLM_SECONDS._series[("unknown", "overlap", "error")][1]
+    assert ok_total < 0.05 <= error_total
+
+
+def test_completion_without_a_matching_start_is_not_recorded():
+    register_event_handlers()
+    _emit(object(), events.LLMCallCompletedEvent(model="orphan", call_id="never-started", messages=[],
+                                                 response="ok", call_type="llm_call"))
+    assert _count("orphan", "ok") == 0
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils.crew_runner import CrewRunner, CrewTimeoutError, kickoff_parallel
+
+
+class _TaskOutput:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+class _Crew:
+    """Kicks off by echoing its inputs; optionally blocks on a gate or fails."""
+
+    def __init__(self, name, gate=None, error=None, task_callback=None):
+        self.name = name
+        self.gate = gate
+        self.error = error
+        self.task_callback = task_callback
+
+    def kickoff(self, inputs):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        output = _TaskOutput(f"{self.name}:{inputs['user_input']}")
+        if self.task_callback is not None:
+            self.task_callback(output)
+        return _Result([output])
+
+
+class _Result:
+    def __init__(self, tasks_output):
+        self.tasks_output = tasks_output
+        self.raw = tasks_output[-1].raw
+
+
+def _factory(name, **kwargs):
+    def build(task_callback=None):
+        return _Crew(name, task_callback=task_callback, **kwargs)
+    return build
+
+
+def test_kickoff_runs_on_the_crew_pool_and_reports_tasks():
+    async def scenario():
+        runner = CrewRunner(max_concurrency=2)
+        seen = []
+        result = await runner.kickoff(_factory("intake"), {"user_input": "theft"}, task_callback=seen.append)
+        runner.shutdown()
+        return result, seen
+
+    result, seen = asyncio.run(scenario())
+    assert result.raw == "intake:theft"
+    assert [output.raw for output in seen] == ["intake:theft"]
+
+
+def test_parallel_crews_join_in_factory_order():
+    async def scenario():
+        runner = CrewRunner(max_concurrency=2)
+        result = await runner.kickoff_parallel([_factory("intake"), _factory("advisory")], {"user_input": "x"})
+        runner.shutdown()
+        return result
+
+    result = asyncio.run(scenario())
+    assert [output.raw for output in result.tasks_output] == ["intake:x", "advisory:x"]
+    assert result.raw == "advisory:x"
+
+
+def test_blocking_kickoff_parallel_runs_crews_concurrently():
+    gate = threading.Barrier(2, timeout=5)
+
+    class _Both(_Crew):
+        def kickoff(self, inputs):
+            gate.wait()  # only returns if both crews run at the same time
+            return super().kickoff(inputs)
+
+    result = kickoff_parallel([lambda task_callback=None: _Both("a"), lambda task_callback=None: _Both("b")],
+                              {"user_input": "x"})
+    assert [output.raw for output in result.tasks_output] == ["a:x", "b:x"]
+
+
+def test_crew_errors_propagate():
+    async def scenario():
+        runner = CrewRunner()
+        try:
+            await runner.kickoff(_factory("intake", error=RuntimeError("llm down")), {"user_input": "x"})
+        finally:
+            runner.shutdown()
+
+    with pytest.raises(RuntimeError, match="llm down"):
+        asyncio.run(scenario())
+
+
+def test_timed_out_run_counts_as_in_flight_until_its_thread_finishes():
+    async def scenario():
+        gate = threading.Event()
+        runner = CrewRunner(max_concurrency=2)
+        with pytest.raises(CrewTimeoutError):
+            await runner.kickoff(_factory("draft", gate=gate), {"user_input": "x"}, timeout=0.05)
+        during = (runner.in_flight, runner.has_capacity(), runner.has_capacity(reserve=1))
+        gate.set()
+        for _ in range(100):
+            if runner.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        runner.shutdown()
+        return during, runner.in_flight
+
+    during, after = asyncio.run(scenario())
+    assert during == (1, True, False)
+    assert after == 0
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("CREW_MAX_CONCURRENCY", "3")
+    monkeypatch.setenv("CREW_TIMEOUT_SECONDS", "12")
+    runner = CrewRunner.from_env()
+    assert (runner.max_concurrency, runner.timeout_s) == (3, 12)
+    runner.shutdown()
@@ -0,0 +1,59 @@
+from utils.draft_streaming import TokenSink
+
+
+class _Loop:
+    """Runs call_soon_threadsafe callbacks inline."""
+
+    def call_soon_threadsafe(self, fn, *args):
+        fn(*args)
+
+
+class _Queue:
+    def __init__(self):
+        self.items = []
+
+    def put_nowait(self, item):
+        self.items.append(item)
+
+
+def _sink():
+    queue = _Queue()
+    return TokenSink(llm=object(), loop=_Loop(), queue=queue), queue
+
+
+def _text(queue) -> str:
+    return "".join(data["text"] for event, data in queue.items if event == "token")
+
+
+def test_only_the_final_answer_is_forwarded():
+    sink, queue = _sink()
+    sink.start_attempt()
+    for chunk in ["Thought: I need the IPC", " sections.\nFinal", " Answer:", "  \nFIRST INFORMATION", " REPORT\n", "..."]:
+        sink.push(chunk)
+    assert _text(queue) == "FIRST INFORMATION REPORT\n..."
+
+
+def test_scaffolding_without_a_final_answer_is_never_sent():
+    sink, queue = _sink()
+    sink.start_attempt()
+    sink.push("Thought: search first\nAction: Search IPC\nAction Input: {\"query\": \"theft\"}")
+    assert queue.items == []
+
+
+def test_new_attempt_after_sent_text_resets_the_client():
+    sink, queue = _sink()
+    sink.start_attempt()
+    sink.push("Final Answer: draft one")
+    sink.start_attempt()
+    sink.push("Final Answer: draft two")
+    assert [event for event, _ in queue.items] == ["token", "reset", "token"]
+    assert queue.items[-1][1] == {"text": "draft two"}
+
+
+def test_new_attempt_before_any_answer_does_not_reset():
+    sink, queue = _sink()
+    sink.start_attempt()
+    sink.push("Thought: calling a tool")
+    sink.start_attempt()
+    sink.push("Final Answer: the draft")
+    assert queue.items == [("token", {"text": "the draft"})]
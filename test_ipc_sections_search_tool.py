@@ -0,0 +1,92 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain_chroma")
+
+from tools import ipc_sections_search_tool as tool_module
+
+
+@pytest.fixture
+def opened(monkeypatch, tmp_path):
+    """Record every Chroma client the tool opens instead of opening one."""
+    opened = []
+
+    class _Chroma:
+        def __init__(self, **kwargs):
+            opened.append(kwargs)
+
+    monkeypatch.setattr(tool_module, "Chroma", _Chroma)
+    monkeypatch.setattr(tool_module, "get_embeddings", lambda: "embeddings")
+    monkeypatch.setattr(tool_module, "get_ipc_section_index", lambda: None)
+    monkeypatch.setattr(tool_module, "_VECTOR_DB", None)
+    monkeypatch.setattr(tool_module, "_VECTOR_DB_KEY", None)
+    monkeypatch.setenv("PERSIST_DIRECTORY_PATH", str(tmp_path))
+    monkeypatch.setenv("IPC_COLLECTION_NAME", "ipc")
+    (tmp_path / "chroma.sqlite3").write_bytes(b"")
+    return opened
+
+
+def test_vector_db_is_opened_once(opened):
+    assert tool_module.get_vector_db() is tool_module.get_vector_db()
+    assert opened == [{"collection_name": "ipc", "persist_directory": os.environ["PERSIST_DIRECTORY_PATH"],
+                       "embedding_function": "embeddings"}]
+
+
+def test_vector_db_reopens_after_a_rebuild_or_config_change(opened, monkeypatch, tmp_path):
+    first = tool_module.get_vector_db()
+    os.utime(tmp_path / "chroma.sqlite3", (1, 1))  # rebuilt on disk
+    rebuilt = tool_module.get_vector_db()
+    monkeypatch.setenv("IPC_COLLECTION_NAME", "ipc_v2")
+    renamed = tool_module.get_vector_db()
+    assert len({id(first), id(rebuilt), id(renamed)}) == 3
+    assert opened[-1]["collection_name"] == "ipc_v2"
+
+
+def test_missing_persist_directory_is_an_error(opened, monkeypatch):
+    monkeypatch.delenv("PERSIST_DIRECTORY_PATH")
+    with pytest.raises(EnvironmentError):
+        tool_module.get_vector_db()
+
+
+def test_dense_and_bm25_hits_are_fused(opened, monkeypatch):
+    from tools.lexical_ipc_index import BM25Index
+
+    dense = [SimpleNamespace(page_content="Section 406: Criminal breach of trust", metadata={"section": "406"}),
+             SimpleNamespace(page_content="Section 304B: Dowry death", metadata={"section": "304B"})]
+    monkeypatch.setattr(tool_module, "get_vector_db",
+                        lambda: SimpleNamespace(similarity_search=lambda query, k: dense[:k]))
+    monkeypatch.setattr(tool_module, "get_ipc_lexical_index", lambda: BM25Index(
+        [(doc.page_content, doc.metadata) for doc in dense] + [("Section 498A: Cruelty by husband", {"section": "498A"})]))
+
+    # 304B is in both rankings, 406 only in the dense one, 498A in neither
+    results = tool_module.search_ipc_sections.func("dowry death")
+    assert [r["section"] for r in results] == ["304B", "406"]
+
+
+def test_hybrid_search_can_be_turned_off(opened, monkeypatch):
+    monkeypatch.setenv("IPC_HYBRID_SEARCH", "0")
+    monkeypatch.setattr(tool_module, "get_ipc_lexical_index", lambda: pytest.fail("BM25 index built"))
+    monkeypatch.setattr(tool_module, "get_vector_db", lambda: SimpleNamespace(
+        similarity_search=lambda query, k: [SimpleNamespace(page_content="x", metadata={"section": "1"})] * k))
+    assert len(tool_module.search_ipc_sections.func("theft")) == 3
+
+
+def test_named_sections_skip_the_vector_store(opened, monkeypatch):
+    from tools.lexical_ipc_index import SectionIndex
+
+    theft = ("Section 379: Punishment for theft\n\nWhoever commits theft shall be punished.",
+             {"section": 379, "section_title": "Punishment for theft", "chapter": 17})
+    monkeypatch.setattr(tool_module, "get_ipc_section_index", lambda: SectionIndex([theft]))
+    monkeypatch.setattr(tool_module, "get_vector_db", lambda: pytest.fail("vector store searched"))
+    assert [r["section"] for r in tool_module.search_ipc_sections.func("punishment u/s 379")] == [379]
+
+
+def test_top_k_is_per_call_and_clamped(opened, monkeypatch):
+    monkeypatch.setenv("IPC_HYBRID_SEARCH", "0")
+    monkeypatch.setenv("IPC_SEARCH_MAX_K", "5")
+    monkeypatch.setattr(tool_module, "get_vector_db", lambda: SimpleNamespace(
+        similarity_search=lambda query, k: [SimpleNamespace(page_content=str(i), metadata={}) for i in range(k)]))
+    assert len(tool_module.search_ipc_sections.func("theft", top_k=1)) == 1
+    assert len(tool_module.search_ipc_sections.func("theft", top_k=50)) == 5
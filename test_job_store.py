@@ -0,0 +1,112 @@
+import asyncio
+import json
+import threading
+
+from utils.job_store import JobStore, format_sse, sse_events
+
+
+def _parse(stream: list[str]) -> list[tuple[int, str, dict]]:
+    events = []
+    for message in stream:
+        if message.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+        events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _collect(job, last_event_id=-1, keepalive_s=5):
+    return [message async for message in sse_events(job, last_event_id, keepalive_s)]
+
+
+def test_format_sse():
+    assert format_sse("progress", {"step": "धारा"}, 3) == 'id: 3\nevent: progress\ndata: {"step": "धारा"}\n\n'
+    assert format_sse("ping", {}) == "event: ping\ndata: {}\n\n"
+
+
+def test_job_streams_events_from_worker_threads_until_it_finishes():
+    async def run(job):
+        def crew_thread():
+            job.add_event("task_completed", {"task": "intake"})
+        thread = threading.Thread(target=crew_thread)
+        thread.start()
+        await asyncio.to_thread(thread.join)
+        return {"advisory_json": "{}"}
+
+    async def scenario():
+        store = JobStore()
+        job = store.start("analyze", run)
+        events = _parse(await asyncio.wait_for(_collect(job), 2))
+        return store, job, events
+
+    store, job, events = asyncio.run(scenario())
+    assert [event for _, event, _ in events] == ["running", "task_completed", "succeeded"]
+    assert [event_id for event_id, _, _ in events] == [0, 1, 2]
+    assert events[-1][2] == {"result": {"advisory_json": "{}"}}
+    assert store.get(job.id) is job and job.finished
+
+
+def test_reconnect_resumes_after_last_event_id():
+    async def run(job):
+        job.add_event("task_completed", {"task": "intake"})
+        return "done"
+
+    async def scenario():
+        job = JobStore().start("analyze", run)
+        await asyncio.wait_for(_collect(job), 2)
+        return _parse(await _collect(job, last_event_id=1))
+
+    assert [event for _, event, _ in asyncio.run(scenario())] == ["succeeded"]
+
+
+def test_failed_job_reports_its_error():
+    async def run(job):
+        raise RuntimeError("crew blew up")
+
+    async def scenario():
+        job = JobStore().start("draft", run)
+        return job, _parse(await asyncio.wait_for(_collect(job), 2))
+
+    job, events = asyncio.run(scenario())
+    assert job.status == "failed" and job.error == "crew blew up"
+    assert events[-1][1:] == ("failed", {"error": "crew blew up"})
+
+
+def test_keepalive_while_waiting():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def run(job):
+            await release.wait()
+
+        job = JobStore().start("draft", run)
+        stream = sse_events(job, keepalive_s=0.05)
+        messages = [await stream.__anext__() for _ in range(2)]
+        release.set()
+        messages += [message async for message in stream]
+        return messages
+
+    messages = asyncio.run(scenario())
+    assert ": keep-alive\n\n" in messages
+    assert [event for _, event, _ in _parse(messages)] == ["running", "succeeded"]
+
+
+def test_finished_jobs_are_evicted_after_ttl_or_over_capacity():
+    async def run(job):
+        return None
+
+    async def scenario():
+        store = JobStore(ttl_s=3600, max_jobs=2)
+        jobs = []
+        for _ in range(3):
+            jobs.append(store.start("draft", run))
+            await asyncio.sleep(0.01)
+        return store, jobs
+
+    store, jobs = asyncio.run(scenario())
+    assert store.get(jobs[0].id) is None
+    assert store.get(jobs[2].id) is jobs[2]
+
+    store.ttl_s = 0
+    jobs[2].finished_at -= 1
+    assert store.get(jobs[2].id) is None
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from tools import lexical_ipc_index
+from tools.lexical_ipc_index import (
+    BM25Index, SectionIndex, clamp_top_k, lookup_sections, parse_section_numbers, reciprocal_rank_fusion, tokenize,
+)
+
+DOCUMENTS = [
+    ("Section 302: Punishment for murder\n\nWhoever commits murder shall be punished with death.",
+     {"section": "302", "section_title": "Punishment for murder", "language": "english"}),
+    ("Section 304B: Dowry death\n\nWhere the death of a woman is caused within seven years of marriage.",
+     {"section": "304B", "section_title": "Dowry death", "language": "english"}),
+    ("Section 379: Punishment for theft\n\nWhoever commits theft shall be punished.",
+     {"section": "379", "section_title": "Punishment for theft", "language": "english"}),
+    ("धारा ४२० छल करना और संपत्ति परिदत्त करने के लिए बेईमानी से उत्प्रेरित करना",
+     {"page": "88", "language": "hindi"}),
+]
+
+
+def test_tokenize_drops_stopwords_and_normalizes_digits():
+    assert tokenize("The punishment for Section 498A") == ["punishment", "section", "498a"]
+    assert "420" in tokenize("धारा ४२० का अपराध")
+
+
+def test_bm25_ranks_exact_terms_first():
+    index = BM25Index(DOCUMENTS)
+    hits = index.search("dowry death", k=2)
+    assert hits[0][1]["section"] == "304B"
+    assert all(score > 0 for _, _, score in hits)
+
+
+def test_bm25_language_filter():
+    index = BM25Index(DOCUMENTS)
+    assert [meta["language"] for _, meta, _ in index.search("धारा 420", k=5, language="hindi")] == ["hindi"]
+    assert index.search("धारा 420", k=5, language="english") == []
+
+
+def test_reciprocal_rank_fusion_prefers_hits_in_both_rankings():
+    dense = [("a", {}), ("b", {}), ("c", {})]
+    lexical = [("c", {}, 9.0), ("d", {}, 5.0)]
+    fused = [content for content, _ in reciprocal_rank_fusion([dense, lexical], k=60)]
+    assert fused[0] == "c"
+    assert set(fused) == {"a", "b", "c", "d"}
+
+
+def test_parse_section_numbers():
+    assert parse_section_numbers("Is this u/s 498A or sections 302 and 34?") == ["498A", "302", "34"]
+    assert parse_section_numbers("धारा ४२० के तहत") == ["420"]
+    assert parse_section_numbers("my neighbour stole 302 rupees") == []
+
+
+def test_section_index_answers_named_sections():
+    index = SectionIndex(DOCUMENTS)
+    hits = lookup_sections(index, "test", "punishment u/s 304b")
+    assert [meta["section"] for _, meta in hits] == ["304B"]
+    assert lookup_sections(index, "test", "what is the punishment for theft") is None
+    # Sections only indexed in English are a miss for Hindi, so the caller searches instead
+    assert lookup_sections(index, "test", "Section 302", language="hindi") is None
+
+
+def test_section_index_skips_guessed_sections():
+    documents = [
+        # PDF-extracted record whose section was guessed from a cross-reference
+        ("Section 2\n\nsection 2 of the Dowry Prohibition Act, 1961", {"section": "2", "language": "english"}),
+        # Second chunk of a split section: no header
+        ("shall also be liable to fine.", {"section": "302", "section_title": "Punishment for murder"}),
+    ]
+    index = SectionIndex(documents)
+    assert len(index) == 0
+    assert lookup_sections(index, "test", "Section 2") is None
+
+
+def _write_ipc_json(path):
+    path.write_text(json.dumps([{
+        "chapter": 17, "chapter_title": "Of Offences Against Property", "Section": 379,
+        "section_title": "Punishment for theft", "section_desc": "Whoever commits theft shall be punished.",
+    }]), encoding="utf-8")
+
+
+def test_multilingual_section_index_reads_ipc_json_outside_ipc_json_paths(monkeypatch, tmp_path):
+    pytest.importorskip("langchain_community")
+    pages = tmp_path / "pages.json"
+    pages.write_text(json.dumps([{"id": "p1", "language": "hindi", "granularity": "page", "page": 3,
+                                  "text": "चोरी के लिए दंड"}]), encoding="utf-8")
+    _write_ipc_json(tmp_path / "ipc.json")
+    monkeypatch.setattr(lexical_ipc_index, "_INDEXES", {})
+    monkeypatch.setenv("IPC_JSON_PATHS", str(pages))
+    monkeypatch.setenv("IPC_SECTIONS_JSON_PATH", str(tmp_path / "ipc.json"))
+
+    sections = lexical_ipc_index.get_multilingual_section_index()
+    assert [meta["language"] for _, meta in sections.lookup("379")] == ["english"]
+    # The BM25 index still covers only the search corpora
+    assert len(lexical_ipc_index.get_multilingual_lexical_index()) == 1
+
+
+def test_ipc_lexical_index_is_built_from_ipc_json_path(monkeypatch, tmp_path):
+    pytest.importorskip("langchain_community")
+    path = tmp_path / "ipc.json"
+    _write_ipc_json(path)
+    monkeypatch.setattr(lexical_ipc_index, "_INDEXES", {})
+    monkeypatch.setenv("IPC_JSON_PATH", str(path))
+    index = lexical_ipc_index.get_ipc_lexical_index()
+    assert index is lexical_ipc_index.get_ipc_lexical_index()
+    assert index.search("theft", k=1)[0][1]["section"] == 379
+    # ipc_vectordb_builder's documents carry the title and "Section N:" header the section index needs
+    assert len(lexical_ipc_index.get_ipc_section_index().lookup("379")) == 1
+
+
+def test_unreadable_corpus_leaves_dense_search_only(monkeypatch):
+    monkeypatch.setattr(lexical_ipc_index, "_INDEXES", {})
+    monkeypatch.setattr(lexical_ipc_index, "_ipc_documents", lambda: json.loads("not json"))
+    assert lexical_ipc_index.get_ipc_lexical_index() is None
+
+
+def test_clamp_top_k(monkeypatch):
+    monkeypatch.setenv("IPC_SEARCH_MAX_K", "5")
+    assert clamp_top_k(50) == 5
+    assert clamp_top_k(0) == 1
+    assert clamp_top_k("three") == 3
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from utils import llm_router
+from utils.guarded_llm import RateLimitedLLM
+from utils.llm_router import RoutedLLM
+
+
+class _Secondary:
+    def __init__(self, model, answer="secondary", error=None):
+        self.model = model
+        self.answer = answer
+        self.error = error
+        self.calls = 0
+
+    def call(self, *args, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+
+@pytest.fixture
+def primary(monkeypatch, request):
+    """A RoutedLLM whose own provider call is `behaviour` (set per test)."""
+    monkeypatch.setenv("LLM_HEDGE_AFTER_SECONDS", "0.05")
+    monkeypatch.setenv("LLM_FAILOVER_ERRORS", "2")
+    calls = []
+
+    def fake_call(self, *args, **kwargs):
+        calls.append(args)
+        return self.behaviour()
+
+    monkeypatch.setattr(RateLimitedLLM, "call", fake_call)
+
+    def build(secondary, behaviour):
+        # Skip LLM.__new__'s provider routing, which needs litellm; __init__ is the real one
+        llm = object.__new__(RoutedLLM)
+        RoutedLLM.__init__(llm, model=f"gemini/{request.node.name}", secondary=secondary)
+        object.__setattr__(llm, "behaviour", behaviour)
+        llm.calls = calls
+        return llm
+
+    return build
+
+
+def test_fast_primary_is_not_hedged(primary):
+    secondary = _Secondary("groq/fast")
+    llm = primary(secondary, lambda: "primary")
+    assert llm.call("hi") == "primary"
+    assert secondary.calls == 0
+
+
+def test_slow_primary_is_hedged_and_the_first_answer_wins(primary):
+    gate = threading.Event()
+    secondary = _Secondary("groq/hedge")
+    llm = primary(secondary, lambda: gate.wait(5) and "primary")
+    try:
+        assert llm.call("hi") == "secondary"
+    finally:
+        gate.set()
+    assert secondary.calls == 1
+
+
+def test_primary_error_fails_over_for_that_call(primary):
+    secondary = _Secondary("groq/error")
+    llm = primary(secondary, lambda: (_ for _ in ()).throw(RuntimeError("503")))
+    assert llm.call("hi") == "secondary"
+
+
+def test_repeated_primary_errors_route_straight_to_the_secondary(primary):
+    secondary = _Secondary("groq/unhealthy")
+    llm = primary(secondary, lambda: (_ for _ in ()).throw(RuntimeError("503")))
+    llm.call("one")
+    llm.call("two")
+    attempts = len(llm.calls)
+    assert llm.call("three") == "secondary"
+    assert len(llm.calls) == attempts  # the primary was skipped
+
+
+def test_tool_executing_calls_are_never_hedged(primary):
+    gate = threading.Timer(0.2, lambda: None)
+    secondary = _Secondary("groq/tools")
+    llm = primary(secondary, lambda: (gate.join(), "primary")[1])
+    gate.start()
+    assert llm.call("hi", available_functions={"send_email": print}) == "primary"
+    assert secondary.calls == 0
+
+
+def test_both_providers_failing_raises_the_primary_error(primary):
+    gate = threading.Event()
+
+    def slow_failure():
+        gate.wait(5)
+        raise RuntimeError("primary down")
+
+    secondary = _Secondary("groq/down", error=RuntimeError("secondary down"))
+    llm = primary(secondary, slow_failure)
+    threading.Timer(0.2, gate.set).start()
+    with pytest.raises(RuntimeError, match="primary down"):
+        llm.call("hi")
+
+
+def test_provider_stats_record_latency_per_model(primary):
+    llm = primary(None, lambda: "primary")
+    llm.call("hi")
+    assert llm_router.provider_stats()[llm.model]["samples"] == 1
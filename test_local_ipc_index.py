@@ -0,0 +1,65 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tools import local_ipc_index
+from tools.local_ipc_index import EMBEDDINGS_FILE, LocalIpcIndex, get_local_index, write_local_index
+
+
+def _doc(content, **metadata):
+    return SimpleNamespace(page_content=content, metadata=metadata)
+
+
+DOCS = [
+    _doc("theft", id="en-378", language="english", section="378"),
+    _doc("murder", id="en-302", language="english", section="302"),
+    _doc("चोरी", id="hi-378", language="hindi", section="378", page=12),
+]
+VECTORS = [[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]]
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    write_local_index(str(tmp_path), VECTORS, DOCS)
+    return str(tmp_path)
+
+
+def test_search_ranks_by_cosine_similarity(index_dir):
+    index = LocalIpcIndex(index_dir)
+    hits = index.search([2, 0, 0], k=2)
+    assert [content for content, _, _ in hits] == ["theft", "चोरी"]
+    assert hits[0][2] == pytest.approx(1.0, abs=1e-3)
+    # Unset columns are left out of the metadata
+    assert hits[0][1] == {"id": "en-378", "language": "english", "section": "378"}
+
+
+def test_language_filter_ranks_only_that_partition(index_dir):
+    index = LocalIpcIndex(index_dir)
+    assert [meta["id"] for _, meta, _ in index.search([1, 0, 0], k=3, language="hindi")] == ["hi-378"]
+    assert index.search([1, 0, 0], k=3, language="tamil") == []
+
+
+def test_float16_index_is_upcast_and_float32_is_memory_mapped(tmp_path):
+    write_local_index(str(tmp_path / "f16"), VECTORS, DOCS)
+    write_local_index(str(tmp_path / "f32"), VECTORS, DOCS, dtype="float32")
+    f16, f32 = LocalIpcIndex(str(tmp_path / "f16")), LocalIpcIndex(str(tmp_path / "f32"))
+    assert f16.matrix.dtype == np.float32 and not isinstance(f16.matrix, np.memmap)
+    assert isinstance(f32.matrix, np.memmap)
+    assert len(f16) == len(f32) == 3
+
+
+def test_inconsistent_index_is_rejected(index_dir):
+    np.save(os.path.join(index_dir, EMBEDDINGS_FILE), np.zeros((2, 3), dtype=np.float32))
+    with pytest.raises(ValueError, match="rebuild"):
+        LocalIpcIndex(index_dir)
+
+
+def test_shared_index_is_loaded_once_per_directory(index_dir, monkeypatch, tmp_path):
+    monkeypatch.setattr(local_ipc_index, "_INDEX", None)
+    monkeypatch.setenv("LOCAL_IPC_INDEX_DIR", index_dir)
+    assert get_local_index() is get_local_index()
+    monkeypatch.setenv("LOCAL_IPC_INDEX_DIR", str(tmp_path / "missing"))
+    with pytest.raises(FileNotFoundError):
+        get_local_index()
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+vad = pytest.importorskip("faster_whisper.vad")
+
+from utils.long_audio import plan_chunks, transcribe_long  # noqa: E402
+from utils.transcription import SAMPLE_RATE  # noqa: E402
+
+
+def _seconds(value: float) -> int:
+    return int(value * SAMPLE_RATE)
+
+
+# Speech every 10 s, each 8 s long: silences at 8-10 s, 18-20 s, ...
+SPEECH = [{"start": _seconds(t), "end": _seconds(t + 8)} for t in range(0, 60, 10)]
+
+
+@pytest.fixture
+def speech(monkeypatch):
+    monkeypatch.setattr(vad, "get_speech_timestamps", lambda audio, options=None: [
+        s for s in SPEECH if s["start"] < len(audio)
+    ])
+
+
+def test_chunks_cover_the_audio_and_cut_in_silence(speech):
+    audio = np.zeros(_seconds(60), dtype=np.float32)
+    chunks = plan_chunks(audio, target_s=20)
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(chunks, chunks[1:]))
+    for _, end in chunks[:-1]:
+        # Every cut lies in the middle of a silence
+        assert (end / SAMPLE_RATE) % 10 == pytest.approx(9)
+
+
+def test_short_audio_is_one_chunk(speech):
+    audio = np.zeros(_seconds(15), dtype=np.float32)
+    assert plan_chunks(audio, target_s=60) == [(0, len(audio))]
+
+
+class _Model:
+    def detect_language(self, audio, vad_filter=True):
+        return "hi", 0.97, None
+
+    def transcribe(self, audio, **kwargs):
+        length = len(audio) / SAMPLE_RATE
+        segments = [SimpleNamespace(start=0.5, end=length - 0.5, text=f" chunk of {length:.0f}s ")]
+        return iter(segments), SimpleNamespace(language=kwargs.get("language"), language_probability=1.0)
+
+
+class _Pool:
+    """Runs jobs inline; records how much audio language detection was given."""
+
+    def __init__(self):
+        self.model = _Model()
+        self.detection_samples = None
+
+    async def run(self, fn, audio):
+        self.detection_samples = len(audio)
+        return fn(self.model, audio)
+
+    async def map(self, fn, arg_list):
+        return [fn(self.model, *args) for args in arg_list]
+
+
+def test_long_audio_segments_are_shifted_onto_the_recording_timeline(speech, monkeypatch):
+    monkeypatch.setattr("utils.long_audio.LANGUAGE_DETECTION_SCAN_SECONDS", 15)
+    audio = np.zeros(_seconds(60), dtype=np.float32)
+    monkeypatch.setattr("utils.long_audio.plan_chunks", lambda audio: [(0, _seconds(30)), (_seconds(30), len(audio))])
+    pool = _Pool()
+
+    result = asyncio.run(transcribe_long(pool, audio))
+
+    assert pool.detection_samples == _seconds(15)
+    assert result["language"] == "hi" and not result["forced_hindi"]
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [(0.5, 29.5), (30.5, 59.5)]
+    assert result["text"] == "chunk of 30s chunk of 30s"
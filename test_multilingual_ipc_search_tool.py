@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain_huggingface")
+
+from tools import multilingual_ipc_search_tool as tool_module
+from tools.lexical_ipc_index import SectionIndex
+
+THEFT = ("Section 379: Punishment for theft\n\nWhoever commits theft shall be punished.",
+         {"section": "379", "section_title": "Punishment for theft", "language": "english"})
+
+
+@pytest.fixture
+def searched(monkeypatch):
+    """Languages the hybrid search ran for; it answers with one hit per language."""
+    searched = []
+
+    def hybrid_hits(query, query_embedding, top_k, backend, lexical_index, language):
+        searched.append(language)
+        return [(f"{language} result", {"language": language, "granularity": "page"})]
+
+    monkeypatch.setattr(tool_module, "get_multilingual_section_index", lambda: SectionIndex([THEFT]))
+    monkeypatch.setattr(tool_module, "get_multilingual_lexical_index", lambda: None)
+    monkeypatch.setattr(tool_module, "get_embeddings", lambda: SimpleNamespace(embed_query=lambda query: [1.0]))
+    monkeypatch.setattr(tool_module, "_hybrid_hits", hybrid_hits)
+    monkeypatch.setenv("IPC_VECTOR_BACKEND", "local")
+    return searched
+
+
+def _languages(results) -> list[str]:
+    return [result["language"] for result in results]
+
+
+def test_named_section_is_answered_without_search(searched):
+    results = tool_module.search_multilingual_ipc.func("[english] punishment under Section 379")
+    assert results[0]["section"] == "379" and searched == []
+
+
+def test_hindi_request_for_an_english_only_section_is_searched(searched):
+    results = tool_module.search_multilingual_ipc.func("[hindi] धारा 379")
+    assert _languages(results) == ["hindi"] and searched == ["hindi"]
+
+
+def test_balanced_request_adds_hindi_results_to_the_english_section(searched):
+    results = tool_module.search_multilingual_ipc.func("[all] Section 379")
+    assert _languages(results) == ["english", "hindi"] and searched == ["hindi"]
+
+
+def test_balanced_request_without_a_configured_backend_returns_the_section(searched, monkeypatch):
+    monkeypatch.setenv("IPC_VECTOR_BACKEND", "pinecone")
+    monkeypatch.delenv("PINECONE_INDEX_NAME", raising=False)
+    assert _languages(tool_module.search_multilingual_ipc.func("[all] Section 379")) == ["english"]
+    assert "error" in tool_module.search_multilingual_ipc.func("[all] theft")[0]
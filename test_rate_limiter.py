@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from utils.rate_limiter import (
+    CircuitBreaker, CircuitOpenError, ProviderGuard, RateLimitTimeout, TokenBucket, is_rate_limit_error,
+    retry_after_seconds,
+)
+
+
+def test_bucket_allows_burst_then_waits():
+    bucket = TokenBucket("test/model", rpm=60, burst=3)
+    for _ in range(3):
+        assert bucket.acquire(max_wait=0) == pytest.approx(0, abs=0.05)
+    assert bucket.available() < 1
+    with pytest.raises(RateLimitTimeout):
+        bucket.acquire(max_wait=0.1)
+
+
+def test_bucket_default_burst_is_a_minute_of_budget():
+    assert TokenBucket("test/model", rpm=60).burst == 60
+
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket("test/model", rpm=600, burst=1)
+    bucket.acquire(max_wait=0)
+    waited = bucket.acquire(max_wait=2)  # one token per 0.1 s
+    assert 0.05 <= waited < 1
+
+
+def test_block_for_drains_and_pauses_the_bucket():
+    bucket = TokenBucket("test/model", rpm=60, burst=5)
+    bucket.block_for(30)
+    assert bucket.available() == 0
+    with pytest.raises(RateLimitTimeout) as excinfo:
+        bucket.acquire(max_wait=1)
+    assert excinfo.value.retry_after > 25
+
+
+def test_bucket_state_is_shared_through_state_dir(tmp_path):
+    first = TokenBucket("test/model", rpm=60, burst=2, state_dir=str(tmp_path))
+    second = TokenBucket("test/model", rpm=60, burst=2, state_dir=str(tmp_path))
+    first.acquire(max_wait=0)
+    second.acquire(max_wait=0)
+    with pytest.raises(RateLimitTimeout):
+        first.acquire(max_wait=0.1)
+
+
+def test_breaker_opens_after_consecutive_rate_limits():
+    breaker = CircuitBreaker("test/model", failure_threshold=2, reset_s=30)
+    breaker.record_rate_limited()
+    breaker.before_call()
+    breaker.record_rate_limited()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_lets_one_trial_through_when_half_open():
+    breaker = CircuitBreaker("test/model", failure_threshold=1, reset_s=0.05)
+    breaker.record_rate_limited()
+    time.sleep(0.1)
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_breaker_ignores_other_failures():
+    breaker = CircuitBreaker("test/model", failure_threshold=1)
+    breaker.record_other_failure()
+    assert breaker.state == "closed"
+
+
+def test_guard_headroom_needs_closed_circuit_and_tokens():
+    guard = ProviderGuard(TokenBucket("test/model", rpm=60, burst=3), CircuitBreaker("test/model", 1))
+    assert guard.has_headroom(3)
+    assert not guard.has_headroom(4)
+    guard.breaker.record_rate_limited()
+    assert not guard.has_headroom(1)
+
+
+class _ProviderError(Exception):
+    def __init__(self, message, status_code=None, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+def test_rate_limit_errors_are_recognised():
+    assert is_rate_limit_error(_ProviderError("slow down", status_code=429))
+    assert is_rate_limit_error(Exception("RESOURCE_EXHAUSTED: quota"))
+    assert not is_rate_limit_error(_ProviderError("bad request", status_code=400))
+
+
+def test_retry_after_from_header_or_gemini_retry_delay():
+    assert retry_after_seconds(_ProviderError("429", headers={"retry-after": "12"})) == 12
+    assert retry_after_seconds(Exception('{"retryDelay": "7s"}')) == 7
+    assert retry_after_seconds(Exception("rate limited")) is None
@@ -0,0 +1,97 @@
+import asyncio
+from concurrent.futures import Future
+
+from utils.speculative_drafts import SpeculativeDrafts
+
+
+def _drafts(**kwargs) -> SpeculativeDrafts:
+    return SpeculativeDrafts(**{"enabled": True, "max_in_flight": 1, **kwargs})
+
+
+def test_key_ignores_advisory_formatting():
+    advisory = '{"severity": "High", "legal_type": "Criminal"}'
+    reformatted = '{\n  "legal_type": "Criminal",\n  "severity": "High"\n}'
+    assert SpeculativeDrafts.make_key("A  case", advisory, "English") == \
+        SpeculativeDrafts.make_key("A case", reformatted, "english")
+
+
+def test_claim_returns_a_finished_or_running_result():
+    async def scenario():
+        drafts = _drafts(max_in_flight=2)
+        release = asyncio.Event()
+
+        async def slow(track):
+            await release.wait()
+            return {"document": "slow"}
+
+        async def fast(track):
+            return {"document": "fast"}
+
+        assert drafts.start("slow", slow) and drafts.start("fast", fast)
+        await asyncio.sleep(0)
+        claimed_fast = await drafts.claim("fast")
+        release.set()
+        claimed_slow = await drafts.claim("slow")
+        return claimed_fast, claimed_slow, await drafts.claim("slow"), drafts.stats()
+
+    fast, slow, again, stats = asyncio.run(scenario())
+    assert (fast, slow, again) == ({"document": "fast"}, {"document": "slow"}, None)
+    assert stats["claimed"] == 1 and stats["claimed_in_flight"] == 1
+
+
+def test_failed_run_is_claimed_as_none():
+    async def scenario():
+        drafts = _drafts()
+
+        async def fail(track):
+            raise RuntimeError("crew failed")
+
+        drafts.start("key", fail)
+        claimed = await drafts.claim("key")
+        await asyncio.sleep(0)
+        return claimed, drafts.stats()["failed"]
+
+    assert asyncio.run(scenario()) == (None, 1)
+
+
+def test_disabled_or_busy_speculation_does_not_start_and_checks_capacity_last():
+    calls = []
+
+    def has_capacity():
+        calls.append(1)
+        return True
+
+    async def scenario():
+        async def run(track):
+            await asyncio.sleep(1)
+
+        assert not SpeculativeDrafts(enabled=False).start("key", run, has_capacity)
+        drafts = _drafts()
+        assert not drafts.start("key", run, lambda: False)
+        assert drafts.start("key", run, has_capacity)
+        assert not drafts.start("other", run, has_capacity)  # at the in-flight cap
+        return len(calls)
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_evicted_run_counts_until_its_crew_work_finishes():
+    async def scenario():
+        drafts = _drafts(ttl_s=60)
+        crew_future = Future()  # stands in for the crew pool's future
+
+        async def run(track):
+            track(crew_future)
+            await asyncio.sleep(10)
+
+        drafts.start("key", run)
+        await asyncio.sleep(0)
+        drafts._runs["key"]["created_at"] -= 120  # expire it
+        started_other = drafts.start("other", run)
+        for _ in range(3):
+            await asyncio.sleep(0)  # let the cancellation and its callbacks run
+        during = drafts.in_flight
+        crew_future.set_result(None)  # the crew thread finally ends
+        return started_other, during, drafts.in_flight, drafts.stats()["evicted"]
+
+    assert asyncio.run(scenario()) == (False, 1, 0, 1)
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from utils.structured_output import (  # noqa: E402
+    Advisory, IpcSections, OutputValidationError, extract_json, parse_structured, structured_guardrail,
+)
+
+ADVISORY = {
+    "severity": "High",
+    "legal_type": "Criminal",
+    "recommended_action": "File FIR",
+    "step_guidance": "1. Go to the police station.",
+}
+
+
+class _TaskOutput:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+class _LLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def call(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+
+def test_extract_json_ignores_fences_and_prose():
+    text = 'Here you go:\n```json\n{"a": "x } y", "b": [1, 2]}\n```\nThanks'
+    assert extract_json(text) == {"a": "x } y", "b": [1, 2]}
+    with pytest.raises(ValueError):
+        extract_json("no json here {broken")
+
+
+def test_parse_skips_candidates_that_do_not_validate():
+    text = f'Thought: the format is {{"severity": "..."}}\nFinal Answer: {json.dumps(ADVISORY)}'
+    assert parse_structured(text, Advisory).recommended_action == "File FIR"
+
+
+def test_parse_normalizes_and_keeps_extra_fields():
+    advisory = parse_structured(json.dumps({**ADVISORY, "step_guidance": ["1. a", "2. b"], "urgency": "today"}), Advisory)
+    dumped = json.loads(advisory.model_dump_json())
+    assert dumped["step_guidance"] == "1. a\n2. b"
+    assert dumped["urgency"] == "today"
+
+
+def test_single_section_object_is_wrapped():
+    sections = parse_structured('{"section": 302, "content": "Punishment for murder"}', IpcSections)
+    assert sections.root[0].section == "302"
+
+
+def test_invalid_output_raises():
+    with pytest.raises(OutputValidationError):
+        parse_structured('{"severity": "High"}', Advisory)
+
+
+def test_guardrail_passes_valid_output_without_an_llm_call():
+    llm = _LLM("unused")
+    ok, value = structured_guardrail(Advisory, llm)(_TaskOutput(f"```json\n{json.dumps(ADVISORY)}\n```"))
+    assert ok and json.loads(value) == ADVISORY
+    assert llm.prompts == []
+
+
+def test_guardrail_repairs_invalid_output_once():
+    llm = _LLM(json.dumps(ADVISORY))
+    ok, value = structured_guardrail(Advisory, llm)(_TaskOutput("Severity: High, file an FIR"))
+    assert ok and json.loads(value) == ADVISORY
+    assert len(llm.prompts) == 1
+
+
+def test_guardrail_passes_raw_output_through_when_repair_fails():
+    raw = "Severity: High, file an FIR"
+    ok, value = structured_guardrail(Advisory, _LLM("still not json"))(_TaskOutput(raw))
+    assert ok and value == raw
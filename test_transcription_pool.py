@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils import transcription_pool
+from utils.transcription_pool import QueueFullError, TranscriptionPool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Workers get a placeholder instead of loading Whisper
+    monkeypatch.setattr(transcription_pool, "_init_worker", lambda *args: setattr(transcription_pool._worker, "model", "model"))
+    pool = TranscriptionPool(workers=1, mode="thread", max_queue=1)
+    yield pool
+    pool.shutdown()
+
+
+def _wait(model, gate: threading.Event, value):
+    assert model == "model"
+    gate.wait(5)
+    return value
+
+
+def test_jobs_receive_the_worker_model(pool):
+    assert asyncio.run(pool.run(lambda model, x: (model, x), 1)) == ("model", 1)
+
+
+def test_full_queue_is_rejected_with_retry_after(pool):
+    async def scenario():
+        gate = threading.Event()
+        running = [asyncio.ensure_future(pool.run(_wait, gate, i)) for i in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(QueueFullError) as excinfo:
+            await pool.run(_wait, gate, 2)
+        gate.set()
+        return excinfo.value, await asyncio.gather(*running)
+
+    error, results = asyncio.run(scenario())
+    assert error.retry_after >= 1
+    assert results == [0, 1]
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_map_is_admitted_as_one_request(pool):
+    async def scenario():
+        gate = threading.Event()
+        fan_out = asyncio.ensure_future(pool.map(_wait, [(gate, i) for i in range(4)]))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["in_flight"] == 1
+        single = asyncio.ensure_future(pool.run(_wait, gate, "single"))
+        gate.set()
+        return await fan_out, await single
+
+    assert asyncio.run(scenario()) == ([0, 1, 2, 3], "single")
+
+
+def test_cancelled_request_keeps_its_slot_until_the_job_ends(pool):
+    async def scenario():
+        gate = threading.Event()
+        abandoned = asyncio.ensure_future(pool.run(_wait, gate, "abandoned"))
+        await asyncio.sleep(0.05)
+        abandoned.cancel()
+        await asyncio.sleep(0.05)
+        held = pool.stats()["in_flight"]
+        gate.set()
+        await asyncio.to_thread(lambda: pool._executor.submit(lambda: None).result())
+        await asyncio.sleep(0.05)
+        return held, pool.stats()["in_flight"]
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_cancelled_queued_job_frees_its_slot(pool):
+    async def scenario():
+        gate = threading.Event()
+        running = asyncio.ensure_future(pool.run(_wait, gate, "running"))
+        queued = asyncio.ensure_future(pool.run(_wait, gate, "queued"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        held = pool.stats()["in_flight"]
+        gate.set()
+        await running
+        return held
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TranscriptionPool(mode="gpu")
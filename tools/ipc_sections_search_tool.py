@@ -1,59 +1,111 @@
 # ipc_sections_search_tool.py
 
 import os
+import threading
+import time
 
 from dotenv import load_dotenv
 from crewai.tools import tool
 from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
 
+from tools.lexical_ipc_index import (
+    clamp_top_k, get_ipc_lexical_index, get_ipc_section_index, hybrid_candidates, hybrid_enabled, lookup_sections,
+    reciprocal_rank_fusion, rrf_k,
+)
+from tools.multilingual_ipc_search_tool import VECTOR_SEARCH_SECONDS, get_embeddings
 
-@tool("IPC Sections Search Tool")
-def search_ipc_sections(query: str) -> list[dict]:
-    """
-    Search IPC vector database for sections relevant to the input query.
+load_dotenv()
 
-    Args:
-        query (str): User query in natural language.
+# One Chroma client per process, shared by every tool call
+_VECTOR_DB = None
+_VECTOR_DB_KEY = None
+_VECTOR_DB_LOCK = threading.Lock()
 
-    Returns:
-        list[dict]: List of matching IPC sections with metadata and content.
+
+def _store_key(persist_dir: str, collection_name: str | None) -> tuple:
+    # A rebuilt store (ipc_vectordb_builder.py) rewrites chroma.sqlite3, which changes its mtime
+    try:
+        mtime = os.stat(os.path.join(persist_dir, "chroma.sqlite3")).st_mtime
+    except OSError:
+        mtime = None
+    return (persist_dir, collection_name, mtime)
+
+
+def get_vector_db() -> Chroma:
+    """
+    The shared IPC Chroma collection, opened once with the cached embedding model.
+
+    Reopened when PERSIST_DIRECTORY_PATH / IPC_COLLECTION_NAME change or the store is
+    rebuilt on disk. Safe to call from concurrent crew threads.
     """
-    # Load environment variables
-    load_dotenv()
+    global _VECTOR_DB, _VECTOR_DB_KEY
 
-    # Resolve vector DB path
     persist_dir = os.getenv("PERSIST_DIRECTORY_PATH")
     if not persist_dir:
         raise EnvironmentError("❌ 'PERSIST_DIRECTORY_PATH' is not set in .env")
+    key = _store_key(persist_dir, os.getenv("IPC_COLLECTION_NAME"))
+
+    if _VECTOR_DB is not None and _VECTOR_DB_KEY == key:
+        return _VECTOR_DB
+    with _VECTOR_DB_LOCK:
+        if _VECTOR_DB is None or _VECTOR_DB_KEY != key:
+            if _VECTOR_DB is not None:
+                print(f"Reloading IPC vector store from '{persist_dir}'")
+            _VECTOR_DB = Chroma(
+                collection_name=key[1],
+                persist_directory=persist_dir,
+                embedding_function=get_embeddings()
+            )
+            _VECTOR_DB_KEY = key
+        return _VECTOR_DB
 
-    persist_dir_path = os.getenv("PERSIST_DIRECTORY_PATH")
-    collection_name = os.getenv("IPC_COLLECTION_NAME")
-
-    embedding_function = HuggingFaceEmbeddings()
 
-    # Load vectorstore
-    vector_db = Chroma(
-        collection_name=collection_name,
-        persist_directory=persist_dir_path,
-        embedding_function=embedding_function
-    )
+@tool("IPC Sections Search Tool")
+def search_ipc_sections(query: str, top_k: int = 3) -> list[dict]:
+    """
+    Search IPC vector database for sections relevant to the input query.
 
-    top_k = 3 # can be passed as an argument for flexibility
+    Args:
+        query (str): User query in natural language.
+        top_k (int): Number of results to return (default 3).
 
-    # Perform similarity search
-    docs = vector_db.similarity_search(query, k=top_k)
+    Returns:
+        list[dict]: List of matching IPC sections with metadata and content.
+    """
+    top_k = clamp_top_k(top_k)
+
+    # Queries naming sections ("Section 302", "u/s 498A") are answered from the section index
+    hits = lookup_sections(get_ipc_section_index(), "ipc", query)
+    if hits is not None:
+        hits = hits[:top_k]
+    else:
+        vector_db = get_vector_db()
+
+        # Hybrid search: dense and BM25 candidates fused by reciprocal rank, then cut to top_k
+        lexical_index = get_ipc_lexical_index() if hybrid_enabled() else None
+        fetch_k = hybrid_candidates(top_k) if lexical_index is not None else top_k
+
+        # Perform similarity search
+        start = time.monotonic()
+        hits = [(doc.page_content, doc.metadata) for doc in vector_db.similarity_search(query, k=fetch_k)]
+        VECTOR_SEARCH_SECONDS.observe(time.monotonic() - start, backend="chroma")
+
+        if lexical_index is not None:
+            start = time.monotonic()
+            lexical_hits = lexical_index.search(query, k=fetch_k)
+            VECTOR_SEARCH_SECONDS.observe(time.monotonic() - start, backend="bm25")
+            hits = reciprocal_rank_fusion([hits, lexical_hits], k=rrf_k())[:top_k]
 
     # Format results
     return [
         {
-            "section": doc.metadata.get("section"),
-            "section_title": doc.metadata.get("section_title"),
-            "chapter": doc.metadata.get("chapter"),
-            "chapter_title": doc.metadata.get("chapter_title"),
-            "content": doc.page_content
+            "section": metadata.get("section"),
+            "section_title": metadata.get("section_title"),
+            "chapter": metadata.get("chapter"),
+            "chapter_title": metadata.get("chapter_title"),
+            "content": content
         }
-        for doc in docs
+        for content, metadata in hits
     ]
 
 
@@ -62,5 +114,3 @@ def search_ipc_sections(query: str) -> list[dict]:
 # results = search_ipc_sections.func(query)
 # for r in results:
 #     print(r)
-
-# NOTE: Retrieval is a bit slower. Can be improved by caching the vectordb and using GPU for embedding.
@@ -0,0 +1,277 @@
+# lexical_ipc_index.py
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+from utils.metrics import REGISTRY
+
+# Dense search misses exact terms ("Section 379", "धारा 420", "dowry"); BM25 catches them
+# and reciprocal rank fusion merges both rankings without having to calibrate their scores.
+# Queries that name section numbers skip both and are answered from a section lookup.
+
+SECTION_LOOKUPS = REGISTRY.counter(
+    "nyaya_ipc_section_lookups_total", "Queries naming IPC sections, by whether the section index answered them.",
+    ("index", "result"))
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the this to was were which with "
+    "shall any such who whoever "
+    "का की के को में से है हैं और या एक यह वह पर भी तो ही जो कि".split()
+)
+
+# Devanagari digits are indexed as ASCII so "धारा ४२०" and "Section 420" share a token
+_DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+# Runs of Latin letters/digits (e.g. "498a") or of Devanagari letters and vowel signs, minus danda (।, ॥)
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[ऀ-ॣ॰-ॿ]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased English and Devanagari word tokens, without stopwords."""
+    text = text.lower().translate(_DEVANAGARI_DIGITS).replace("‌", "").replace("‍", "")
+    return [token for token in _TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 scoring over (content, metadata) documents.
+
+    BM25 term weights do not depend on the query, so each posting stores its final
+    weight and a search is one pass over the postings of the query's terms.
+    """
+
+    def __init__(self, documents: list[tuple[str, dict]], k1: float = 1.5, b: float = 0.75):
+        self.documents = documents
+        self.languages = [metadata.get("language") for _, metadata in documents]
+        term_counts = [Counter(tokenize(content)) for content, _ in documents]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        document_frequency = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+
+        n = len(documents)
+        self.postings: dict[str, list[tuple[int, float]]] = {}
+        for doc, counts in enumerate(term_counts):
+            norm = k1 * (1 - b + b * lengths[doc] / avg_length) if avg_length else k1
+            for term, tf in counts.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                self.postings.setdefault(term, []).append((doc, idf * tf * (k1 + 1) / (tf + norm)))
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search(self, query: str, k: int = 3, language: str | None = None) -> list[tuple[str, dict, float]]:
+        """
+        Top-`k` documents by BM25 score as (content, metadata, score), best first,
+        restricted to documents in `language` when given.
+        """
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for doc, weight in self.postings.get(term, ()):
+                if language is None or self.languages[doc] == language:
+                    scores[doc] = scores.get(doc, 0.0) + weight
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(*self.documents[doc], score) for doc, score in top]
+
+
+# "Section 302", "sections 302 and 34", "sec. 304B", "u/s 498A", "IPC 420", "धारा 376"
+_SECTION_REF_RE = re.compile(
+    r"(?:\bsections?\b|\bsec\b\.?|\bu/s\b\.?|\bipc\b|धाराओं|धारा)\s*"
+    r"((?:\d{1,3}[a-z]{0,2}\b(?:\s*(?:,|&|/|\band\b|और)\s*)?)+)"
+)
+_SECTION_NUMBER_RE = re.compile(r"\d{1,3}[a-z]{0,2}\b")
+
+
+def normalize_section(section) -> str:
+    """Canonical section identifier: "304b", " 498A", 302 -> "304B", "498A", "302"."""
+    return str(section).strip().upper()
+
+
+def parse_section_numbers(query: str) -> list[str]:
+    """Section identifiers the query names explicitly, in order and without duplicates."""
+    text = query.lower().translate(_DEVANAGARI_DIGITS)
+    sections = []
+    for refs in _SECTION_REF_RE.findall(text):
+        for number in _SECTION_NUMBER_RE.findall(refs):
+            section = normalize_section(number)
+            if section not in sections:
+                sections.append(section)
+    return sections
+
+
+def _is_section_record(content: str, metadata: dict) -> bool:
+    section = metadata.get("section")
+    if section in (None, "") or not metadata.get("section_title"):
+        return False
+    header = re.match(r"\s*section\s+(\w+)\s*:", content, re.IGNORECASE)
+    return header is not None and normalize_section(header.group(1)) == normalize_section(section)
+
+
+class SectionIndex:
+    """
+    Exact lookup from (section identifier, language) to the section's text.
+
+    Only structured per-section records (the ipc.json schema, which carries a
+    `section_title`) are indexed, and of a split section only the chunk that starts
+    with its "Section N:" header. Records extracted from PDFs only guess their
+    `section` from the first "Section N" in a page or a cross-reference ("section 2
+    of the Dowry Prohibition Act"), so they are left to the regular search.
+    """
+
+    def __init__(self, documents: list[tuple[str, dict]]):
+        self._sections: dict[str, dict[str | None, tuple[str, dict]]] = {}
+        for content, metadata in documents:
+            if _is_section_record(content, metadata):
+                by_language = self._sections.setdefault(normalize_section(metadata["section"]), {})
+                by_language.setdefault(metadata.get("language"), (content, metadata))
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def lookup(self, section, language: str | None = None) -> list[tuple[str, dict]]:
+        """The section in `language`, or in every language when `language` is None."""
+        by_language = self._sections.get(normalize_section(section), {})
+        if language is None:
+            return list(by_language.values())
+        return [by_language[language]] if language in by_language else []
+
+
+def lookup_sections(index: SectionIndex | None, name: str, query: str, language: str | None = None):
+    """
+    Hits for the sections `query` names, or None when it names none (or none are
+    indexed) and the caller should run its normal search.
+    """
+    sections = parse_section_numbers(query)
+    if index is None or not sections:
+        return None
+    hits = [hit for section in sections for hit in index.lookup(section, language)]
+    SECTION_LOOKUPS.inc(index=name, result="hit" if hits else "miss")
+    return hits or None
+
+
+def reciprocal_rank_fusion(rankings, k: int = 60) -> list[tuple[str, dict]]:
+    """
+    Merge ranked (content, metadata, ...) lists: each hit scores sum(1 / (k + rank)) over
+    the lists it appears in. Hits are identified by their content.
+    """
+    scores: dict[str, float] = {}
+    hits: dict[str, tuple[str, dict]] = {}
+    for ranking in rankings:
+        for rank, (content, metadata, *_) in enumerate(ranking, start=1):
+            scores[content] = scores.get(content, 0.0) + 1 / (k + rank)
+            hits.setdefault(content, (content, metadata))
+    return [hits[content] for content in sorted(scores, key=scores.get, reverse=True)]
+
+
+def clamp_top_k(top_k) -> int:
+    """A caller's requested result count, kept within 1..IPC_SEARCH_MAX_K."""
+    try:
+        top_k = int(top_k)
+    except (TypeError, ValueError):
+        top_k = 3
+    return max(1, min(top_k, int(os.getenv("IPC_SEARCH_MAX_K", "10"))))
+
+
+def hybrid_enabled() -> bool:
+    return os.getenv("IPC_HYBRID_SEARCH", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def hybrid_candidates(top_k: int) -> int:
+    """How many hits each retriever contributes to the fusion."""
+    return max(top_k, int(os.getenv("IPC_HYBRID_CANDIDATES", "10")))
+
+
+def rrf_k() -> int:
+    return int(os.getenv("IPC_RRF_K", "60"))
+
+
+def _multilingual_documents() -> list[tuple[str, dict]]:
+    # The same chunks the multilingual builders send to Pinecone / the local index
+    from multilingual_vectordb_builder import load_records, prepare_documents, split_documents
+    return [(doc.page_content, doc.metadata) for doc in split_documents(prepare_documents(load_records()))]
+
+
+def _multilingual_paths() -> list[str]:
+    return [path.strip() for path in os.getenv("IPC_JSON_PATHS", "ipc_english.json,ipc_hindi.json").split(",")
+            if path.strip()]
+
+
+def _ipc_section_records() -> list[tuple[str, dict]]:
+    # The section index needs ipc.json's per-section records even when IPC_JSON_PATHS
+    # (whose default is the PDF-extracted corpora) leaves them out of the search corpora
+    path = os.getenv("IPC_SECTIONS_JSON_PATH", "ipc.json").strip()
+    if not path or os.path.normpath(path) in {os.path.normpath(p) for p in _multilingual_paths()}:
+        return []
+    from multilingual_vectordb_builder import load_json, prepare_documents
+    try:
+        records = load_json(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read IPC section records for the section index: {e}")
+        return []
+    return [(doc.page_content, doc.metadata) for doc in prepare_documents(records)]
+
+
+def _ipc_documents() -> list[tuple[str, dict]]:
+    # The same documents ipc_vectordb_builder.py writes to the Chroma store
+    from ipc_vectordb_builder import load_ipc_data, prepare_documents, sanitize_env_path
+    path = sanitize_env_path(os.getenv("IPC_JSON_PATH"))
+    if not path:
+        raise EnvironmentError("IPC_JSON_PATH is not set")
+    documents = prepare_documents(load_ipc_data(os.path.expanduser(os.path.normpath(path))))
+    return [(doc.page_content, doc.metadata) for doc in documents]
+
+
+# name -> (source key, BM25 index, section index); both indexes are None if the corpus can't be read
+_INDEXES: dict[str, tuple[tuple, BM25Index | None, SectionIndex | None]] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _get_indexes(name: str, key: tuple, load_documents,
+                 load_section_documents=None) -> tuple[BM25Index | None, SectionIndex | None]:
+    cached = _INDEXES.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1:]
+    with _INDEXES_LOCK:
+        cached = _INDEXES.get(name)
+        if cached is None or cached[0] != key:
+            try:
+                documents = load_documents()
+                section_documents = documents + (load_section_documents() if load_section_documents else [])
+                index, sections = BM25Index(documents), SectionIndex(section_documents)
+                print(f"Built {name} BM25 index ({len(index)} documents, {len(index.postings)} terms, "
+                      f"{len(sections)} sections)")
+            except Exception as e:
+                # Searches fall back to dense-only results
+                print(f"⚠️ Could not build {name} BM25 index: {e}")
+                index, sections = None, None
+            cached = _INDEXES[name] = (key, index, sections)
+        return cached[1:]
+
+
+def _multilingual_key() -> tuple:
+    return (tuple(_multilingual_paths()), os.getenv("IPC_SECTIONS_JSON_PATH", "ipc.json").strip())
+
+
+def get_multilingual_lexical_index() -> BM25Index | None:
+    """BM25 index over the IPC_JSON_PATHS corpora, built once (None if they can't be read)."""
+    return _get_indexes("multilingual IPC", _multilingual_key(), _multilingual_documents, _ipc_section_records)[0]
+
+
+def get_multilingual_section_index() -> SectionIndex | None:
+    """Section lookup over ipc.json (IPC_SECTIONS_JSON_PATH) and the IPC_JSON_PATHS corpora."""
+    return _get_indexes("multilingual IPC", _multilingual_key(), _multilingual_documents, _ipc_section_records)[1]
+
+
+def get_ipc_lexical_index() -> BM25Index | None:
+    """BM25 index over the IPC_JSON_PATH sections, built once (None if it can't be read)."""
+    return _get_indexes("IPC sections", (os.getenv("IPC_JSON_PATH"),), _ipc_documents)[0]
+
+
+def get_ipc_section_index() -> SectionIndex | None:
+    """Section lookup over the IPC_JSON_PATH sections, built with the BM25 index."""
+    return _get_indexes("IPC sections", (os.getenv("IPC_JSON_PATH"),), _ipc_documents)[1]
@@ -0,0 +1,106 @@
+# local_ipc_index.py
+
+import json
+import os
+import threading
+
+import numpy as np
+
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.json"
+
+# Metadata columns kept in the side table (one list per column, row-aligned with the matrix)
+METADATA_COLUMNS = ("id", "language", "granularity", "section", "page")
+
+
+def write_local_index(index_dir: str, vectors, documents, dtype: str = "float16"):
+    """
+    Persist unit-normalized `vectors` and the documents' metadata/content as a local index:
+    an .npy matrix that is memory-mapped at query time plus a columnar JSON side table.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.where(norms == 0, 1, norms)
+    np.save(os.path.join(index_dir, EMBEDDINGS_FILE), matrix.astype(dtype))
+
+    table = {column: [doc.metadata.get(column) for doc in documents] for column in METADATA_COLUMNS}
+    table["content"] = [doc.page_content for doc in documents]
+    with open(os.path.join(index_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False)
+
+
+class LocalIpcIndex:
+    """
+    In-process brute-force cosine search over the IPC corpora.
+
+    A float32 matrix is memory-mapped read-only, so worker processes share the OS page
+    cache; a float16 matrix (half the disk size) is upcast once into memory. With a few
+    thousand chunks one matrix-vector product plus argpartition is far cheaper than a
+    network round trip, and no service is needed.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        matrix = np.load(os.path.join(index_dir, EMBEDDINGS_FILE), mmap_mode="r")
+        self.matrix = matrix if matrix.dtype == np.float32 else np.asarray(matrix, dtype=np.float32)
+        with open(os.path.join(index_dir, METADATA_FILE), "r", encoding="utf-8") as f:
+            self.table = json.load(f)
+        if len(self.table["content"]) != self.matrix.shape[0]:
+            raise ValueError(f"Local IPC index at '{index_dir}' is inconsistent; rebuild it")
+        # Row numbers per language, so language-filtered searches only rank that partition
+        self._rows_by_language: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def metadata(self, row: int) -> dict:
+        return {column: self.table[column][row] for column in METADATA_COLUMNS if self.table[column][row] is not None}
+
+    def _language_rows(self, language: str) -> np.ndarray:
+        rows = self._rows_by_language.get(language)
+        if rows is None:
+            rows = np.flatnonzero(np.asarray([lang == language for lang in self.table["language"]], dtype=bool))
+            self._rows_by_language[language] = rows
+        return rows
+
+    def search(self, query_embedding, k: int = 3, language: str | None = None) -> list[tuple[str, dict, float]]:
+        """
+        Top-`k` rows by cosine similarity as (content, metadata, score), best first,
+        restricted to rows in `language` when given.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+        scores = self.matrix @ query
+        rows = self._language_rows(language) if language is not None else np.arange(len(scores))
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        candidates = scores[rows]
+        top = np.argpartition(-candidates, k - 1)[:k]
+        top = rows[top[np.argsort(-candidates[top])]]
+        return [(self.table["content"][row], self.metadata(row), float(scores[row])) for row in top]
+
+
+_INDEX = None
+_INDEX_DIR = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_local_index() -> LocalIpcIndex:
+    """The process-wide local index from LOCAL_IPC_INDEX_DIR, loaded once."""
+    global _INDEX, _INDEX_DIR
+    index_dir = os.getenv("LOCAL_IPC_INDEX_DIR", "./IPC_LOCAL_INDEX")
+    if _INDEX is not None and _INDEX_DIR == index_dir:
+        return _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX_DIR != index_dir:
+            if not os.path.isfile(os.path.join(index_dir, EMBEDDINGS_FILE)):
+                raise FileNotFoundError(
+                    f"Local IPC index not found at '{index_dir}'. "
+                    "Build it with: python multilingual_vectordb_builder.py --local"
+                )
+            _INDEX = LocalIpcIndex(index_dir)
+            _INDEX_DIR = index_dir
+            print(f"Loaded local IPC index ({len(_INDEX)} chunks) from '{index_dir}'")
+        return _INDEX
@@ -1,35 +1,113 @@
 # multilingual_ipc_search_tool.py
 
 import os
+import threading
+import time
+from itertools import zip_longest
 
 from dotenv import load_dotenv
 from crewai.tools import tool
 # from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 
+from tools.lexical_ipc_index import (
+    clamp_top_k, get_multilingual_lexical_index, get_multilingual_section_index, hybrid_candidates,
+    hybrid_enabled, lookup_sections, reciprocal_rank_fusion, rrf_k,
+)
+from utils.metrics import REGISTRY
+
+# Query embedding ("embedding"), vector store lookup (Pinecone round trip or local index)
+# and BM25 lookup ("bm25"), separate from the tool's total time
+VECTOR_SEARCH_SECONDS = REGISTRY.histogram(
+    "nyaya_vector_search_seconds", "Wall time of one IPC index search.", ("backend",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+
 # Global cache for embeddings to prevent reloading on every tool call
 _CACHED_EMBEDDINGS = None
+_EMBEDDINGS_LOCK = threading.Lock()
 
 def get_embeddings():
-    """Lazy load and cache embeddings."""
+    """Lazy load and cache embeddings (thread-safe: concurrent first calls load it once)."""
     global _CACHED_EMBEDDINGS
     if _CACHED_EMBEDDINGS is None:
-        print("Loading Embedding Model (this should happen only once)...")
-        _CACHED_EMBEDDINGS = HuggingFaceEmbeddings()
+        with _EMBEDDINGS_LOCK:
+            if _CACHED_EMBEDDINGS is None:
+                print("Loading Embedding Model (this should happen only once)...")
+                _CACHED_EMBEDDINGS = HuggingFaceEmbeddings()
     return _CACHED_EMBEDDINGS
 
 
+# Languages of the multilingual corpora; "[all]" balances results across them
+LANGUAGES = ("english", "hindi")
+
+
+def _search_pinecone(query_embedding: list[float], k: int, language: str | None) -> list[tuple[str, dict]]:
+    from langchain_pinecone import PineconeVectorStore
+
+    # Use cached embeddings
+    vector_db = PineconeVectorStore(
+        index_name=os.getenv("PINECONE_INDEX_NAME"),
+        embedding=get_embeddings()
+    )
+    # The metadata filter runs inside Pinecone, so all k hits are in the requested language
+    docs = vector_db.similarity_search_by_vector_with_score(
+        query_embedding, k=k, filter={"language": language} if language else None
+    )
+    return [(doc.page_content, doc.metadata) for doc, _ in docs]
+
+
+def _search_local(query_embedding: list[float], k: int, language: str | None) -> list[tuple[str, dict]]:
+    from tools.local_ipc_index import get_local_index
+
+    index = get_local_index()
+    return [(content, metadata) for content, metadata, _ in index.search(query_embedding, k=k, language=language)]
+
+
+def _hybrid_hits(query, query_embedding, top_k, backend, lexical_index, language) -> list[tuple[str, dict]]:
+    """Top-`top_k` hits in `language` (any language if None): dense and BM25 fused by reciprocal rank."""
+    fetch_k = hybrid_candidates(top_k) if lexical_index is not None else top_k
+
+    start = time.monotonic()
+    if backend == "local":
+        hits = _search_local(query_embedding, fetch_k, language)
+    else:
+        hits = _search_pinecone(query_embedding, fetch_k, language)
+    VECTOR_SEARCH_SECONDS.observe(time.monotonic() - start, backend=backend)
+
+    if lexical_index is not None:
+        start = time.monotonic()
+        lexical_hits = lexical_index.search(query, k=fetch_k, language=language)
+        VECTOR_SEARCH_SECONDS.observe(time.monotonic() - start, backend="bm25")
+        hits = reciprocal_rank_fusion([hits, lexical_hits], k=rrf_k())
+    return hits[:top_k]
+
+
+def _interleave(rankings: list[list[tuple[str, dict]]]) -> list[tuple[str, dict]]:
+    # Round-robin across the per-language rankings, so each language gets an equal share
+    merged, seen = [], set()
+    for row in zip_longest(*rankings):
+        for hit in row:
+            if hit is not None and hit[0] not in seen:
+                seen.add(hit[0])
+                merged.append(hit)
+    return merged
+
+
 @tool("Multilingual IPC Sections Search Tool")
-def search_multilingual_ipc(query: str) -> list[dict]:
+def search_multilingual_ipc(query: str, top_k: int = 3) -> list[dict]:
     """
     Search multilingual IPC vector database for sections relevant to the input query.
     Supports both English and Hindi sources. 
 
-    The tool will detect the language of the query and search accordingly. To explicitly search
-    in a specific language, include language hints in your query like "[hindi]" or "[english]".
+    To search in a specific language, include a language hint in your query like "[hindi]"
+    or "[english]": every result is then in that language. "[all]" (or "[both]") returns a
+    balanced mix of English and Hindi results. Named sections ("Section 302") are looked up
+    directly in English, the only language with per-section records; "[all]" adds Hindi
+    search results alongside them.
 
     Args:
         query (str): User query in natural language. Can include language preference hints.
+        top_k (int): Number of results to return (default 3; keep it small to save context).
 
     Returns:
         list[dict]: List of matching IPC sections with metadata and content.
@@ -39,6 +117,7 @@ def search_multilingual_ipc(query: str) -> list[dict]:
 
     # Detect language preference from query
     language_filter = None
+    balanced = False
     if "[hindi]" in query.lower():
         language_filter = "hindi"
         query = query.replace("[hindi]", "").strip()
@@ -46,37 +125,49 @@ def search_multilingual_ipc(query: str) -> list[dict]:
         language_filter = "english"
         query = query.replace("[english]", "").strip()
     elif "[both]" in query.lower() or "[all]" in query.lower():
-        language_filter = None
+        balanced = True
         query = query.replace("[both]", "").replace("[all]", "").strip()
 
+    top_k = clamp_top_k(top_k)
+
+    # Queries naming sections ("Section 302", "धारा 420") are answered from the section index;
+    # everything else (or sections the corpora don't have) goes through hybrid search
+    languages = LANGUAGES if balanced else (language_filter,)
+    rankings = []
+    section_hits = lookup_sections(get_multilingual_section_index(), "multilingual", query, language_filter)
+    if section_hits is not None:
+        rankings.append(section_hits)
+        # Per-section records exist only in English, so "[all]" searches the other languages
+        found = {metadata.get("language") for _, metadata in section_hits}
+        languages = tuple(language for language in languages if balanced and language not in found)
+
+    # IPC_VECTOR_BACKEND=local searches the in-process index (offline); default is Pinecone
+    backend = "local" if os.getenv("IPC_VECTOR_BACKEND", "pinecone").strip().lower() == "local" else "pinecone"
     # Pinecone configuration
-    index_name = os.getenv("PINECONE_INDEX_NAME")
-    if not index_name:
-        return [{"error": "PINECONE_INDEX_NAME not found in .env"}]
-
-    # Use cached embeddings
-    embedding_function = get_embeddings()
-
-    from langchain_pinecone import PineconeVectorStore
-    
-    vector_db = PineconeVectorStore(
-        index_name=index_name,
-        embedding=embedding_function
-    )
-
-    top_k = 3  # Reduced to avoid context exhaustion
-
-    # Perform similarity search
-    docs = vector_db.similarity_search(query, k=top_k)
+    if languages and backend == "pinecone" and not os.getenv("PINECONE_INDEX_NAME"):
+        if not rankings:
+            return [{"error": "PINECONE_INDEX_NAME not found in .env"}]
+        languages = ()  # answer with the section hits alone
+
+    if languages:
+        lexical_index = get_multilingual_lexical_index() if hybrid_enabled() else None
+        start = time.monotonic()
+        query_embedding = get_embeddings().embed_query(query)
+        VECTOR_SEARCH_SECONDS.observe(time.monotonic() - start, backend="embedding")
+
+        # The language filter is applied inside each index, not to the top k afterwards
+        rankings += [
+            _hybrid_hits(query, query_embedding, top_k, backend, lexical_index, language) for language in languages
+        ]
+    hits = _interleave(rankings)[:top_k]
 
     # Format results with language support
     results = []
-    for doc in docs:
-        metadata = doc.metadata
+    for content, metadata in hits:
         result = {
             "language": metadata.get("language", "unknown"),
             "granularity": metadata.get("granularity", "unknown"),
-            "content": doc.page_content
+            "content": content
         }
         
         # Add section or page info based on granularity
@@ -91,10 +182,6 @@ def search_multilingual_ipc(query: str) -> list[dict]:
         
         results.append(result)
 
-    # Apply language filter if specified
-    if language_filter:
-        results = [r for r in results if r.get("language") == language_filter]
-
     return results
 
 
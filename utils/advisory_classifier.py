@@ -0,0 +1,357 @@
+# advisory_classifier.py
+"""
+Local fast path for the advisory task's classification fields.
+
+`severity`, `legal_type` and `recommended_action` are predicted together by a
+nearest-centroid classifier over the sentence-transformer embedding of the user's
+input, one class per label combination in the logged advisory outputs (see
+`log_advisory`). When the prediction clears the confidence threshold the advisory
+LLM call can be skipped.
+
+Train and benchmark offline against the logged LLM labels:
+
+    python -m utils.advisory_classifier train
+    python -m utils.advisory_classifier benchmark
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+
+LABELS = {
+    "severity": ("High", "Low"),
+    "legal_type": ("Criminal", "Civil", "Consumer"),
+    "recommended_action": ("File FIR", "Send Legal Notice", "File Complaint near Authority"),
+}
+
+# Used when the fast path answers without the advisory agent
+STEP_GUIDANCE = {
+    "File FIR": (
+        "1. Go to the nearest Police Station (or the one with jurisdiction over the incident) and meet the Station House Officer (SHO).\n"
+        "2. Give a written complaint with the date, time, place and a clear account of what happened; ask for it to be registered as an FIR.\n"
+        "3. Attach or mention any evidence (photos, receipts, messages, witness names).\n"
+        "4. Collect a free copy of the FIR and note the FIR number.\n"
+        "5. If the police refuse to register it, send the complaint to the Superintendent of Police or file it online on the state police portal."
+    ),
+    "Send Legal Notice": (
+        "1. Collect every document that supports your claim (agreements, receipts, bank statements, messages).\n"
+        "2. Consult a lawyer to draft and send a legal notice stating the facts, your demand and a deadline (usually 15-30 days).\n"
+        "3. Send the notice by Registered Post with acknowledgement due and keep the receipts.\n"
+        "4. If there is no satisfactory reply by the deadline, your lawyer can file a suit in the appropriate civil court."
+    ),
+    "File Complaint near Authority": (
+        "1. Keep the bill, warranty, order details and all communication with the seller or service provider.\n"
+        "2. Write to the company's grievance officer and give them a reasonable time to resolve the issue.\n"
+        "3. If unresolved, call the National Consumer Helpline (1915) or register a grievance on consumerhelpline.gov.in.\n"
+        "4. File a complaint with the District Consumer Commission (online via e-Daakhil) or the relevant local authority (RWA, municipal office)."
+    ),
+}
+
+
+# Free-form labels the advisory LLM produces, keyed by their `_label_text` form
+LABEL_SYNONYMS = {
+    "severity": {
+        "high": "High", "high severity": "High", "severe": "High",
+        "low": "Low", "low severity": "Low", "minor": "Low",
+    },
+    "legal_type": {
+        "criminal": "Criminal", "criminal law": "Criminal",
+        "civil": "Civil", "civil law": "Civil",
+        "consumer": "Consumer", "consumer other": "Consumer", "other": "Consumer", "consumer dispute": "Consumer",
+    },
+    "recommended_action": {
+        "file fir": "File FIR", "file an fir": "File FIR", "file a fir": "File FIR",
+        "lodge fir": "File FIR", "lodge an fir": "File FIR", "register fir": "File FIR", "register an fir": "File FIR",
+        "send legal notice": "Send Legal Notice", "send a legal notice": "Send Legal Notice",
+        "legal notice": "Send Legal Notice", "issue legal notice": "Send Legal Notice",
+        "issue a legal notice": "Send Legal Notice",
+        "file complaint near authority": "File Complaint near Authority",
+        "file complaint with authority": "File Complaint near Authority",
+        "file a complaint near authority": "File Complaint near Authority",
+        "file a complaint with the authority": "File Complaint near Authority",
+        "file consumer complaint": "File Complaint near Authority",
+        "file a consumer complaint": "File Complaint near Authority",
+    },
+}
+
+
+def _label_text(value: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", value.lower()).split())
+
+
+def normalize_label(field: str, value) -> str | None:
+    """Map an LLM label (e.g. 'Consumer/Other', 'file an FIR') to its canonical value, or None if unknown."""
+    if not isinstance(value, str):
+        return None
+    return LABEL_SYNONYMS[field].get(_label_text(value))
+
+
+# --- Training data ---
+
+_log_lock = threading.Lock()
+
+
+def log_advisory(path: str | None, user_input: str, advisory: dict):
+    """Append one LLM-labelled example to the JSONL training log (no-op without a path)."""
+    if not path:
+        return
+    record = {"user_input": user_input, "time": time.time()}
+    for field in LABELS:
+        record[field] = normalize_label(field, advisory.get(field))
+    if not all(record[field] for field in LABELS):
+        return
+    try:
+        with _log_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not log advisory output: {e}")
+
+
+def load_examples(path: str) -> list[dict]:
+    examples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("user_input") and all(normalize_label(field, record.get(field)) for field in LABELS):
+                examples.append(record)
+    return examples
+
+
+# --- Classifier ---
+
+def _unit(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class AdvisoryClassifier:
+    """
+    Nearest-centroid classifier over unit-normalized input embeddings whose classes are
+    the joint (severity, legal_type, recommended_action) label tuples seen in training,
+    so a prediction is always a combination the advisory agent actually produced.
+    """
+
+    def __init__(self, classes: list[tuple[str, ...]], centroids: np.ndarray, counts: list[int],
+                 temperature: float = 0.05):
+        self.classes = [tuple(labels) for labels in classes]
+        self.centroids = centroids  # [n_classes, dim]
+        self.counts = list(counts)  # training examples per class
+        self.temperature = temperature
+
+    @classmethod
+    def train(cls, embeddings, examples: list[dict]) -> "AdvisoryClassifier":
+        """Fit from `examples` (logged records) and their row-aligned `embeddings`."""
+        embeddings = _unit(embeddings)
+        rows: dict[tuple[str, ...], list[int]] = {}
+        for i, example in enumerate(examples):
+            rows.setdefault(_label_tuple(example), []).append(i)
+        classes = sorted(rows)
+        centroids = _unit(np.stack([embeddings[rows[labels]].mean(axis=0) for labels in classes]))
+        return cls(classes, centroids, [len(rows[labels]) for labels in classes])
+
+    def usable_classes(self, min_per_label: int) -> list[tuple[str, ...]]:
+        """Label tuples trained on at least `min_per_label` examples."""
+        return [labels for labels, count in zip(self.classes, self.counts) if count >= min_per_label]
+
+    def predict(self, embedding) -> tuple[dict[str, str], float, int]:
+        """Return ({field: label}, confidence, training examples of that class) for one input embedding."""
+        scores = self.centroids @ _unit(embedding) / self.temperature
+        probs = np.exp(scores - scores.max())
+        probs /= probs.sum()
+        best = int(np.argmax(probs))
+        return dict(zip(LABELS, self.classes[best])), float(probs[best]), self.counts[best]
+
+    def save(self, path: str):
+        # Through a file object so numpy does not append ".npz" to the configured path
+        with open(path, "wb") as f:
+            np.savez(f, classes=np.array(self.classes), centroids=self.centroids,
+                     counts=np.array(self.counts), temperature=np.array(self.temperature))
+
+    @classmethod
+    def load(cls, path: str) -> "AdvisoryClassifier":
+        with np.load(path) as data:
+            if "classes" not in data:
+                # Per-field models cannot be turned into label tuples
+                raise ValueError("model was trained per field by an older version; retrain it")
+            return cls(data["classes"].tolist(), data["centroids"], data["counts"].tolist(),
+                       temperature=float(data["temperature"]))
+
+
+def _label_tuple(example: dict) -> tuple[str, ...]:
+    return tuple(normalize_label(field, example[field]) for field in LABELS)
+
+
+def _is_english(language_preference: str) -> bool:
+    # STEP_GUIDANCE is English text; other languages need the advisory agent
+    return (language_preference or "english").strip().lower() == "english"
+
+
+class AdvisoryFastPath:
+    """
+    Serves advisory JSON from the local classifier when it is confident enough,
+    and keeps counters of how often the advisory LLM call was skipped.
+
+    The classifier only answers once at least two label tuples have `min_per_label`
+    examples each (a one-class softmax is always 100% confident), and a prediction of a
+    tuple with fewer examples goes to the LLM. Only English requests are served, since
+    the canned `STEP_GUIDANCE` is written in English.
+    """
+
+    def __init__(self, model_path: str | None, min_confidence: float = 0.8, log_path: str | None = None,
+                 min_per_label: int = 5):
+        self.model_path = model_path
+        self.min_confidence = min_confidence
+        self.log_path = log_path
+        self.min_per_label = min_per_label
+        self.classifier: AdvisoryClassifier | None = None
+        self.usable_classes: list[tuple[str, ...]] = []
+        self._stats = {"fast_path": 0, "fallback": 0, "skipped_language": 0}
+
+    @classmethod
+    def from_env(cls) -> "AdvisoryFastPath":
+        return cls(
+            model_path=os.getenv("ADVISORY_CLASSIFIER_PATH") or None,
+            min_confidence=float(os.getenv("ADVISORY_CLASSIFIER_MIN_CONFIDENCE", "0.8")),
+            log_path=os.getenv("ADVISORY_LOG_PATH") or None,
+            min_per_label=int(os.getenv("ADVISORY_CLASSIFIER_MIN_PER_LABEL", "5")),
+        )
+
+    def load(self):
+        """Load the trained model if one is configured and present (run as a background component)."""
+        if self.model_path and os.path.exists(self.model_path):
+            try:
+                classifier = AdvisoryClassifier.load(self.model_path)
+            except ValueError as e:
+                print(f"⚠️ Advisory classifier at {self.model_path} not loaded ({e}); using the advisory agent")
+                return
+            self.classifier = classifier
+            self.usable_classes = classifier.usable_classes(self.min_per_label)
+            if len(self.usable_classes) < 2:
+                print(f"⚠️ Advisory classifier lacks training data (needs 2+ label combinations with "
+                      f"{self.min_per_label}+ examples each); using the advisory agent")
+        elif self.model_path:
+            print(f"⚠️ Advisory classifier not found at {self.model_path}; using the advisory agent")
+
+    def _trained(self) -> bool:
+        return self.classifier is not None and len(self.usable_classes) >= 2
+
+    def accepts(self, language_preference: str) -> bool:
+        """Whether the fast path may answer a request in `language_preference` at all."""
+        if not self._trained():
+            return False
+        if not _is_english(language_preference):
+            self._stats["skipped_language"] += 1
+            return False
+        return True
+
+    def classify(self, embedding, language_preference: str = "english") -> dict | None:
+        """Advisory dict (same keys as advisory_task's JSON), or None to fall back to the LLM."""
+        if embedding is None or not self._trained() or not _is_english(language_preference):
+            return None
+        labels, confidence, count = self.classifier.predict(embedding)
+        if confidence < self.min_confidence or count < self.min_per_label:
+            self._stats["fallback"] += 1
+            return None
+        self._stats["fast_path"] += 1
+        return {**labels, "step_guidance": STEP_GUIDANCE[labels["recommended_action"]]}
+
+    def record(self, user_input: str, advisory: dict):
+        """Log an LLM-produced advisory as a future training example."""
+        log_advisory(self.log_path, user_input, advisory)
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "loaded": self.classifier is not None,
+            "usable_classes": len(self.usable_classes),
+            "min_confidence": self.min_confidence,
+            "min_per_label": self.min_per_label,
+        }
+
+
+# --- Offline training / benchmark ---
+
+def _embed_all(texts: list[str]) -> np.ndarray:
+    from tools.multilingual_ipc_search_tool import get_embeddings
+    return _unit(get_embeddings().embed_documents(texts))
+
+
+def _benchmark(examples: list[dict], min_confidence: float, min_per_label: int, holdout: float = 0.2, seed: int = 0):
+    from tools.multilingual_ipc_search_tool import get_embeddings
+
+    examples = list(examples)
+    random.Random(seed).shuffle(examples)
+    split = max(1, int(len(examples) * holdout))
+    test, train = examples[:split], examples[split:]
+    classifier = AdvisoryClassifier.train(_embed_all([e["user_input"] for e in train]), train)
+
+    embeddings = get_embeddings()
+    correct = {field: 0 for field in LABELS}
+    all_correct = confident = confident_correct = 0
+    latencies = []
+    for example in test:
+        start = time.perf_counter()
+        labels, confidence, count = classifier.predict(embeddings.embed_query(example["user_input"]))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        hits = {field: labels[field] == normalize_label(field, example[field]) for field in LABELS}
+        for field, hit in hits.items():
+            correct[field] += hit
+        all_correct += all(hits.values())
+        if confidence >= min_confidence and count >= min_per_label:
+            confident += 1
+            confident_correct += all(hits.values())
+
+    print(f"Examples: {len(train)} train / {len(test)} held out, {len(classifier.classes)} label combinations")
+    for field in LABELS:
+        print(f"  {field:<20} accuracy vs LLM labels: {correct[field] / len(test):.3f}")
+    print(f"  {'all three fields':<20} accuracy vs LLM labels: {all_correct / len(test):.3f}")
+    print(f"Fast-path coverage at confidence >= {min_confidence}: {confident / len(test):.3f}")
+    if confident:
+        print(f"Fast-path accuracy (all three fields): {confident_correct / confident:.3f}")
+    print(f"Latency per prediction (embed + classify): p50 {np.percentile(latencies, 50):.1f} ms, "
+          f"p95 {np.percentile(latencies, 95):.1f} ms")
+
+
+def main(argv: list[str]):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    fast_path = AdvisoryFastPath.from_env()
+    command = argv[1] if len(argv) > 1 else "benchmark"
+    if not fast_path.log_path:
+        sys.exit("❌ Set ADVISORY_LOG_PATH to the JSONL log of advisory outputs")
+    examples = load_examples(fast_path.log_path)
+    if len(examples) < 10:
+        sys.exit(f"❌ Need at least 10 logged examples, found {len(examples)}")
+
+    if command == "train":
+        if not fast_path.model_path:
+            sys.exit("❌ Set ADVISORY_CLASSIFIER_PATH to where the model should be written")
+        classifier = AdvisoryClassifier.train(_embed_all([e["user_input"] for e in examples]), examples)
+        classifier.save(fast_path.model_path)
+        print(f"✅ Trained on {len(examples)} examples -> {fast_path.model_path}")
+        for labels, count in zip(classifier.classes, classifier.counts):
+            note = "" if count >= fast_path.min_per_label else " (not served by the fast path yet)"
+            print(f"  {' / '.join(labels)}: {count}{note}")
+        if len(classifier.usable_classes(fast_path.min_per_label)) < 2:
+            print(f"⚠️ The fast path stays off until 2+ label combinations have "
+                  f"{fast_path.min_per_label}+ examples each")
+    elif command == "benchmark":
+        _benchmark(examples, fast_path.min_confidence, fast_path.min_per_label)
+    else:
+        sys.exit("Usage: python -m utils.advisory_classifier [train|benchmark]")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
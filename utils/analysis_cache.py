@@ -0,0 +1,125 @@
+# analysis_cache.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticAnalysisCache:
+    """
+    Cache of /analyze results keyed by the meaning of the user's input.
+
+    An exact match on the normalized input is answered without embedding anything.
+    Otherwise the input is embedded and compared (cosine similarity) against earlier
+    inputs in the same language preference; the best match at or above `threshold`
+    is returned, flagged as not exact: it answers another user's text, so callers must
+    not reuse anything specific to that text (names, facts). Entries are evicted LRU
+    beyond `max_entries` and after `ttl_s`.
+    """
+
+    def __init__(self, embed_fn, max_entries: int = 512, ttl_s: float = 86400, threshold: float = 0.92):
+        self.embed_fn = embed_fn
+        self.max_entries = max(0, max_entries)
+        self.ttl_s = ttl_s
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        # (language, text hash) -> {"value", "embedding", "created_at"}
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls, embed_fn) -> "SemanticAnalysisCache":
+        return cls(
+            embed_fn,
+            max_entries=int(os.getenv("ANALYSIS_CACHE_SIZE", "512")),
+            ttl_s=float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "86400")),
+            threshold=float(os.getenv("ANALYSIS_CACHE_SIMILARITY", "0.92")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _key(user_input: str, language: str) -> tuple:
+        normalized = " ".join(user_input.lower().split())
+        return (language.strip().lower(), hashlib.sha256(normalized.encode("utf-8")).hexdigest())
+
+    def _embed(self, user_input: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(user_input), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, user_input: str, language: str, semantic: bool = True):
+        """
+        Return `(value, embedding, exact)`. `value` is None on a miss; `exact` says whether
+        it was stored for this very input rather than a similar one; `embedding` (None
+        unless computed) can be handed to `put` so the input is not embedded twice.
+        Pass `semantic=False` to use only the exact-match path (e.g. model still loading).
+        """
+        if not self.enabled:
+            return None, None, False
+        key = self._key(user_input, language)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["exact_hits"] += 1
+                return entry["value"], None, True
+            if not semantic:
+                self._stats["misses"] += 1
+                return None, None, False
+
+        embedding = self._embed(user_input)
+        with self._lock:
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if k[0] == key[0] and e["embedding"] is not None
+            ]
+            if candidates:
+                scores = np.stack([e["embedding"] for _, e in candidates]) @ embedding
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    best_key, best_entry = candidates[best]
+                    self._entries.move_to_end(best_key)
+                    self._stats["semantic_hits"] += 1
+                    return best_entry["value"], embedding, False
+            self._stats["misses"] += 1
+        return None, embedding, False
+
+    def put(self, user_input: str, language: str, value: dict, embedding: np.ndarray | None = None):
+        if not self.enabled:
+            return
+        key = self._key(user_input, language)
+        with self._lock:
+            self._entries[key] = {"value": value, "embedding": embedding, "created_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        hits = stats["exact_hits"] + stats["semantic_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["threshold"] = self.threshold
+        return stats
+
+    def _expire(self, now: float):
+        # Caller holds self._lock; entries are in LRU order, not age order, so scan them all
+        if not self.ttl_s:
+            return
+        expired = [k for k, e in self._entries.items() if now - e["created_at"] > self.ttl_s]
+        for k in expired:
+            del self._entries[k]
+        self._stats["evictions"] += len(expired)
@@ -0,0 +1,122 @@
+# audio_upload.py
+
+import hashlib
+import io
+import os
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "50")) * 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES."""
+
+
+class MissingAudioError(ValueError):
+    """Raised when a multipart request has no audio part."""
+
+
+class AudioUpload(io.BytesIO):
+    """In-memory upload buffer that hashes its content as it is written."""
+
+    def __init__(self):
+        super().__init__()
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        return super().write(data)
+
+
+class _FilePartCollector:
+    """Multipart callbacks that stream the data of a single named part into `sink`."""
+
+    def __init__(self, field_name: str, sink: AudioUpload):
+        self.field_name = field_name.encode()
+        self.sink = sink
+        self.found = False
+        self._in_target = False
+        self._header_field = b""
+        self._header_value = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self._in_target = False
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            _, options = parse_options_header(self._header_value)
+            # Only the first matching part is collected
+            self._in_target = not self.found and options.get(b"name") == self.field_name
+            self.found = self.found or self._in_target
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_target:
+            self.sink.write(data[start:end])
+
+    def on_part_end(self):
+        self._in_target = False
+
+
+async def read_audio_upload(request, field_name: str = "file", max_bytes: int = MAX_UPLOAD_BYTES) -> AudioUpload:
+    """
+    Stream an audio upload from the request body into memory, chunk by chunk.
+
+    Accepts either a multipart form (audio in `field_name`) or a raw audio body.
+    The body is never spooled to disk and the encoded bytes are held exactly once.
+
+    Returns:
+        AudioUpload: The encoded audio, positioned at the start, with its SHA-256.
+    """
+    buffer = AudioUpload()
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+
+    parser = None
+    collector = None
+    if content_type == b"multipart/form-data":
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise MissingAudioError("Multipart request is missing its boundary.")
+        collector = _FilePartCollector(field_name, buffer)
+        parser = MultipartParser(boundary, collector.callbacks())
+
+    async for chunk in request.stream():
+        if parser is not None:
+            parser.write(chunk)
+        else:
+            buffer.write(chunk)
+        if buffer.tell() > max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds {max_bytes // (1024 * 1024)} MB limit.")
+
+    if parser is not None:
+        parser.finalize()
+        if not collector.found:
+            raise MissingAudioError(f"No '{field_name}' part in multipart upload.")
+
+    if not buffer.tell():
+        raise MissingAudioError("Empty audio upload.")
+
+    print(f"DEBUG: Received {buffer.tell()} bytes of audio")
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,114 @@
+# batch_scheduler.py
+
+import asyncio
+import os
+import time
+from collections import deque
+
+
+class MicroBatchScheduler:
+    """
+    Collects requests for a few milliseconds and runs them as one batch.
+
+    `batch_fn(model, items)` must return one result per item; it is executed via `run`
+    (normally `TranscriptionPool.run`), so a batch occupies a single pool slot.
+    All bookkeeping happens on the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, run, batch_fn, window_ms: float = 10, max_batch_size: int = 8):
+        self.run = run
+        self.batch_fn = batch_fn
+        self.window_s = window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._pending: list[tuple[object, asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task] = set()
+
+        self._batches = 0
+        self._requests = 0
+        self._occupancy_sum = 0.0
+        self._latencies = deque(maxlen=1024)
+
+    @classmethod
+    def from_env(cls, run, batch_fn) -> "MicroBatchScheduler | None":
+        """Build a scheduler from TRANSCRIBE_BATCH_* settings, or None when batching is off."""
+        window_ms = float(os.getenv("TRANSCRIBE_BATCH_WINDOW_MS", "0"))
+        if window_ms <= 0:
+            return None
+        return cls(
+            run,
+            batch_fn,
+            window_ms=window_ms,
+            max_batch_size=int(os.getenv("TRANSCRIBE_MAX_BATCH_SIZE", "8")),
+        )
+
+    async def submit(self, item):
+        """Queue `item` for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.monotonic()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.window_s, self._flush)
+
+        # Requests whose client already went away are dropped before decoding
+        batch = [entry for entry in batch if not entry[1].done()]
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: list):
+        try:
+            results = await self.run(self.batch_fn, [item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.monotonic()
+        self._batches += 1
+        self._requests += len(batch)
+        self._occupancy_sum += len(batch) / self.max_batch_size
+        for (_, future, enqueued_at), result in zip(batch, results):
+            self._latencies.append(now - enqueued_at)
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 4)
+
+        return {
+            "window_ms": self.window_s * 1000,
+            "max_batch_size": self.max_batch_size,
+            "batches": self._batches,
+            "requests": self._requests,
+            "avg_batch_size": round(self._requests / self._batches, 3) if self._batches else 0.0,
+            "avg_occupancy": round(self._occupancy_sum / self._batches, 4) if self._batches else 0.0,
+            "latency_p50_seconds": percentile(0.50),
+            "latency_p95_seconds": percentile(0.95),
+            "latency_max_seconds": round(latencies[-1], 4) if latencies else 0.0,
+        }
@@ -0,0 +1,159 @@
+# crew_metrics.py
+
+import threading
+import time
+
+from utils.metrics import REGISTRY
+
+CREW_SECONDS = REGISTRY.histogram(
+    "nyaya_crew_kickoff_seconds", "Wall time of one crew kickoff.", ("crew", "status"))
+TASK_SECONDS = REGISTRY.histogram(
+    "nyaya_task_seconds", "Wall time of one task, by executing agent.", ("agent", "status"))
+TOOL_SECONDS = REGISTRY.histogram(
+    "nyaya_tool_seconds", "Wall time of one tool invocation.", ("tool", "agent"),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+TOOL_ERRORS = REGISTRY.counter(
+    "nyaya_tool_errors_total", "Tool invocations that raised.", ("tool", "agent"))
+LLM_SECONDS = REGISTRY.histogram(
+    "nyaya_llm_call_seconds", "Wall time of one LLM call, including provider queueing.", ("agent", "model", "status"))
+
+_handler_lock = threading.Lock()
+_handlers_registered = False
+
+# Shared LLM clients by agent label; their cumulative token usage is read at scrape time
+_llms: dict[str, object] = {}
+
+
+def _role(agent) -> str:
+    return str(getattr(agent, "role", None) or "unknown").strip()
+
+
+def register_llm(agent: str, llm):
+    """Export `llm`'s cumulative prompt/completion token counts under `agent`."""
+    _llms[agent] = llm
+
+
+def _collect_token_usage() -> list[str]:
+    names = (
+        ("nyaya_llm_prompt_tokens_total", "prompt_tokens", "Prompt tokens sent by each agent's LLM."),
+        ("nyaya_llm_completion_tokens_total", "completion_tokens", "Completion tokens received by each agent's LLM."),
+        ("nyaya_llm_successful_requests_total", "successful_requests", "Successful LLM requests per agent."),
+    )
+    usage = {}
+    for agent, llm in list(_llms.items()):
+        summary = getattr(llm, "get_token_usage_summary", None)
+        if summary is not None:
+            usage[agent] = summary()
+
+    lines = []
+    for metric, field, help_text in names:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        for agent, summary in sorted(usage.items()):
+            lines.append(f'{metric}{{agent="{agent}"}} {float(getattr(summary, field, 0) or 0)}')
+    return lines
+
+
+REGISTRY.register_collector(_collect_token_usage)
+
+
+def record_crew_kickoff(crew: str, seconds: float, status: str):
+    CREW_SECONDS.observe(seconds, crew=crew, status=status)
+
+
+def register_event_handlers():
+    """Subscribe once to CrewAI's task, tool and LLM events and record their timings."""
+    global _handlers_registered
+    with _handler_lock:
+        if _handlers_registered:
+            return
+        try:
+            from crewai.events import (
+                LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent,
+                TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent,
+                ToolUsageErrorEvent, ToolUsageFinishedEvent, crewai_event_bus,
+            )
+        except ImportError:  # crewai < 1.0
+            from crewai.utilities.events import (
+                LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent,
+                TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent,
+                ToolUsageErrorEvent, ToolUsageFinishedEvent, crewai_event_bus,
+            )
+
+        # Start times of running tasks / LLM calls; tasks are fresh per run so id() is unique
+        started: dict = {}
+        started_lock = threading.Lock()
+
+        def _start(key):
+            if key is None:
+                return
+            with started_lock:
+                started[key] = time.monotonic()
+
+        def _elapsed(key) -> float | None:
+            if key is None:
+                return None
+            with started_lock:
+                start = started.pop(key, None)
+            return time.monotonic() - start if start is not None else None
+
+        def _llm_key(event):
+            # Events of one call share its call_id; the shared LLM clients serve many calls
+            # at once (and the event bus may run handlers off the calling thread), so
+            # calls without one are not timed
+            call_id = getattr(event, "call_id", None)
+            return ("llm", call_id) if call_id else None
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def _task_started(source, event):
+            _start(("task", id(getattr(event, "task", None) or source)))
+
+        def _task_finished(source, event, status):
+            task = getattr(event, "task", None) or source
+            seconds = _elapsed(("task", id(task)))
+            if seconds is not None:
+                TASK_SECONDS.observe(seconds, agent=_role(getattr(task, "agent", None)), status=status)
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def _task_completed(source, event):
+            _task_finished(source, event, "ok")
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def _task_failed(source, event):
+            _task_finished(source, event, "error")
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def _tool_finished(source, event):
+            started_at, finished_at = getattr(event, "started_at", None), getattr(event, "finished_at", None)
+            if started_at is not None and finished_at is not None:
+                TOOL_SECONDS.observe(
+                    (finished_at - started_at).total_seconds(),
+                    tool=event.tool_name, agent=getattr(event, "agent_role", None) or "unknown"
+                )
+
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def _tool_error(source, event):
+            TOOL_ERRORS.inc(tool=event.tool_name, agent=getattr(event, "agent_role", None) or "unknown")
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def _llm_started(source, event):
+            _start(_llm_key(event))
+
+        def _llm_finished(source, event, status):
+            seconds = _elapsed(_llm_key(event))
+            if seconds is not None:
+                LLM_SECONDS.observe(
+                    seconds,
+                    agent=getattr(event, "agent_role", None) or "unknown",
+                    model=getattr(event, "model", None) or getattr(source, "model", "unknown"),
+                    status=status
+                )
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def _llm_completed(source, event):
+            _llm_finished(source, event, "ok")
+
+        @crewai_event_bus.on(LLMCallFailedEvent)
+        def _llm_failed(source, event):
+            _llm_finished(source, event, "error")
+
+        _handlers_registered = True
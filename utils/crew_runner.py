@@ -0,0 +1,131 @@
+# crew_runner.py
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.retry_handler import execute_crew
+
+
+def _build_and_kickoff(crew_factory, inputs: dict, task_callback):
+    # Building inside the pool thread keeps Agent/Task construction off the event loop
+    crew = crew_factory(task_callback=task_callback)
+    return execute_crew(crew, inputs)
+
+
+class JoinedCrewOutput:
+    """
+    Results of independent crews joined in order, shaped like one crew's output:
+    `tasks_output` concatenates every crew's tasks and `raw` is the last crew's.
+    """
+
+    def __init__(self, results: list):
+        self.results = results
+        self.tasks_output = [task_output for result in results for task_output in result.tasks_output]
+        self.raw = results[-1].raw if results else ""
+
+    def __str__(self):
+        return self.raw
+
+
+def kickoff_parallel(crew_factories, inputs: dict, task_callback=None) -> JoinedCrewOutput:
+    """
+    Blocking helper for scripts and Streamlit: kick off independent crews concurrently,
+    each timed on its own, and join their outputs.
+    """
+    with ThreadPoolExecutor(max_workers=len(crew_factories), thread_name_prefix="crew") as executor:
+        futures = [
+            executor.submit(_build_and_kickoff, factory, inputs, task_callback)
+            for factory in crew_factories
+        ]
+        return JoinedCrewOutput([future.result() for future in futures])
+
+
+class CrewTimeoutError(Exception):
+    """Raised when a crew run exceeds its per-request timeout."""
+
+
+class CrewRunner:
+    """
+    Runs blocking crew kickoffs (and their LLM rate-limit waits) on a dedicated thread pool.
+
+    The pool size is the concurrency cap; extra runs wait in the pool's queue. The
+    timeout covers queueing plus execution. A run that times out while already
+    executing cannot be interrupted: its thread finishes in the background and the
+    result is discarded, but it still counts as in flight until it actually finishes.
+    """
+
+    def __init__(self, max_concurrency: int = 4, timeout_s: float = 300):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_s = timeout_s
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="crew")
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CrewRunner":
+        return cls(
+            max_concurrency=int(os.getenv("CREW_MAX_CONCURRENCY", "4")),
+            timeout_s=float(os.getenv("CREW_TIMEOUT_SECONDS", "300")),
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Runs queued or executing on the pool, including timed-out runs still executing."""
+        with self._in_flight_lock:
+            return self._in_flight
+
+    def has_capacity(self, reserve: int = 0) -> bool:
+        """Whether a new run would start right away while leaving `reserve` slots free."""
+        return self.in_flight < self.max_concurrency - reserve
+
+    def _finished(self, _future):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    async def call(self, fn, *args, timeout: float | None = None, on_submit=None, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` on the crew pool without blocking the event loop.
+        `on_submit(future)` receives the pool's concurrent future, e.g. to track when the
+        work really ends after the caller stopped waiting.
+        """
+        timeout = timeout or self.timeout_s
+        with self._in_flight_lock:
+            self._in_flight += 1
+        future = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        # Released when the run really ends (or is cancelled while queued), not when we stop waiting
+        future.add_done_callback(self._finished)
+        if on_submit is not None:
+            on_submit(future)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise CrewTimeoutError(f"Crew run did not finish within {timeout:.0f}s.")
+
+    async def kickoff(self, crew_factory, inputs: dict, timeout: float | None = None, task_callback=None,
+                      on_submit=None):
+        """
+        Build a fresh crew with `crew_factory(task_callback=...)` and kick it off once,
+        off the event loop. `task_callback(task_output)` is called
+        from the crew thread as each task completes; `on_submit` is passed to `call`.
+        """
+        return await self.call(_build_and_kickoff, crew_factory, inputs, task_callback, timeout=timeout,
+                               on_submit=on_submit)
+
+    async def kickoff_parallel(self, crew_factories, inputs: dict, timeout: float | None = None,
+                               task_callback=None) -> JoinedCrewOutput:
+        """
+        Kick off independent crews concurrently on the pool (one slot each) and join their
+        outputs in factory order. LLM calls retry rate limits themselves; a crew that still
+        fails raises here.
+        """
+        results = await asyncio.gather(*(
+            self.kickoff(factory, inputs, timeout=timeout, task_callback=task_callback)
+            for factory in crew_factories
+        ))
+        return JoinedCrewOutput(list(results))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,115 @@
+# draft_streaming.py
+
+import contextvars
+import threading
+
+from utils.retry_handler import execute_crew
+
+# Token sink of the request whose crew is running in the current thread/context
+_active_sink: contextvars.ContextVar = contextvars.ContextVar("draft_token_sink", default=None)
+
+_handler_lock = threading.Lock()
+_handler_registered = False
+
+
+# CrewAI agents reason in ReAct format; only the text after this marker is the document
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class TokenSink:
+    """
+    Forwards the final answer streamed by one LLM to an asyncio queue on the request's
+    event loop.
+
+    Each LLM call (attempt) is buffered until its "Final Answer:" marker, so "Thought:" /
+    "Action:" scaffolding never reaches the client. When a new call starts after answer
+    text was already sent (a re-prompt, failover or failed attempt), a `reset` event tells
+    the client to discard it before the new attempt streams.
+    """
+
+    def __init__(self, llm, loop, queue):
+        self.llm = llm
+        self.loop = loop
+        self.queue = queue
+        self._lock = threading.Lock()
+        self._buffer = ""
+        self._answer_start: int | None = None
+        self._sent = 0
+
+    def _emit(self, event: str, data: dict):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, (event, data))
+
+    def start_attempt(self):
+        """A new LLM call started: drop the previous attempt's buffer."""
+        with self._lock:
+            if self._sent:
+                self._emit("reset", {})
+            self._buffer = ""
+            self._answer_start = None
+            self._sent = 0
+
+    def push(self, chunk: str):
+        with self._lock:
+            self._buffer += chunk
+            if self._answer_start is None:
+                marker = self._buffer.find(FINAL_ANSWER_MARKER)
+                if marker < 0:
+                    return
+                self._answer_start = marker + len(FINAL_ANSWER_MARKER)
+            answer = self._buffer[self._answer_start:]
+            if not self._sent:
+                answer = answer.lstrip()
+                # Keep the offset at the first non-blank character of the answer
+                self._answer_start = len(self._buffer) - len(answer)
+            text = answer[self._sent:]
+            if text:
+                self._sent += len(text)
+                self._emit("token", {"text": text})
+
+
+def _register_stream_handler():
+    """Subscribe once to CrewAI's LLM stream events and route chunks to the active sink."""
+    global _handler_registered
+    with _handler_lock:
+        if _handler_registered:
+            return
+        try:
+            from crewai.events import LLMCallStartedEvent, LLMStreamChunkEvent, crewai_event_bus
+        except ImportError:  # crewai < 1.0
+            from crewai.utilities.events import LLMCallStartedEvent, LLMStreamChunkEvent, crewai_event_bus
+
+        def _sink_for(source):
+            sink = _active_sink.get()
+            # Only the drafter's tokens are forwarded (from its failover provider too),
+            # not the IPC/notifier agents'
+            if sink is not None and (source is sink.llm or source is getattr(sink.llm, "secondary", None)):
+                return sink
+            return None
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def _start_attempt(source, event):
+            sink = _sink_for(source)
+            if sink is not None:
+                sink.start_attempt()
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def _forward_chunk(source, event):
+            sink = _sink_for(source)
+            if sink is not None:
+                sink.push(event.chunk)
+
+        _handler_registered = True
+
+
+def kickoff_streaming(crew_factory, inputs: dict, sink: TokenSink):
+    """
+    Build a crew with `crew_factory()` and kick it off in the current (crew pool) thread
+    while forwarding the final answer streamed by `sink.llm` to `sink`. Returns the crew
+    result. `sink.llm` must be a streaming client (see legal_drafter_agent.streaming_llm).
+    """
+    _register_stream_handler()
+    token = _active_sink.set(sink)
+    try:
+        return execute_crew(crew_factory(), inputs)
+    finally:
+        _active_sink.reset(token)
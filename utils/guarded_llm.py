@@ -0,0 +1,81 @@
+# guarded_llm.py
+
+import os
+import time
+
+from crewai import LLM
+
+from utils.metrics import REGISTRY
+from utils.rate_limiter import (
+    CircuitOpenError, get_guard, guard_states, is_rate_limit_error, is_transient_error, retry_after_seconds,
+)
+
+LLM_RETRIES = REGISTRY.counter(
+    "nyaya_llm_retries_total", "LLM calls retried, by reason (rate_limit / transient).", ("model", "reason"))
+LLM_REJECTED = REGISTRY.counter(
+    "nyaya_llm_circuit_rejections_total", "LLM calls refused because the model's circuit was open.", ("model",))
+LLM_QUEUE_SECONDS = REGISTRY.histogram(
+    "nyaya_llm_rate_limit_wait_seconds", "Time an LLM call waited for the shared rate limiter.", ("model",),
+    buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120))
+
+
+def _collect_circuit_states() -> list[str]:
+    lines = [
+        "# HELP nyaya_llm_circuit_open Whether the model's circuit breaker is failing calls fast (1) or not (0).",
+        "# TYPE nyaya_llm_circuit_open gauge",
+    ]
+    for model, state in sorted(guard_states().items()):
+        lines.append(f'nyaya_llm_circuit_open{{model="{model}"}} {1 if state == "open" else 0}')
+    return lines
+
+
+REGISTRY.register_collector(_collect_circuit_states)
+
+
+class RateLimitedLLM(LLM):
+    """
+    CrewAI LLM whose calls draw from the model's process-wide (optionally cross-process)
+    token bucket and circuit breaker, shared by every agent using the same model.
+
+    Rate-limit and transient errors are retried here, per LLM call, so a 429 never
+    re-runs a whole crew. A 429 pauses the bucket for the provider's Retry-After; after
+    LLM_CIRCUIT_FAILURES consecutive 429s calls fail fast with CircuitOpenError.
+    """
+
+    def call(self, *args, **kwargs):
+        guard = get_guard(self.model)
+        max_attempts = max(1, int(os.getenv("LLM_MAX_ATTEMPTS", "4")))
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                guard.breaker.before_call()
+            except CircuitOpenError:
+                LLM_REJECTED.inc(model=self.model)
+                raise
+            LLM_QUEUE_SECONDS.observe(guard.bucket.acquire(), model=self.model)
+
+            try:
+                result = super().call(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    retry_after = retry_after_seconds(e)
+                    guard.breaker.record_rate_limited(retry_after)
+                    # Every caller of this model waits, not just this one
+                    guard.bucket.block_for(retry_after or min(60, 2 ** attempt))
+                    reason = "rate_limit"
+                elif is_transient_error(e):
+                    guard.breaker.record_other_failure()
+                    reason = "transient"
+                else:
+                    guard.breaker.record_other_failure()
+                    raise
+                if attempt == max_attempts:
+                    raise
+                LLM_RETRIES.inc(model=self.model, reason=reason)
+                print(f"⚠️ {self.model} {reason.replace('_', ' ')} error, retrying (attempt {attempt + 1}/{max_attempts}): {e}")
+                if reason == "transient":
+                    time.sleep(min(30, 2 ** attempt))
+                continue
+
+            guard.breaker.record_success()
+            return result
@@ -0,0 +1,178 @@
+# job_store.py
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class Job:
+    """
+    A background analysis/drafting run with an append-only event log.
+
+    Events may be added from crew worker threads; async readers are woken via
+    the event loop that created the job.
+    """
+
+    def __init__(self, kind: str, loop: asyncio.AbstractEventLoop):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.events: list[dict] = []
+
+        self._lock = threading.Lock()
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def add_event(self, event: str, data: dict | None = None):
+        """Append an event; safe to call from any thread."""
+        with self._lock:
+            self.events.append({
+                "id": len(self.events),
+                "event": event,
+                "data": data or {},
+                "time": time.time(),
+            })
+        self._notify()
+
+    def set_status(self, status: str, result=None, error: str | None = None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            if status in FINISHED_STATUSES:
+                self.finished_at = time.time()
+        if error is not None:
+            self.add_event(status, {"error": error})
+        else:
+            self.add_event(status, {"result": result} if result is not None else {})
+
+    def events_since(self, cursor: int) -> list[dict]:
+        with self._lock:
+            return self.events[cursor:]
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """Wait until a new event arrives; False on timeout."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._changed.clear()
+
+    def _notify(self):
+        try:
+            self._loop.call_soon_threadsafe(self._changed.set)
+        except RuntimeError:
+            # Event loop already closed (server shutting down)
+            pass
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+                "result": self.result,
+                "error": self.error,
+                "events": [{"id": e["id"], "event": e["event"]} for e in self.events],
+            }
+
+
+class JobStore:
+    """In-process job registry; finished jobs are evicted after `ttl_s` seconds."""
+
+    def __init__(self, ttl_s: float = 3600, max_jobs: int = 1000):
+        self.ttl_s = ttl_s
+        self.max_jobs = max_jobs
+        self._jobs: dict[str, Job] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> "JobStore":
+        return cls(
+            ttl_s=float(os.getenv("JOB_TTL_SECONDS", "3600")),
+            max_jobs=int(os.getenv("JOB_STORE_MAX_JOBS", "1000")),
+        )
+
+    def start(self, kind: str, run) -> Job:
+        """
+        Create a job and run `await run(job)` in the background.
+        The coroutine's return value becomes the job result.
+        """
+        self._evict()
+        job = Job(kind, asyncio.get_running_loop())
+        self._jobs[job.id] = job
+
+        task = asyncio.create_task(self._execute(job, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._evict()
+        return self._jobs.get(job_id)
+
+    async def _execute(self, job: Job, run):
+        job.set_status("running")
+        try:
+            result = await run(job)
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) failed: {e}")
+            job.set_status("failed", error=str(e))
+        else:
+            job.set_status("succeeded", result=result)
+
+    def _evict(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.ttl_s
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+        # Over capacity: drop the oldest finished jobs first
+        if len(self._jobs) >= self.max_jobs:
+            finished = sorted(
+                (job for job in self._jobs.values() if job.finished),
+                key=lambda job: job.finished_at
+            )
+            for job in finished[: len(self._jobs) - self.max_jobs + 1]:
+                del self._jobs[job.id]
+
+
+def format_sse(event: str, data: dict, event_id: int | None = None) -> str:
+    """Encode one Server-Sent Event."""
+    payload = json.dumps(data, ensure_ascii=False)
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {payload}\n\n"
+
+
+async def sse_events(job: Job, last_event_id: int = -1, keepalive_s: float = 15):
+    """Server-Sent Events for `job`, resuming after `last_event_id` on reconnects."""
+    cursor = last_event_id + 1
+    while True:
+        for event in job.events_since(cursor):
+            yield format_sse(event["event"], event["data"], event["id"])
+            cursor = event["id"] + 1
+
+        if job.finished and not job.events_since(cursor):
+            return
+        if not await job.wait_for_change(keepalive_s):
+            yield ": keep-alive\n\n"
@@ -0,0 +1,238 @@
+# llm_router.py
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from utils.guarded_llm import RateLimitedLLM
+from utils.metrics import REGISTRY
+from utils.rate_limiter import get_guard
+
+LLM_HEDGES = REGISTRY.counter(
+    "nyaya_llm_hedges_total", "Hedge requests sent to the secondary provider, by which answer won.", ("model", "winner"))
+LLM_FAILOVERS = REGISTRY.counter(
+    "nyaya_llm_failovers_total", "LLM calls sent straight to the secondary provider.", ("model", "reason"))
+
+# Hedged calls run here so the caller can wait on whichever finishes first
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("LLM_HEDGE_WORKERS", "16")), thread_name_prefix="llm")
+
+
+class LatencyStats:
+    """Rolling window of one provider's successful call latencies, plus error counts."""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            if ok:
+                self._latencies.append(seconds)
+            else:
+                self.errors += 1
+
+    def percentile(self, p: float) -> float | None:
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    @property
+    def samples(self) -> int:
+        with self._lock:
+            return len(self._latencies)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "samples": self.samples,
+            "p50_seconds": self.percentile(50),
+            "p95_seconds": self.percentile(95),
+            "p99_seconds": self.percentile(99),
+        }
+
+
+_stats: dict[str, LatencyStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _stats_for(model: str) -> LatencyStats:
+    with _stats_lock:
+        return _stats.setdefault(model, LatencyStats())
+
+
+def provider_stats() -> dict:
+    """Per-model latency percentiles and error counts."""
+    with _stats_lock:
+        items = list(_stats.items())
+    return {model: stats.snapshot() for model, stats in items}
+
+
+def _timed(model: str, fn, *args, **kwargs):
+    start = time.monotonic()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception:
+        _stats_for(model).record(time.monotonic() - start, ok=False)
+        raise
+    _stats_for(model).record(time.monotonic() - start, ok=True)
+    return result
+
+
+def _submit(fn, *args, **kwargs):
+    # Each pool thread runs in a copy of the caller's context (streaming sinks, event scopes)
+    return _pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class RoutedLLM(RateLimitedLLM):
+    """
+    Primary LLM (this instance) with an optional secondary provider.
+
+    Each call goes to the primary. If it has not answered within the primary's
+    LLM_HEDGE_PERCENTILE latency, the same request is also sent to the secondary and
+    the first answer wins; the loser is cancelled if still queued, otherwise its
+    result is discarded (an in-flight HTTP call cannot be interrupted). After
+    LLM_FAILOVER_ERRORS consecutive primary errors (or while its circuit is open)
+    calls go straight to the secondary for LLM_FAILOVER_SECONDS.
+
+    Streaming clients and calls that let the LLM execute tools are never hedged, so
+    tokens are not interleaved and a tool (e.g. sending an email) never runs twice;
+    they still fail over on errors.
+    """
+
+    def __init__(self, *args, secondary: RateLimitedLLM | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.secondary = secondary
+        self._route_lock = threading.Lock()
+        self._consecutive_errors = 0
+        self._failed_over_until = 0.0
+
+    def call(self, *args, **kwargs):
+        if self.secondary is None:
+            return _timed(self.model, super().call, *args, **kwargs)
+        if self._failed_over():
+            LLM_FAILOVERS.inc(model=self.model, reason="primary_unhealthy")
+            return self._call_secondary(*args, **kwargs)
+
+        executes_tools = bool(kwargs.get("available_functions") or (len(args) > 3 and args[3]))
+        if getattr(self, "stream", False) or executes_tools:
+            try:
+                return self._call_primary(*args, **kwargs)
+            except Exception as e:
+                print(f"⚠️ {self.model} failed, failing over to {self.secondary.model}: {e}")
+                LLM_FAILOVERS.inc(model=self.model, reason="error")
+                return self._call_secondary(*args, **kwargs)
+        return self._hedged_call(*args, **kwargs)
+
+    def _call_primary(self, *args, **kwargs):
+        try:
+            result = _timed(self.model, super().call, *args, **kwargs)
+        except Exception:
+            self._record_primary(ok=False)
+            raise
+        self._record_primary(ok=True)
+        return result
+
+    def _call_secondary(self, *args, **kwargs):
+        return _timed(self.secondary.model, self.secondary.call, *args, **kwargs)
+
+    def _hedged_call(self, *args, **kwargs):
+        primary = _submit(self._call_primary, *args, **kwargs)
+        try:
+            return primary.result(timeout=self._hedge_after())
+        except FutureTimeoutError:
+            pass
+        except Exception as e:
+            # Primary failed before the hedge deadline: fail over for this call
+            print(f"⚠️ {self.model} failed, failing over to {self.secondary.model}: {e}")
+            LLM_FAILOVERS.inc(model=self.model, reason="error")
+            return self._call_secondary(*args, **kwargs)
+
+        secondary = _submit(self._call_secondary, *args, **kwargs)
+        pending = {primary, secondary}
+        errors = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[future] = e
+                    continue
+                for other in pending:
+                    other.cancel()
+                LLM_HEDGES.inc(model=self.model, winner="primary" if future is primary else "secondary")
+                return result
+        LLM_HEDGES.inc(model=self.model, winner="none")
+        raise errors[primary]
+
+    def _hedge_after(self) -> float:
+        stats = _stats_for(self.model)
+        if stats.samples < int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")):
+            return float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "10"))
+        return max(1.0, stats.percentile(float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))))
+
+    def _failed_over(self) -> bool:
+        if get_guard(self.model).breaker.state == "open":
+            return True
+        with self._route_lock:
+            return time.time() < self._failed_over_until
+
+    def _record_primary(self, ok: bool):
+        with self._route_lock:
+            if ok:
+                self._consecutive_errors = 0
+                return
+            self._consecutive_errors += 1
+            if self._consecutive_errors >= int(os.getenv("LLM_FAILOVER_ERRORS", "3")):
+                self._failed_over_until = time.time() + float(os.getenv("LLM_FAILOVER_SECONDS", "60"))
+                self._consecutive_errors = 0
+                print(f"⚠️ {self.model} keeps failing; routing to {self.secondary.model} for a while")
+
+
+def create_llm(temperature: float, stream: bool = False) -> RoutedLLM:
+    """
+    The LLM every agent uses: LLM_PRIMARY_MODEL (Gemini by default), hedged and failed
+    over to LLM_SECONDARY_MODEL (Groq by default) when GROQ_API_KEY is configured.
+
+    Both are built with `is_litellm=True`: since crewai 1.0, `LLM(...)` hands providers
+    with a native SDK (Gemini among them) to that SDK's class instead of the subclass
+    being constructed, which would silently drop the rate limiting and routing here.
+    """
+    secondary = None
+    secondary_model = os.getenv("LLM_SECONDARY_MODEL", "groq/llama-3.3-70b-versatile")
+    if secondary_model and os.environ.get("GROQ_API_KEY"):
+        secondary = _checked(RateLimitedLLM(
+            model=secondary_model,
+            temperature=temperature,
+            stream=stream,
+            api_key=os.environ.get("GROQ_API_KEY"),
+            is_litellm=True
+        ), RateLimitedLLM)
+    return _checked(RoutedLLM(
+        model=os.getenv("LLM_PRIMARY_MODEL", "gemini/gemini-2.5-flash-lite"),
+        temperature=temperature,
+        stream=stream,
+        api_key=os.environ.get("GOOGLE_API_KEY"),
+        secondary=secondary,
+        is_litellm=True
+    ), RoutedLLM)
+
+
+def _checked(llm, expected: type):
+    # Fail at startup rather than run every agent without a rate limiter
+    if not isinstance(llm, expected):
+        raise TypeError(
+            f"crewai built {type(llm).__name__} for {llm.model} instead of {expected.__name__}; "
+            "rate limiting and failover would be bypassed"
+        )
+    return llm
@@ -0,0 +1,86 @@
+# long_audio.py
+
+import asyncio
+import os
+
+from utils.transcription import (
+    DEVANAGARI_PROMPT,
+    LANGUAGE_DETECTION_SCAN_SECONDS,
+    MIXED_PROMPT,
+    SAMPLE_RATE,
+    decode_segments,
+    detect_language,
+    join_segments,
+    resolve_language,
+)
+
+# Recordings shorter than this take the regular single-pass path
+LONG_AUDIO_MIN_SECONDS = float(os.getenv("LONG_AUDIO_MIN_SECONDS", "120"))
+# Target length of each parallel chunk; cuts only happen in silence
+LONG_AUDIO_CHUNK_SECONDS = float(os.getenv("LONG_AUDIO_CHUNK_SECONDS", "60"))
+
+
+def plan_chunks(audio, target_s: float = LONG_AUDIO_CHUNK_SECONDS) -> list[tuple[int, int]]:
+    """
+    Split `audio` into roughly `target_s` long chunks, cutting only in VAD silences.
+
+    Returns:
+        list[tuple[int, int]]: (start, end) sample ranges covering the whole audio, in order.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    target = int(target_s * SAMPLE_RATE)
+
+    cuts = [0]
+    for current, following in zip(speech, speech[1:]):
+        if current["end"] - cuts[-1] >= target:
+            # Cut in the middle of the silence between two speech regions
+            cuts.append((current["end"] + following["start"]) // 2)
+    cuts.append(len(audio))
+
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if end > start]
+
+
+async def transcribe_long(pool, audio) -> dict:
+    """
+    Transcribe a long recording by decoding its chunks in parallel across `pool`.
+
+    The language is detected once for the whole recording; chunk segments are
+    shifted back onto the recording's timeline and stitched together in order.
+
+    Returns:
+        dict: Shaped like `transcription.transcribe()`.
+    """
+    chunks = await asyncio.to_thread(plan_chunks, audio)
+    print(f"DEBUG: Long audio ({len(audio) / SAMPLE_RATE:.0f}s) split into {len(chunks)} chunks")
+
+    # Detection only reads the first speech, so ship just the first chunk (which holds
+    # it) to the worker rather than pickling the whole recording
+    start, end = chunks[0]
+    detection_audio = audio[start: min(end, start + int(LANGUAGE_DETECTION_SCAN_SECONDS * SAMPLE_RATE))]
+    detected, probability = await pool.run(detect_language, detection_audio)
+    language, forced = resolve_language(detected)
+    prompt = DEVANAGARI_PROMPT if forced else MIXED_PROMPT
+
+    chunk_segments = await pool.map(
+        decode_segments,
+        [(audio[start:end], language, prompt) for start, end in chunks]
+    )
+
+    segments = []
+    for (start, _), decoded in zip(chunks, chunk_segments):
+        offset = start / SAMPLE_RATE
+        segments.extend(
+            {"start": round(s["start"] + offset, 2), "end": round(s["end"] + offset, 2), "text": s["text"]}
+            for s in decoded
+        )
+
+    return {
+        "text": join_segments(segments),
+        "segments": segments,
+        "language": language,
+        "detected_language": detected,
+        "language_probability": probability,
+        "forced_hindi": forced,
+    }
@@ -0,0 +1,247 @@
+# rate_limiter.py
+
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process limiting is unavailable
+    fcntl = None
+
+
+class RateLimitTimeout(Exception):
+    """Raised when no request slot for a model frees up within the wait limit."""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(f"Rate limit for {model} still exhausted; retry in {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider that keeps answering 429."""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(f"{model} is rate limiting requests; failing fast for {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Requests-per-minute token bucket for one model.
+
+    The default burst is a full minute's budget, matching CrewAI's per-agent `max_rpm`
+    counter this replaces: requests go out back to back until the minute's budget is spent.
+
+    With `state_dir` the bucket state lives in a file guarded by flock, so every worker
+    process on the host draws from the same budget; otherwise it is per process.
+    `block_for()` pauses the bucket for everyone, e.g. to honour a provider's Retry-After.
+    """
+
+    def __init__(self, model: str, rpm: float, burst: int | None = None, state_dir: str | None = None):
+        self.model = model
+        self.rate = max(rpm, 0.001) / 60.0
+        self.burst = max(1, burst if burst is not None else int(rpm))
+        self._lock = threading.Lock()
+        self._state = {"tokens": float(self.burst), "updated": time.time(), "blocked_until": 0.0}
+
+        self._path = None
+        if state_dir and fcntl is not None:
+            os.makedirs(state_dir, exist_ok=True)
+            self._path = os.path.join(state_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model) + ".bucket")
+        elif state_dir:
+            print("⚠️ Cross-process rate limiting needs fcntl; limiting per process instead")
+
+    def acquire(self, max_wait: float = 120) -> float:
+        """Block until a request may be sent; returns the seconds waited."""
+        start = time.monotonic()
+        while True:
+            wait = self._update(take=True)
+            if wait <= 0:
+                return time.monotonic() - start
+            waited = time.monotonic() - start
+            if waited + wait > max_wait:
+                raise RateLimitTimeout(self.model, wait)
+            time.sleep(min(wait, 1.0))
+
+    def block_for(self, seconds: float):
+        """Hold every caller back for `seconds` and drain the bucket (provider said 429)."""
+        self._update(block_until=time.time() + seconds)
+
+    def available(self) -> float:
+        """Requests that could be sent right now without waiting (0 while blocked)."""
+        return self._update(peek=True)
+
+    def _update(self, take: bool = False, block_until: float | None = None, peek: bool = False) -> float:
+        with self._lock:
+            if self._path is None:
+                return self._apply(self._state, take, block_until, peek)
+            with open(self._path, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "null") or dict(self._state)
+                    except ValueError:
+                        state = dict(self._state)
+                    wait = self._apply(state, take, block_until, peek)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    return wait
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _apply(self, state: dict, take: bool, block_until: float | None, peek: bool = False) -> float:
+        # Refill, then either take a token or report how long until one is available
+        # (or, when peeking, how many tokens are available)
+        now = time.time()
+        state["tokens"] = min(self.burst, state["tokens"] + (now - state["updated"]) * self.rate)
+        state["updated"] = now
+        if block_until is not None:
+            state["blocked_until"] = max(state["blocked_until"], block_until)
+            state["tokens"] = 0.0
+        if peek:
+            return 0.0 if now < state["blocked_until"] else state["tokens"]
+        if not take:
+            return 0.0
+        if now < state["blocked_until"]:
+            return state["blocked_until"] - now
+        if state["tokens"] >= 1:
+            state["tokens"] -= 1
+            return 0.0
+        return (1 - state["tokens"]) / self.rate
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive 429s and fails fast until the reset time
+    (at least the provider's Retry-After). One trial request is then let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, model: str, failure_threshold: int = 3, reset_s: float = 30):
+        self.model = model
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_s = reset_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._failures < self.failure_threshold:
+                return "closed"
+            return "open" if time.time() < self._open_until else "half_open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go to the provider now."""
+        with self._lock:
+            if self._failures < self.failure_threshold:
+                return
+            now = time.time()
+            if now < self._open_until:
+                raise CircuitOpenError(self.model, self._open_until - now)
+            if self._trial_in_flight:
+                raise CircuitOpenError(self.model, 1)
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_rate_limited(self, retry_after: float | None = None):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.time() + max(self.reset_s, retry_after or 0)
+
+    def record_other_failure(self):
+        # Not a quota signal: only release a half-open trial
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class ProviderGuard:
+    """The shared token bucket and circuit breaker for one model name."""
+
+    def __init__(self, bucket: TokenBucket, breaker: CircuitBreaker):
+        self.bucket = bucket
+        self.breaker = breaker
+
+    def has_headroom(self, min_requests: float = 1) -> bool:
+        """Whether `min_requests` calls could go out now: circuit closed and enough tokens."""
+        return self.breaker.state == "closed" and self.bucket.available() >= min_requests
+
+
+_guards: dict[str, ProviderGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def _rpm_for(model: str) -> float:
+    # LLM_RPM_OVERRIDES="gemini/gemini-2.5-flash-lite=30,groq/llama-3.3-70b-versatile=30"
+    for item in os.getenv("LLM_RPM_OVERRIDES", "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() == model and value.strip():
+            return float(value)
+    return float(os.getenv("LLM_RPM", "60"))
+
+
+def get_guard(model: str) -> ProviderGuard:
+    """Process-wide guard for `model`; every agent using the model shares it."""
+    with _guards_lock:
+        if model not in _guards:
+            _guards[model] = ProviderGuard(
+                TokenBucket(model, _rpm_for(model), state_dir=os.getenv("LLM_RATE_LIMIT_DIR") or None),
+                CircuitBreaker(
+                    model,
+                    failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURES", "3")),
+                    reset_s=float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30")),
+                ),
+            )
+        return _guards[model]
+
+
+def guard_states() -> dict:
+    with _guards_lock:
+        return {model: guard.breaker.state for model, guard in _guards.items()}
+
+
+# --- Classifying provider errors ---
+
+_RETRY_DELAY = re.compile(r"retry(?:[_ -]?delay|[_ -]?after| in)[\"']?\s*[:=]?\s*[\"']?(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    if type(error).__name__ == "RateLimitError" or getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "rate limit" in message or "429" in message or "resource_exhausted" in message
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Timeouts, dropped connections and 5xx responses, which are worth one more try."""
+    if type(error).__name__ in ("Timeout", "APIConnectionError", "ServiceUnavailableError", "InternalServerError"):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """The provider's requested back-off: a Retry-After header or Gemini's retryDelay."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            return float(value)
+    except (TypeError, ValueError):
+        pass
+    match = _RETRY_DELAY.search(str(error))
+    return float(match.group(1)) if match else None
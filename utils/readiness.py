@@ -0,0 +1,67 @@
+# readiness.py
+
+import threading
+import time
+
+
+class ComponentLoader:
+    """
+    Loads heavy components (models, crews) concurrently in background threads
+    and tracks per-component status and load timings for readiness checks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaders = {}
+        self._status = {}
+
+    def register(self, name: str, loader, required: bool = True):
+        """Register `loader()`; required components gate overall readiness."""
+        with self._lock:
+            self._loaders[name] = loader
+            self._status[name] = {
+                "status": "pending",
+                "required": required,
+                "seconds": None,
+                "error": None,
+            }
+
+    def start(self):
+        """Start every pending loader in its own daemon thread and return immediately."""
+        with self._lock:
+            pending = [name for name, state in self._status.items() if state["status"] == "pending"]
+        for name in pending:
+            threading.Thread(target=self._load, args=(name,), name=f"load-{name}", daemon=True).start()
+
+    def _load(self, name: str):
+        self._update(name, status="loading")
+        start = time.monotonic()
+        try:
+            self._loaders[name]()
+        except Exception as e:
+            print(f"❌ Failed to load {name}: {e}")
+            self._update(name, status="failed", seconds=round(time.monotonic() - start, 3), error=str(e))
+            return
+        seconds = round(time.monotonic() - start, 3)
+        print(f"✅ {name} loaded in {seconds}s")
+        self._update(name, status="ready", seconds=seconds)
+
+    def _update(self, name: str, **fields):
+        with self._lock:
+            self._status[name].update(fields)
+
+    def is_ready(self, name: str) -> bool:
+        with self._lock:
+            return self._status.get(name, {}).get("status") == "ready"
+
+    def all_ready(self) -> bool:
+        with self._lock:
+            return all(
+                state["status"] == "ready"
+                for state in self._status.values()
+                if state["required"]
+            )
+
+    def status(self) -> dict:
+        with self._lock:
+            return {name: dict(state) for name, state in self._status.items()}
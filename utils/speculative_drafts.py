@@ -0,0 +1,161 @@
+# speculative_drafts.py
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class SpeculativeDrafts:
+    """
+    Drafting runs started in the background right after an analysis, before the user
+    asks for the document.
+
+    Each run is stored under a key of its drafting inputs. A later /draft with the same
+    inputs claims it: a finished result is returned at once, an in-flight run is awaited.
+    At most `max_in_flight` speculative runs execute at a time, and unclaimed runs are
+    dropped after `ttl_s` or beyond `max_entries` (oldest first).
+
+    A run counts as in flight until its task has ended *and* every crew-pool future it
+    handed to `track` has finished, so a dropped run whose crew thread is still
+    spending LLM calls keeps its place under `max_in_flight`.
+    """
+
+    def __init__(self, enabled: bool = False, max_in_flight: int = 1, max_entries: int = 64, ttl_s: float = 600):
+        self.enabled = enabled
+        self.max_in_flight = max(0, max_in_flight)
+        self.max_entries = max(1, max_entries)
+        self.ttl_s = ttl_s
+
+        # key -> {"task": asyncio.Task, "created_at": float}
+        self._runs: OrderedDict[str, dict] = OrderedDict()
+        # Runs whose task or crew work has not finished, claimed and evicted ones included;
+        # released from crew threads, hence the lock
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._stats = {"started": 0, "skipped": 0, "claimed": 0, "claimed_in_flight": 0, "failed": 0, "evicted": 0}
+
+    @classmethod
+    def from_env(cls) -> "SpeculativeDrafts":
+        return cls(
+            enabled=os.getenv("SPECULATIVE_DRAFTING", "0").lower() in ("1", "true", "yes"),
+            max_in_flight=int(os.getenv("SPECULATIVE_DRAFT_MAX_IN_FLIGHT", "1")),
+            max_entries=int(os.getenv("SPECULATIVE_DRAFT_MAX_ENTRIES", "64")),
+            ttl_s=float(os.getenv("SPECULATIVE_DRAFT_TTL_SECONDS", "600")),
+        )
+
+    @staticmethod
+    def make_key(case_summary: str, advisory_analysis: str, language_preference: str) -> str:
+        # Clients re-serialize the advisory JSON they were given, so compare it structurally
+        try:
+            advisory = json.dumps(json.loads(advisory_analysis), sort_keys=True, ensure_ascii=False)
+        except ValueError:
+            advisory = " ".join(advisory_analysis.split())
+        parts = [" ".join(case_summary.split()), advisory, language_preference.strip().lower()]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def in_flight(self) -> int:
+        with self._in_flight_lock:
+            return self._in_flight
+
+    def start(self, key: str, run, has_capacity=None) -> bool:
+        """
+        Start `await run(track)` in the background under `key` unless speculation is
+        disabled, already running for `key`, at its in-flight cap, or `has_capacity()`
+        returns False (real traffic needs the crew pool). `has_capacity` is only called
+        once the cheaper checks pass. `run` must pass each concurrent future it submits
+        to `track`. Returns whether a run was started.
+        """
+        if not self.enabled:
+            return False
+        self._evict()
+        if key in self._runs:
+            return False
+        if self.in_flight >= self.max_in_flight or (has_capacity is not None and not has_capacity()):
+            self._stats["skipped"] += 1
+            return False
+
+        with self._in_flight_lock:
+            self._in_flight += 1
+        slot = _RunSlot(self._release)
+        task = asyncio.create_task(run(slot.track))
+        task.add_done_callback(self._on_done)
+        task.add_done_callback(slot.finished)
+        self._runs[key] = {"task": task, "created_at": time.time()}
+        self._stats["started"] += 1
+        self._evict()
+        return True
+
+    async def claim(self, key: str):
+        """
+        Take the speculative result for `key`, waiting for it if still running.
+        Returns None when there is none or it failed, so the caller drafts normally.
+        """
+        run = self._runs.pop(key, None)
+        if run is None:
+            return None
+
+        task = run["task"]
+        self._stats["claimed_in_flight" if not task.done() else "claimed"] += 1
+        try:
+            # Shielded: a client disconnect must not cancel the shared run
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise
+        except Exception as e:
+            print(f"Speculative draft failed, drafting again: {e}")
+            return None
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats.update(enabled=self.enabled, entries=len(self._runs), in_flight=self.in_flight)
+        return stats
+
+    def _release(self):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def _on_done(self, task: asyncio.Task):
+        # Retrieve the exception so unclaimed failures are counted, not logged as "never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["failed"] += 1
+
+    def _evict(self):
+        now = time.time()
+        expired = [key for key, run in self._runs.items() if now - run["created_at"] > self.ttl_s]
+        # Over capacity: drop the oldest unclaimed runs
+        overflow = max(0, len(self._runs) - len(expired) - self.max_entries)
+        expired += [key for key in self._runs if key not in expired][:overflow]
+        for key in expired:
+            run = self._runs.pop(key)
+            # A run still queued for the crew pool is cancelled; one already executing
+            # finishes in its thread and the result is discarded.
+            run["task"].cancel()
+            self._stats["evicted"] += 1
+
+
+class _RunSlot:
+    """Calls `release` once the run's task and every future it tracked have finished."""
+
+    def __init__(self, release):
+        self._release = release
+        self._lock = threading.Lock()
+        self._pending = 1  # the task itself
+
+    def track(self, future):
+        with self._lock:
+            self._pending += 1
+        future.add_done_callback(self.finished)
+
+    def finished(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+            if self._pending:
+                return
+        self._release()
@@ -0,0 +1,148 @@
+# streaming_transcriber.py
+
+import numpy as np
+
+from utils.transcription import (
+    DEVANAGARI_PROMPT,
+    LANGUAGE_DETECTION_SECONDS,
+    MIXED_PROMPT,
+    SAMPLE_RATE,
+    decode_segments,
+    detect_language,
+    record_language_decision,
+    resolve_language,
+)
+
+
+class StreamingTranscriber:
+    """
+    Incrementally transcribes a live audio stream using a sliding VAD window.
+
+    Audio is fed as raw 16 kHz mono 16-bit little-endian PCM. Every `step_s` seconds
+    of new audio, the uncommitted window is decoded again. Segments that ended well
+    before the edge of the window are committed as final and trimmed off the buffer;
+    the rest is reported as a partial hypothesis that may still change.
+
+    The language is detected once, as soon as the first few seconds are buffered,
+    and fixed for the rest of the stream. Decoding is delegated to `run`, an async
+    callable with the `TranscriptionPool.run(fn, *args)` signature.
+    """
+
+    def __init__(
+        self,
+        run,
+        step_s: float = 1.0,
+        stable_margin_s: float = 1.5,
+        max_window_s: float = 20.0,
+    ):
+        self.run = run
+        self.step_s = step_s
+        self.stable_margin_s = stable_margin_s
+        self.max_window_s = max_window_s
+        self.language = None
+        self.initial_prompt = MIXED_PROMPT
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._offset_s = 0.0    # absolute stream time of self._buffer[0]
+        self._pending_s = 0.0   # audio received since the last decode
+        self._carry = b""       # odd trailing byte of the previous chunk
+        self._final_segments: list[str] = []
+
+    @property
+    def text(self) -> str:
+        """Full committed transcript so far."""
+        return " ".join(self._final_segments).strip()
+
+    async def feed(self, chunk: bytes) -> list[dict]:
+        """
+        Append a PCM chunk and decode the window once enough new audio has arrived.
+
+        Returns:
+            list[dict]: `final` events for newly committed segments followed by
+            at most one `partial` event for the still-open tail.
+        """
+        data = self._carry + chunk
+        if len(data) % 2:
+            self._carry, data = data[-1:], data[:-1]
+        else:
+            self._carry = b""
+
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        self._buffer = np.concatenate([self._buffer, samples])
+        self._pending_s += len(samples) / SAMPLE_RATE
+
+        if self._pending_s < self.step_s:
+            return []
+        # Reset before decoding: if the pool is busy the audio stays buffered for the next step
+        self._pending_s = 0.0
+        return await self._decode(final=False)
+
+    async def finish(self) -> list[dict]:
+        """Commit whatever is left in the window and close the stream."""
+        events = await self._decode(final=True) if len(self._buffer) else []
+        events.append({"type": "done", "text": self.text})
+        return events
+
+    def _prompt(self) -> str:
+        # Carry the tail of the committed text so the decoder keeps context across windows
+        tail = self.text[-200:]
+        return f"{self.initial_prompt} {tail}".strip()
+
+    async def _detect_language(self):
+        detected, _ = await self.run(detect_language, self._buffer)
+        self.language, forced = resolve_language(detected)
+        if forced:
+            self.initial_prompt = DEVANAGARI_PROMPT
+        record_language_decision(self.language, forced)
+
+    async def _decode(self, final: bool) -> list[dict]:
+        window_s = len(self._buffer) / SAMPLE_RATE
+        if self.language is None and (final or self._offset_s + window_s >= LANGUAGE_DETECTION_SECONDS):
+            await self._detect_language()
+
+        segments = await self.run(decode_segments, self._buffer, self.language, self._prompt())
+
+        if final:
+            commit = len(segments)
+        elif window_s >= self.max_window_s:
+            # Window is full: commit everything except the segment still being spoken
+            commit = len(segments) - 1 if len(segments) > 1 else len(segments)
+        else:
+            # The last segment may still be growing, never commit it early
+            cutoff = window_s - self.stable_margin_s
+            commit = 0
+            for segment in segments[:-1]:
+                if segment["end"] > cutoff:
+                    break
+                commit += 1
+
+        events = []
+        for segment in segments[:commit]:
+            if not segment["text"]:
+                continue
+            self._final_segments.append(segment["text"])
+            events.append({
+                "type": "final",
+                "text": segment["text"],
+                "start": round(self._offset_s + segment["start"], 2),
+                "end": round(self._offset_s + segment["end"], 2),
+            })
+
+        if final:
+            self._offset_s += window_s
+            self._buffer = np.zeros(0, dtype=np.float32)
+        elif commit:
+            cut = min(int(segments[commit - 1]["end"] * SAMPLE_RATE), len(self._buffer))
+            self._buffer = self._buffer[cut:]
+            self._offset_s += cut / SAMPLE_RATE
+        elif not segments and window_s >= self.max_window_s:
+            # Only silence so far: slide the window, keeping the last step of audio
+            drop = len(self._buffer) - int(self.step_s * SAMPLE_RATE)
+            self._buffer = self._buffer[drop:]
+            self._offset_s += drop / SAMPLE_RATE
+
+        partial = " ".join(s["text"] for s in segments[commit:]).strip()
+        if partial and not final:
+            events.append({"type": "partial", "text": partial})
+
+        return events
@@ -0,0 +1,199 @@
+# structured_output.py
+
+import json
+
+from pydantic import BaseModel, ConfigDict, RootModel, ValidationError, field_validator
+
+from utils.metrics import REGISTRY
+
+OUTPUT_REPAIRS = REGISTRY.counter(
+    "nyaya_output_repairs_total", "Task outputs that failed validation and were sent for a repair call.",
+    ("schema", "status"))
+
+
+# --- Task output schemas ---
+
+class _TaskOutput(BaseModel):
+    # Fields the model adds beyond the schema are kept, so normalizing never loses content
+    model_config = ConfigDict(extra="allow")
+
+
+class CaseIntake(_TaskOutput):
+    case_type: str
+    legal_domain: str
+    summary: str
+    relevant_entities: list[str] = []
+    jurisdiction: str | None = None
+
+
+class Advisory(_TaskOutput):
+    severity: str
+    legal_type: str
+    recommended_action: str
+    step_guidance: str
+
+    @field_validator("step_guidance", mode="before")
+    @classmethod
+    def _join_steps(cls, value):
+        # Models sometimes return the numbered steps as a list
+        if isinstance(value, list):
+            return "\n".join(str(step) for step in value)
+        return value
+
+
+class IpcSection(_TaskOutput):
+    section: str | None = None
+    page: str | None = None
+    language: str = "unknown"
+    granularity: str = "section"
+    content: str
+
+    @field_validator("section", "page", mode="before")
+    @classmethod
+    def _as_text(cls, value):
+        return str(value) if isinstance(value, (int, float)) else value
+
+
+class IpcSections(RootModel[list[IpcSection]]):
+    @field_validator("root", mode="before")
+    @classmethod
+    def _wrap_single(cls, value):
+        # A lone section object is still a usable result
+        return [value] if isinstance(value, dict) else value
+
+
+class LawyerEmail(_TaskOutput):
+    subject: str
+    body: str
+
+
+class OutputValidationError(ValueError):
+    """Raised when a task output cannot be turned into its schema, even after repair."""
+
+
+# --- Tolerant extraction ---
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _balanced_end(text: str, start: int) -> int | None:
+    """Index just past the bracket that closes the one at `start`, skipping string contents."""
+    stack = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            if not stack or stack.pop() != char:
+                return None
+            if not stack:
+                return i + 1
+    return None
+
+
+def iter_json(text: str, openers: str = "{["):
+    """
+    Yield each top-level balanced JSON value in `text` that starts with one of `openers`
+    and parses, in order, ignoring code fences and any prose around them.
+    """
+    position = 0
+    while True:
+        starts = [i for i in (text.find(opener, position) for opener in openers) if i != -1]
+        if not starts:
+            return
+        start = min(starts)
+        end = _balanced_end(text, start)
+        if end is not None:
+            try:
+                value = json.loads(text[start:end])
+            except ValueError:
+                pass
+            else:
+                yield value
+                # Values nested inside this one are part of it, not separate candidates
+                position = end
+                continue
+        position = start + 1
+
+
+def extract_json(text: str, openers: str = "{["):
+    """Return the first JSON value `iter_json` finds in `text`."""
+    for value in iter_json(text, openers):
+        return value
+    raise ValueError("no JSON value found in output")
+
+
+def _openers(schema) -> str:
+    return "[{" if issubclass(schema, RootModel) else "{"
+
+
+def parse_structured(text: str, schema):
+    """
+    Validate the first JSON value in `text` that matches `schema` (an example object in
+    the model's reasoning may come before the real answer); raises OutputValidationError.
+    """
+    first_error = None
+    for value in iter_json(text, _openers(schema)):
+        try:
+            return schema.model_validate(value)
+        except ValidationError as e:
+            first_error = first_error or e
+    error = first_error or ValueError("no JSON value found in output")
+    raise OutputValidationError(f"{schema.__name__}: {error}") from error
+
+
+def repair_structured(text: str, schema, llm, error: Exception):
+    """One targeted LLM call that rewrites `text` to match `schema`; raises OutputValidationError."""
+    prompt = (
+        "The text below was supposed to be JSON matching this JSON Schema, but it failed validation.\n\n"
+        f"ERROR: {error}\n\n"
+        f"SCHEMA:\n{json.dumps(schema.model_json_schema(), ensure_ascii=False)}\n\n"
+        f"TEXT:\n{text}\n\n"
+        "Return ONLY the corrected JSON. Keep the original content and language; "
+        "do not add code fences or commentary."
+    )
+    try:
+        repaired = parse_structured(str(llm.call(prompt)), schema)
+    except OutputValidationError:
+        OUTPUT_REPAIRS.inc(schema=schema.__name__, status="failed")
+        raise
+    except Exception as e:
+        OUTPUT_REPAIRS.inc(schema=schema.__name__, status="failed")
+        raise OutputValidationError(f"{schema.__name__}: repair call failed: {e}") from e
+    OUTPUT_REPAIRS.inc(schema=schema.__name__, status="repaired")
+    return repaired
+
+
+def structured_guardrail(schema, llm):
+    """
+    Task guardrail that normalizes the task's raw output to compact JSON matching `schema`.
+
+    Valid JSON wrapped in fences or prose is extracted locally. Only output that fails
+    validation costs one repair call to `llm`, for this task alone. If that fails too the
+    raw output is passed through unchanged, so a formatting slip never fails (and retries)
+    the whole crew.
+    """
+    def guardrail(task_output):
+        raw = task_output.raw
+        try:
+            result = parse_structured(raw, schema)
+        except OutputValidationError as e:
+            print(f"⚠️ {e}; asking for a repaired output")
+            try:
+                result = repair_structured(raw, schema, llm, e)
+            except OutputValidationError as repair_error:
+                print(f"⚠️ Could not repair task output: {repair_error}")
+                return True, raw
+        return True, result.model_dump_json()
+
+    return guardrail
@@ -0,0 +1,286 @@
+# transcription.py
+
+import os
+import threading
+
+import numpy as np
+
+# Whisper models operate on 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Only this much speech from the start of a recording is decoded to pick the language
+LANGUAGE_DETECTION_SECONDS = float(os.getenv("WHISPER_LANGUAGE_DETECTION_SECONDS", "8"))
+# How far into a recording to look for that speech (leading silence, hold music)
+# before falling back to detection over the whole clip
+LANGUAGE_DETECTION_SCAN_SECONDS = float(os.getenv("WHISPER_LANGUAGE_DETECTION_SCAN_SECONDS", "120"))
+# Below this probability the detection is retried over the whole clip
+LANGUAGE_DETECTION_MIN_PROBABILITY = float(os.getenv("WHISPER_LANGUAGE_DETECTION_MIN_PROBABILITY", "0.5"))
+
+# Identifies the language handling below in transcription cache keys
+LANGUAGE_SETTINGS = (
+    f"auto[en,hi;other->hi]/{LANGUAGE_DETECTION_SECONDS}s"
+    f"/scan{LANGUAGE_DETECTION_SCAN_SECONDS}s/min{LANGUAGE_DETECTION_MIN_PROBABILITY}"
+)
+
+MIXED_PROMPT = "नमस्ते, this is a legal discussion in Hindi and English."
+DEVANAGARI_PROMPT = "नमस्ते, write this in Devanagari script."
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "detected_en": 0,
+    "detected_hi": 0,
+    "forced_hindi": 0,
+    "no_speech": 0,
+}
+
+
+def resolve_language(detected: str) -> tuple[str, bool]:
+    """
+    Map Whisper's detected language onto the languages we transcribe in.
+
+    Anything other than English or Hindi (usually Urdu or Arabic for Hinglish speech)
+    is forced to Hindi. This handles the "Right Language, Wrong Script" issue.
+
+    Returns:
+        tuple[str, bool]: The language to decode with and whether Hindi was forced.
+    """
+    if detected in ("en", "hi"):
+        return detected, False
+    return "hi", True
+
+
+def speech_window(audio):
+    """
+    The first LANGUAGE_DETECTION_SECONDS of `audio` starting at its first speech, found
+    by sliding a window over the first LANGUAGE_DETECTION_SCAN_SECONDS; None if VAD
+    finds no speech there.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    window = int(LANGUAGE_DETECTION_SECONDS * SAMPLE_RATE)
+    scan_end = min(len(audio), int(LANGUAGE_DETECTION_SCAN_SECONDS * SAMPLE_RATE))
+    for start in range(0, max(scan_end, 1), window):
+        speech = get_speech_timestamps(audio[start: start + window], VadOptions())
+        if speech:
+            first = start + speech[0]["start"]
+            return audio[first: first + window]
+    return None
+
+
+def _detect(model, audio) -> tuple[str, float]:
+    if hasattr(model, "detect_language"):
+        language, probability, _ = model.detect_language(audio=audio, vad_filter=True)
+    else:
+        # Older faster-whisper: transcribe() detects eagerly but decodes lazily,
+        # so leaving the segment generator unconsumed only runs detection.
+        _, info = model.transcribe(audio, beam_size=1, vad_filter=True)
+        language, probability = info.language, info.language_probability
+    return language, probability
+
+
+def detect_language(model, audio) -> tuple[str, float]:
+    """
+    Detect the spoken language from a few seconds of speech only.
+
+    The window starts at the first speech VAD finds, so leading silence or hold music
+    does not decide the language. If there is no speech within the scan range, or the
+    window's detection is not confident, detection runs over the whole clip instead.
+    """
+    clip = speech_window(audio)
+    if clip is None:
+        return _detect(model, audio)
+
+    language, probability = _detect(model, clip)
+    if probability < LANGUAGE_DETECTION_MIN_PROBABILITY and len(clip) < len(audio):
+        full_language, full_probability = _detect(model, audio)
+        if full_probability > probability:
+            return full_language, full_probability
+    return language, probability
+
+
+def decode_segments(model, audio, language: str | None, initial_prompt: str) -> list[dict]:
+    """
+    Run one beam-5 decoding pass over `audio` and materialize its segments.
+
+    Returns:
+        list[dict]: Segments with `start`, `end` (seconds) and `text`.
+    """
+    segments, _ = model.transcribe(
+        audio,
+        beam_size=5,
+        vad_filter=True,
+        language=language,
+        initial_prompt=initial_prompt
+    )
+    return [
+        {"start": round(s.start, 2), "end": round(s.end, 2), "text": s.text.strip()}
+        for s in segments
+    ]
+
+
+def join_segments(segments: list[dict]) -> str:
+    return " ".join(s["text"] for s in segments if s["text"]).strip()
+
+
+def transcribe(model, audio) -> dict:
+    """
+    Detect the language once, then run exactly one full transcription pass.
+
+    Args:
+        model: A loaded faster-whisper `WhisperModel`.
+        audio: float32 mono PCM at 16 kHz.
+
+    Returns:
+        dict: `text`, `segments`, the decoded `language`, the raw `detected_language`
+        with its probability, and `forced_hindi`.
+    """
+    detected, probability = detect_language(model, audio)
+    language, forced = resolve_language(detected)
+    print(f"DEBUG: Detected language: {detected} with probability {probability}")
+    if forced:
+        print(f"DEBUG: Detected {detected}, forcing 'hi' (Hindi)...")
+
+    segments = decode_segments(
+        model,
+        audio,
+        language,
+        DEVANAGARI_PROMPT if forced else MIXED_PROMPT
+    )
+
+    return {
+        "text": join_segments(segments),
+        "segments": segments,
+        "language": language,
+        "detected_language": detected,
+        "language_probability": probability,
+        "forced_hindi": forced,
+    }
+
+
+def transcribe_batch(model, clips: list) -> list[dict]:
+    """
+    Transcribe several short clips (each at most one 30 s Whisper window) as one batch.
+
+    This drives the same batched encode/generate path that faster-whisper's
+    BatchedInferencePipeline uses internally, but across clips instead of across
+    chunks of one file: one encoder pass, one language-detection pass and one
+    beam-search call for the whole batch. Clips keep their own language.
+
+    As with `vad_filter=True` in `transcribe()`, only the speech VAD finds in a clip
+    is decoded, and a clip without speech yields no segments. Each clip decodes to a
+    single segment spanning its speech (no per-phrase timestamps, no temperature
+    fallback), marked `"batched": True`; cache keys carry the batching mode
+    (see `transcription_mode`) so these results are never served for the other paths.
+
+    Returns:
+        list[dict]: One result per clip, shaped like `transcribe()`.
+    """
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    results: list[dict | None] = [None] * len(clips)
+    speech_clips, spans, indexes = [], [], []
+    for index, clip in enumerate(clips):
+        speech = get_speech_timestamps(clip, VadOptions())
+        if not speech:
+            results[index] = {
+                "text": "",
+                "segments": [],
+                "language": None,
+                "detected_language": None,
+                "language_probability": 0.0,
+                "forced_hindi": False,
+            }
+            continue
+        speech_clips.append(np.concatenate([clip[s["start"]: s["end"]] for s in speech]))
+        spans.append((speech[0]["start"] / SAMPLE_RATE, speech[-1]["end"] / SAMPLE_RATE))
+        indexes.append(index)
+    if not speech_clips:
+        return results
+
+    n_frames = model.feature_extractor.nb_max_frames
+    features = np.stack([
+        pad_or_trim(model.feature_extractor(clip)[..., :n_frames], n_frames)
+        for clip in speech_clips
+    ])
+    encoder_output = model.encode(features)
+
+    tokenizers, decisions = [], []
+    for clip_probs in model.model.detect_language(encoder_output):
+        token, probability = clip_probs[0]
+        detected = token[2:-2]  # "<|en|>" -> "en"
+        language, forced = resolve_language(detected)
+        decisions.append((detected, probability, language, forced))
+        tokenizers.append(Tokenizer(
+            model.hf_tokenizer,
+            model.model.is_multilingual,
+            task="transcribe",
+            language=language
+        ))
+
+    prompts = [
+        model.get_prompt(
+            tokenizer,
+            previous_tokens=tokenizer.encode(" " + (DEVANAGARI_PROMPT if forced else MIXED_PROMPT)),
+            without_timestamps=True
+        )
+        for tokenizer, (_, _, _, forced) in zip(tokenizers, decisions)
+    ]
+    outputs = model.model.generate(
+        encoder_output,
+        prompts,
+        beam_size=5,
+        max_length=model.max_length,
+        suppress_blank=True,
+        suppress_tokens=[-1]
+    )
+
+    for index, (start, end), output, tokenizer, (detected, probability, language, forced) in zip(
+        indexes, spans, outputs, tokenizers, decisions
+    ):
+        text = tokenizer.decode(output.sequences_ids[0]).strip()
+        results[index] = {
+            "text": text,
+            "segments": [{"start": round(start, 2), "end": round(end, 2), "text": text, "batched": True}] if text else [],
+            "language": language,
+            "detected_language": detected,
+            "language_probability": probability,
+            "forced_hindi": forced,
+        }
+    return results
+
+
+def transcription_mode(batch_max_seconds: float | None, long_min_seconds: float) -> str:
+    """
+    Cache-key component naming which decoding path a recording of a given length takes.
+
+    For a fixed configuration the path is a function of the audio's duration, so the
+    same audio always maps to the same path; changing the configuration changes the key.
+    """
+    batching = f"batch<={batch_max_seconds}s" if batch_max_seconds else "nobatch"
+    return f"{batching}/long>={long_min_seconds}s"
+
+
+def record_language_decision(language: str | None, forced: bool):
+    """Count one transcription and the language path it took."""
+    with _stats_lock:
+        _stats["requests"] += 1
+        if language is None:
+            # Batched clip in which VAD found no speech
+            _stats["no_speech"] += 1
+        elif forced:
+            _stats["forced_hindi"] += 1
+        else:
+            _stats[f"detected_{language}"] += 1
+
+
+def get_transcription_stats() -> dict:
+    """Snapshot of the transcription counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["forced_hindi_ratio"] = (
+        round(stats["forced_hindi"] / stats["requests"], 4) if stats["requests"] else 0.0
+    )
+    return stats
@@ -0,0 +1,106 @@
+# transcription_cache.py
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class TranscriptionCache:
+    """
+    Content-addressed cache of transcription results.
+
+    Keys are derived from the audio SHA-256 plus every setting that changes the output
+    (model, compute type, language handling). A bounded in-memory LRU tier sits in
+    front of an optional on-disk tier of one JSON file per key.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: str | None = None):
+        self.max_entries = max(0, max_entries)
+        self.disk_dir = os.path.expanduser(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, dict] = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    @classmethod
+    def from_env(cls) -> "TranscriptionCache":
+        return cls(
+            max_entries=int(os.getenv("TRANSCRIPTION_CACHE_SIZE", "256")),
+            disk_dir=os.getenv("TRANSCRIPTION_CACHE_DIR") or None,
+        )
+
+    @staticmethod
+    def make_key(audio_sha256: str, model: str, compute_type: str, language: str) -> str:
+        return hashlib.sha256(
+            "|".join([audio_sha256, model, compute_type, language]).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: dict):
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (
+            round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        )
+        return stats
+
+    def _remember(self, key: str, value: dict):
+        # Caller holds self._lock
+        if not self.max_entries:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> dict | None:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, value: dict):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write transcription cache entry: {e}")
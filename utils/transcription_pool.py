@@ -0,0 +1,177 @@
+# transcription_pool.py
+
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Each worker thread/process keeps its own WhisperModel here
+_worker = threading.local()
+
+
+def _init_worker(model_size: str, device: str, compute_type: str, cpu_threads: int):
+    from faster_whisper import WhisperModel
+    _worker.model = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads
+    )
+
+
+def _run_in_worker(fn, args: tuple, kwargs: dict):
+    return fn(_worker.model, *args, **kwargs)
+
+
+def _warm_up_job(hold_s: float) -> bool:
+    # Holding the worker briefly makes concurrent warm-up jobs land on distinct workers
+    time.sleep(hold_s)
+    return _worker.model is not None
+
+
+class QueueFullError(Exception):
+    """Raised when the pool already has as many jobs as it accepts."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Transcription queue is full, retry in {retry_after}s.")
+        self.retry_after = retry_after
+
+
+class TranscriptionPool:
+    """
+    A pool of Whisper workers (threads or processes) behind a bounded queue.
+
+    Jobs are plain functions `fn(model, *args, **kwargs)`; in process mode they must be
+    importable module-level functions so they can be pickled. Each worker gets
+    `cpu_count // workers` CPU threads so N workers don't oversubscribe the cores.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        mode: str = "thread",
+        max_queue: int = 8,
+        model_size: str = "base",
+        device: str = "cpu",
+        compute_type: str = "int8",
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown transcription worker mode: {mode}")
+
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.max_queue = max(0, max_queue)
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = max(1, (os.cpu_count() or 1) // self.workers)
+
+        executor_cls = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+        self._executor = executor_cls(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(model_size, device, compute_type, self.cpu_threads)
+        )
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_job_s = 5.0  # running estimate used for Retry-After
+        self._rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "TranscriptionPool":
+        return cls(
+            workers=int(os.getenv("WHISPER_WORKERS", "1")),
+            mode=os.getenv("WHISPER_WORKER_MODE", "thread"),
+            max_queue=int(os.getenv("WHISPER_QUEUE_SIZE", "8")),
+            model_size=os.getenv("WHISPER_MODEL", "base"),
+            device=os.getenv("WHISPER_DEVICE", "cpu"),
+            compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
+        )
+
+    def warm_up(self):
+        """Block until every worker has loaded its model."""
+        futures = [self._executor.submit(_warm_up_job, 0.2) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run `fn(model, *args, **kwargs)` on a worker without blocking the event loop.
+
+        Raises:
+            QueueFullError: If all workers are busy and the queue is full.
+        """
+        return (await self._submit(fn, [(args, kwargs)]))[0]
+
+    async def map(self, fn, arg_list: list[tuple]) -> list:
+        """
+        Fan `fn(model, *args)` out over all workers, one call per args tuple.
+
+        The whole fan-out is admitted as a single request, so one long recording
+        cannot fill the queue by itself. Results come back in input order.
+        """
+        return await self._submit(fn, [(args, {}) for args in arg_list])
+
+    async def _submit(self, fn, calls: list[tuple[tuple, dict]]) -> list:
+        self._admit()
+        futures = []
+        try:
+            for args, kwargs in calls:
+                futures.append(self._executor.submit(_run_in_worker, fn, args, kwargs))
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            # The slot is freed when the work really ends (or is cancelled while queued),
+            # not when the caller stops waiting, so admission matches what the workers hold
+            self._release_when_done(futures)
+        return await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+
+    def _release_when_done(self, futures: list):
+        start = time.monotonic()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_future):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self._release(time.monotonic() - start)
+
+        if not futures:
+            self._release(0.0)
+        for future in futures:
+            future.add_done_callback(done)
+
+    def _admit(self):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                waves = math.ceil((self._in_flight - self.workers + 1) / self.workers)
+                raise QueueFullError(retry_after=max(1, math.ceil(self._avg_job_s * waves)))
+            self._in_flight += 1
+
+    def _release(self, elapsed_s: float):
+        with self._lock:
+            self._in_flight -= 1
+            self._avg_job_s = 0.8 * self._avg_job_s + 0.2 * elapsed_s
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "cpu_threads_per_worker": self.cpu_threads,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+                "avg_job_seconds": round(self._avg_job_s, 3),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)